@@ -8,7 +8,7 @@ from typing import Callable
 import numpy as np
 import scipy
 
-from Orange.data import Table, Storage, Instance, Value
+from Orange.data import Table, Storage, Instance, Value, lazy_transforms
 from Orange.data.filter import HasClass
 from Orange.data.table import DomainTransformationError
 from Orange.data.util import one_hot
@@ -155,9 +155,11 @@ class Learner(ReprableWithPreprocessors):
         if progress_callback is None:
             progress_callback = dummy_callback
         n_pps = len(list(self.active_preprocessors))
-        for i, pp in enumerate(self.active_preprocessors):
-            progress_callback(i / n_pps)
-            data = pp(data)
+        # intermediate tables are computed only if preprocessors need them
+        with lazy_transforms():
+            for i, pp in enumerate(self.active_preprocessors):
+                progress_callback(i / n_pps)
+                data = pp(data)
         progress_callback(1)
         return data
 
@@ -11,6 +11,7 @@ import scipy.cluster.hierarchy
 import scipy.spatial.distance
 
 from Orange.distance import Euclidean, PearsonR
+from Orange.misc import CondensedDistMatrix
 
 __all__ = ['HierarchicalClustering']
 
@@ -24,6 +25,8 @@ WARD = "ward"
 
 
 def condensedform(X, mode="upper"):
+    if isinstance(X, CondensedDistMatrix) and mode == "upper":
+        return X.flat
     X = numpy.asarray(X)
     assert len(X.shape) == 2
     assert X.shape[0] == X.shape[1]
@@ -425,7 +428,7 @@ def optimal_leaf_ordering(
             FutureWarning, stacklevel=2
         )
     Z = linkage_from_tree(tree)
-    y = condensedform(numpy.asarray(distances))
+    y = condensedform(distances)
     Zopt = scipy.cluster.hierarchy.optimal_leaf_ordering(Z, y)
     return tree_from_linkage(Zopt)
 
@@ -15,11 +15,18 @@ from sklearn.neighbors import NearestNeighbors
 
 from Orange.clustering.clustering import Clustering
 from Orange.data import Table
+from Orange.distance import Euclidean, Manhattan, Cosine, KNNIndex
 
 
 __all__ = ["Louvain", "matrix_to_knn_graph"]
 
 
+# Distances from Orange.distance for metrics, as named by sklearn
+_DISTANCES = {"l2": Euclidean, "euclidean": Euclidean,
+              "l1": Manhattan, "manhattan": Manhattan, "cityblock": Manhattan,
+              "cosine": Cosine}
+
+
 def jaccard(x, y):
     # type: (set, set) -> float
     """Compute the Jaccard similarity between two sets."""
@@ -35,7 +42,8 @@ def matrix_to_knn_graph(data, k_neighbors, metric, progress_callback=None):
     data : np.ndarray
     k_neighbors : int
     metric : str
-        A distance metric supported by sklearn.
+        A distance metric supported by sklearn. Euclidean ("l2"), Manhattan
+        ("l1") and cosine distances are computed by `Orange.distance`.
     progress_callback : Callable[[float], None]
 
     Returns
@@ -43,16 +51,14 @@ def matrix_to_knn_graph(data, k_neighbors, metric, progress_callback=None):
     nx.Graph
 
     """
-    # We do k + 1 because each point is closest to itself, which is not useful
-    if metric == "cosine":
-        # Cosine distance on row-normalized data has the same ranking as
-        # Euclidean distance, so we use the latter, which is more efficient
-        # because it uses ball trees. We do not need actual distances. If we
-        # would, the N * k distances can be recomputed later.
-        data = data / np.linalg.norm(data, axis=1)[:, None]
-        metric = "euclidean"
-    knn = NearestNeighbors(n_neighbors=k_neighbors, metric=metric).fit(data)
-    nearest_neighbors = knn.kneighbors(data, return_distance=False)
+    # Each point is its own nearest neighbor (and is thus included in its set)
+    if metric in _DISTANCES:
+        index = KNNIndex(_DISTANCES[metric]().fit(data), data)
+        nearest_neighbors = index.query(data, k=k_neighbors)[1]
+    else:
+        knn = NearestNeighbors(n_neighbors=k_neighbors, metric=metric)
+        knn.fit(data)
+        nearest_neighbors = knn.kneighbors(data, return_distance=False)
     # Convert to list of sets so jaccard can be computed efficiently
     nearest_neighbors = list(map(set, nearest_neighbors))
     num_nodes = len(nearest_neighbors)
@@ -5,7 +5,7 @@ import numpy
 cimport numpy as np
 import cython
 
-cdef extern from "numpy/npy_math.h":
+cdef extern from "numpy/npy_math.h" nogil:
     bint npy_isnan(double x)
 
 @cython.wraparound(False)
@@ -59,3 +59,161 @@ def contingency_floatarray(np.ndarray[np.float64_t, ndim=1] col_data, np.ndarray
     assert j == N-1
 
     return (V,C),col_unknowns,row_unknowns,unknowns
+
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef np.ndarray[np.intp_t, ndim=1] _class_indices(const double[:] classes,
+                                                 np.intp_t ny):
+    # Indices of classes; ny for unknown and -1 for invalid values
+    cdef np.ndarray[np.intp_t, ndim=1] indices = \
+        numpy.empty(classes.shape[0], dtype=numpy.intp)
+    cdef np.intp_t[:] indices_v = indices
+    cdef double tc
+    cdef np.intp_t i
+    with nogil:
+        for i in range(classes.shape[0]):
+            tc = classes[i]
+            if npy_isnan(tc):
+                indices_v[i] = ny
+            elif 0 <= tc < ny:
+                indices_v[i] = <np.intp_t>tc
+            else:
+                indices_v[i] = -1
+    return indices
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _add_value(double v, np.intp_t itc, double w, np.intp_t k,
+                            np.intp_t nx, np.intp_t ny,
+                            double[:, :, :] C, double[:, :] col_unknowns,
+                            double[:, :] row_unknowns,
+                            double[:] unknowns) nogil:
+    if itc == -1:
+        return
+    if npy_isnan(v):
+        if itc == ny:
+            unknowns[k] += w
+        else:
+            col_unknowns[k, itc] += w
+    elif 0 <= v < nx:
+        if itc == ny:
+            row_unknowns[k, <np.intp_t>v] += w
+        else:
+            C[k, itc, <np.intp_t>v] += w
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def contingency_dense(const double[:, :] X, const double[:] classes,
+                      const np.intp_t[:] columns, np.intp_t nx, np.intp_t ny,
+                      const double[:] W=None):
+    """
+    Compute contingencies of the given columns of a 2d array with values
+    0, ..., nx - 1 (or nan) against classes 0, ..., ny - 1 (or nan) in a
+    single pass through the data. Other values are ignored. Return
+    - a 3d array with counts for each column (first index), class value
+      and column value,
+    - a 2d array with the number of missing values for each class,
+    - a 2d array with the number of missing classes for each column value,
+    - and an array with the number of rows missing both values.
+    """
+    cdef np.intp_t n_cols = columns.shape[0]
+    cdef np.ndarray[np.float64_t, ndim=3] C = \
+        numpy.zeros((n_cols, ny, nx), dtype=numpy.float64)
+    cdef np.ndarray[np.float64_t, ndim=2] col_unknowns = \
+        numpy.zeros((n_cols, ny), dtype=numpy.float64)
+    cdef np.ndarray[np.float64_t, ndim=2] row_unknowns = \
+        numpy.zeros((n_cols, nx), dtype=numpy.float64)
+    cdef np.ndarray[np.float64_t, ndim=1] unknowns = \
+        numpy.zeros(n_cols, dtype=numpy.float64)
+    cdef double[:, :, :] C_v = C
+    cdef double[:, :] col_unknowns_v = col_unknowns
+    cdef double[:, :] row_unknowns_v = row_unknowns
+    cdef double[:] unknowns_v = unknowns
+    cdef np.intp_t[:] class_indices = _class_indices(classes, ny)
+    cdef bint weights = W is not None
+    cdef double w = 1.
+    cdef np.intp_t i, k, itc
+
+    with nogil:
+        if X.strides[0] <= X.strides[1]:
+            # column-major data is traversed by columns
+            for k in range(n_cols):
+                for i in range(X.shape[0]):
+                    if weights:
+                        w = W[i]
+                    _add_value(X[i, columns[k]], class_indices[i], w, k,
+                               nx, ny, C_v, col_unknowns_v, row_unknowns_v,
+                               unknowns_v)
+        else:
+            for i in range(X.shape[0]):
+                itc = class_indices[i]
+                if weights:
+                    w = W[i]
+                for k in range(n_cols):
+                    _add_value(X[i, columns[k]], itc, w, k,
+                               nx, ny, C_v, col_unknowns_v, row_unknowns_v,
+                               unknowns_v)
+    return C, col_unknowns, row_unknowns, unknowns
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def contingency_csc(const double[:] data, const np.intp_t[:] indices,
+                    const np.intp_t[:] indptr, const double[:] classes,
+                    const np.intp_t[:] columns, np.intp_t nx, np.intp_t ny,
+                    const double[:] W=None):
+    """
+    Compute contingencies like `contingency_dense` for columns of a sparse
+    matrix in CSC format, given by its `data`, `indices` and `indptr`.
+    Implicit zeros are counted as value 0.
+    """
+    cdef np.intp_t n_cols = columns.shape[0]
+    cdef np.ndarray[np.float64_t, ndim=3] C = \
+        numpy.zeros((n_cols, ny, nx), dtype=numpy.float64)
+    cdef np.ndarray[np.float64_t, ndim=2] col_unknowns = \
+        numpy.zeros((n_cols, ny), dtype=numpy.float64)
+    cdef np.ndarray[np.float64_t, ndim=2] row_unknowns = \
+        numpy.zeros((n_cols, nx), dtype=numpy.float64)
+    cdef np.ndarray[np.float64_t, ndim=1] unknowns = \
+        numpy.zeros(n_cols, dtype=numpy.float64)
+    cdef double[:, :, :] C_v = C
+    cdef double[:, :] col_unknowns_v = col_unknowns
+    cdef double[:, :] row_unknowns_v = row_unknowns
+    cdef double[:] unknowns_v = unknowns
+    cdef np.intp_t[:] class_indices = _class_indices(classes, ny)
+    # Class distribution of all rows and of rows with stored values;
+    # the difference belongs to implicit zeros
+    cdef double[:] class_counts = numpy.zeros(ny + 1, dtype=numpy.float64)
+    cdef double[:] stored_counts = numpy.zeros(ny + 1, dtype=numpy.float64)
+    cdef bint weights = W is not None
+    cdef double w = 1.
+    cdef np.intp_t i, j, k, itc, ind
+
+    with nogil:
+        for i in range(classes.shape[0]):
+            itc = class_indices[i]
+            if itc != -1:
+                class_counts[itc] += W[i] if weights else 1.
+        for k in range(n_cols):
+            for itc in range(ny + 1):
+                stored_counts[itc] = 0
+            j = columns[k]
+            for ind in range(indptr[j], indptr[j + 1]):
+                i = indices[ind]
+                itc = class_indices[i]
+                if weights:
+                    w = W[i]
+                _add_value(data[ind], itc, w, k, nx, ny,
+                           C_v, col_unknowns_v, row_unknowns_v, unknowns_v)
+                if itc != -1:
+                    stored_counts[itc] += w
+            if nx == 0:
+                continue
+            for itc in range(ny):
+                C_v[k, itc, 0] += class_counts[itc] - stored_counts[itc]
+            row_unknowns_v[k, 0] += class_counts[ny] - stored_counts[ny]
+    return C, col_unknowns, row_unknowns, unknowns
@@ -0,0 +1,358 @@
+"""
+Support for data tables that are stored on disk in chunks of rows and do not
+need to fit into memory.
+"""
+import os
+import pickle
+from numbers import Integral
+
+import numpy as np
+
+from Orange.data import Table, Storage
+from Orange.data.io import ColumnarReader, FileFormat
+from Orange.data.io_base import PICKLE_PROTOCOL
+
+__all__ = ["ChunkedTable"]
+
+DEFAULT_CHUNK_ROWS = 1000000
+
+
+class ChunkedTable(Storage):
+    """
+    Data table whose rows are stored on disk in chunks.
+
+    The table is a directory with a header and a file for each chunk. Chunks
+    are stored in Orange's columnar format (see
+    :obj:`Orange.data.io.ColumnarReader`), so their arrays are memory mapped
+    and only the chunk that is currently processed is paged in.
+
+    Basic statistics, distributions and contingencies are computed by
+    iterating over chunks and merging the results, so widgets that use the
+    :obj:`Storage` interface can handle tables that do not fit into memory.
+    Indexing rows returns an ordinary (in-memory) :obj:`Table`.
+
+    Tables are created with :obj:`from_chunks`, :obj:`from_file` or
+    :obj:`from_table` and opened by passing the directory to the constructor:
+
+        table = ChunkedTable.from_file("huge.csv", "huge-table")
+        ...
+        table = ChunkedTable("huge-table")
+    """
+    HEADER = "header.pkl"
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, self.HEADER), "rb") as f:
+            header = pickle.load(f)
+        if header.get("version", 0) > self.VERSION:
+            raise ValueError(
+                "'{}' was written by a newer version of Orange".format(path))
+        self.domain = header["domain"]
+        self.name = header["name"]
+        self.attributes = header["attributes"]
+        self._has_weights = header["has_weights"]
+        self._chunk_files = [name for name, _ in header["chunks"]]
+        # offsets[i] is the index of the first row of the i-th chunk
+        self._offsets = np.cumsum([0] + [n for _, n in header["chunks"]])
+
+    @classmethod
+    def from_chunks(cls, path, chunks):
+        """
+        Create a table in directory `path` from an iterable of tables.
+
+        The tables must have the same domain; they are written one by one,
+        so the iterable can produce them lazily, for instance with
+        :obj:`Orange.data.io.FileFormat.read_chunks`.
+
+        Args:
+            path (str): a directory; it is created if it does not exist
+            chunks (Iterable[Table]): tables with consecutive rows
+
+        Returns:
+            ChunkedTable
+        """
+        os.makedirs(path, exist_ok=True)
+        domain = first = None
+        chunk_sizes = []
+        has_weights = False
+        for chunk in chunks:
+            if first is None:
+                first = chunk
+                domain = chunk.domain
+            elif chunk.domain != domain:
+                raise ValueError("chunks must have the same domain")
+            if not len(chunk):
+                continue
+            filename = "chunk-{:06}{}".format(
+                len(chunk_sizes), ColumnarReader.EXTENSIONS[0])
+            ColumnarReader.write_file(os.path.join(path, filename), chunk)
+            chunk_sizes.append((filename, len(chunk)))
+            has_weights = has_weights or chunk.has_weights()
+        if first is None:
+            raise ValueError("at least one chunk is required")
+
+        with open(os.path.join(path, cls.HEADER), "wb") as f:
+            pickle.dump({"version": cls.VERSION,
+                         "domain": domain,
+                         "name": first.name,
+                         "attributes": dict(getattr(first, "attributes", {})),
+                         "has_weights": has_weights,
+                         "chunks": chunk_sizes},
+                        f, protocol=PICKLE_PROTOCOL)
+        return cls(path)
+
+    @classmethod
+    def from_file(cls, filename, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Read a file in chunks of `chunk_rows` rows and store it into
+        directory `path`. Readers that support incremental reading never
+        load the entire file.
+        """
+        reader = FileFormat.get_reader(filename)
+        return cls.from_chunks(path, reader.read_chunks(chunk_rows))
+
+    @classmethod
+    def from_table(cls, table, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Store a table into directory `path` in chunks of `chunk_rows`."""
+        return cls.from_chunks(
+            path, (table[start:start + chunk_rows]
+                   for start in range(0, max(len(table), 1), chunk_rows)))
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def has_weights(self):
+        return self._has_weights
+
+    @property
+    def n_chunks(self):
+        return len(self._chunk_files)
+
+    def chunk(self, index):
+        """Return the `index`-th chunk as a (memory mapped) table."""
+        table = ColumnarReader(
+            os.path.join(self.path, self._chunk_files[index])).read()
+        # Use the same variables in all chunks
+        table.domain = self.domain
+        return table
+
+    def chunks(self):
+        """Return an iterator over chunks."""
+        for i in range(self.n_chunks):
+            yield self.chunk(i)
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def __getitem__(self, key):
+        """
+        Return a row (as :obj:`RowInstance`) for an integer index, or
+        a :obj:`Table` with the selected rows for a slice, a sequence of
+        indices or a boolean mask.
+        """
+        n_rows = len(self)
+        if isinstance(key, Integral):
+            if not -n_rows <= key < n_rows:
+                raise IndexError("index {} is out of range".format(key))
+            key %= n_rows
+            index = np.searchsorted(self._offsets, key, side="right") - 1
+            return self.chunk(index)[int(key - self._offsets[index])]
+
+        if isinstance(key, tuple):
+            raise IndexError("only rows of chunked tables can be indexed")
+        if key is ...:
+            key = slice(None)
+        if isinstance(key, slice):
+            parts = self._slice_parts(range(n_rows)[key])
+        else:
+            parts = self._index_parts(self._row_indices(key))
+        if not parts:
+            table = self.chunk(0)[:0] if self.n_chunks \
+                else Table.from_domain(self.domain)
+        else:
+            table = Table.concatenate(parts)
+        table.name = self.name
+        table.attributes = self.attributes
+        return table
+
+    def _slice_parts(self, rows):
+        # Rows of a slice are a range, which is split at chunk boundaries
+        # without constructing indices of all rows
+        parts = []
+        step = rows.step
+        chunks = range(self.n_chunks)
+        for index in chunks if step > 0 else reversed(chunks):
+            lo, hi = self._offsets[index], self._offsets[index + 1]
+            if step > 0:
+                first = -(-(lo - rows.start) // step)
+                last = -(-(hi - rows.start) // step)
+            else:
+                first = (rows.start - hi) // -step + 1
+                last = (rows.start - lo) // -step + 1
+            local = rows[max(first, 0):max(last, 0)]
+            if len(local):
+                parts.append(self.chunk(index)[
+                    np.arange(local.start, local.stop, step) - lo])
+        return parts
+
+    def _row_indices(self, key):
+        n_rows = len(self)
+        rows = np.asarray(key)
+        if not rows.size:
+            return np.empty(0, dtype=int)
+        if rows.dtype == bool:
+            if rows.shape != (n_rows, ):
+                raise IndexError("boolean index has a wrong length")
+            return np.flatnonzero(rows)
+        rows = rows.astype(int, casting="safe").ravel()
+        if np.any((rows < -n_rows) | (rows >= n_rows)):
+            raise IndexError("index out of range")
+        return np.where(rows < 0, rows + n_rows, rows)
+
+    def _index_parts(self, rows):
+        chunk_indices = np.searchsorted(self._offsets, rows, side="right") - 1
+        order = np.argsort(chunk_indices, kind="stable")
+        parts = []
+        for index in np.unique(chunk_indices):
+            local = rows[chunk_indices == index] - self._offsets[index]
+            parts.append(self.chunk(index)[local])
+        if parts and np.any(order != np.arange(len(order))):
+            parts = [Table.from_table_rows(Table.concatenate(parts),
+                                           np.argsort(order))]
+        return parts
+
+    def _compute_basic_stats(self, columns=None,
+                             include_metas=False, compute_variance=False):
+        if compute_variance:
+            return self._compute_variance_stats(columns, include_metas)
+        stats = None
+        for chunk in self.chunks():
+            chunk_stats = np.array(chunk._compute_basic_stats(
+                columns, include_metas=include_metas), dtype=float)
+            # Means are merged with weights that correspond to the weighted
+            # mean in Orange.statistics.util.stats
+            if chunk.has_weights():
+                mean_weights = np.full(len(chunk_stats), chunk.W.sum())
+            else:
+                mean_weights = chunk_stats[:, 5].copy()
+            chunk_stats[:, 2] = np.where(
+                mean_weights > 0, chunk_stats[:, 2] * mean_weights, 0)
+            if stats is None:
+                stats, total_weights = chunk_stats, mean_weights
+                continue
+            stats[:, 0] = np.fmin(stats[:, 0], chunk_stats[:, 0])
+            stats[:, 1] = np.fmax(stats[:, 1], chunk_stats[:, 1])
+            stats[:, 2:] += chunk_stats[:, 2:]
+            total_weights = total_weights + mean_weights
+        if stats is None:
+            return []
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats[:, 2] /= total_weights
+        return stats
+
+    def _compute_variance_stats(self, columns, include_metas):
+        # Moments are merged with Welford's algorithm, which also gives
+        # variances; quantile sketches are not needed
+        if not columns:
+            columns = list(self.domain.variables)
+            if include_metas:
+                columns += self.domain.metas
+        accumulators = None
+        for chunk in self.chunks():
+            # pylint: disable=protected-access
+            chunk_accs = chunk._compute_accumulators(columns, sketch_size=None)
+            if accumulators is None:
+                accumulators = chunk_accs
+            else:
+                for accumulator, chunk_acc in zip(accumulators, chunk_accs):
+                    accumulator.merge(chunk_acc)
+        if accumulators is None:
+            return []
+        return np.array([acc.basic_stats() for acc in accumulators])
+
+    def _compute_distributions(self, columns=None):
+        if columns is None:
+            columns = range(len(self.domain.variables))
+        columns = [self.domain[var] for var in columns]
+
+        distributions = None
+        for chunk in self.chunks():
+            chunk_dists = chunk._compute_distributions(columns)
+            if distributions is None:
+                distributions = chunk_dists
+                continue
+            distributions = [
+                (_merge_continuous((dist, chunk_dist))
+                 if var.is_continuous else dist + chunk_dist,
+                 unknowns + chunk_unknowns)
+                for var, (dist, unknowns), (chunk_dist, chunk_unknowns)
+                in zip(columns, distributions, chunk_dists)]
+        return distributions
+
+    def _compute_contingency(self, col_vars=None, row_var=None):
+        if col_vars is None:
+            col_vars = range(len(self.domain.variables))
+        col_vars = [self.domain[var] for var in col_vars]
+        if row_var is None:
+            row_var = self.domain.class_var
+            if row_var is None:
+                raise ValueError("No row variable")
+
+        contingencies = None
+        for chunk in self.chunks():
+            chunk_conts = chunk._compute_contingency(col_vars, row_var)
+            if contingencies is None:
+                contingencies = chunk_conts
+                continue
+            contingencies = [
+                _merge_continuous_contingencies(cont, chunk_cont)
+                if var.is_continuous
+                else tuple(a + b for a, b in zip(cont, chunk_cont))
+                for var, cont, chunk_cont
+                in zip(col_vars, contingencies, chunk_conts)]
+        return contingencies
+
+    def X_density(self):
+        return self.chunk(0).X_density() if self.n_chunks else Storage.DENSE
+
+    def Y_density(self):
+        return self.chunk(0).Y_density() if self.n_chunks else Storage.DENSE
+
+    def metas_density(self):
+        return self.chunk(0).metas_density() if self.n_chunks \
+            else Storage.DENSE
+
+
+def _merge_continuous(dists):
+    """
+    Merge distributions of continuous values, given as arrays with
+    ordered values in the first row and their counts in the second.
+    """
+    values, inverse = np.unique(
+        np.hstack([dist[0] for dist in dists]), return_inverse=True)
+    counts = np.bincount(inverse, np.hstack([dist[1] for dist in dists]),
+                         minlength=len(values))
+    return np.vstack((values, counts))
+
+
+def _merge_continuous_contingencies(cont1, cont2):
+    (values1, counts1), col_unknowns1, row_unknowns1, unknowns1 = cont1
+    (values2, counts2), col_unknowns2, row_unknowns2, unknowns2 = cont2
+    values, inverse = np.unique(np.hstack((values1, values2)),
+                                return_inverse=True)
+    counts = np.zeros((counts1.shape[0], len(values)))
+    row_unknowns = np.zeros(len(values))
+    for inv, cnts, row_unks in ((inverse[:len(values1)], counts1,
+                                 row_unknowns1),
+                                (inverse[len(values1):], counts2,
+                                 row_unknowns2)):
+        # values within a contingency are unique, so indices do not repeat
+        counts[:, inv] += cnts
+        row_unknowns[inv] += row_unks
+    return ((values, counts), col_unknowns1 + col_unknowns2, row_unknowns,
+            unknowns1 + unknowns2)
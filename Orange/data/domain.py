@@ -1,3 +1,4 @@
+import hashlib
 import warnings
 import weakref
 
@@ -11,9 +12,68 @@ import numpy as np
 from Orange.data import (
     Unknown, Variable, ContinuousVariable, DiscreteVariable, StringVariable
 )
+from Orange.data.util import SharedComputeValue
 from Orange.util import deprecated, OrangeDeprecationWarning
 
-__all__ = ["DomainConversion", "Domain"]
+__all__ = ["ConversionPlan", "DomainConversion", "Domain"]
+
+
+class ConversionPlan:
+    """
+    Columns of X, Y or metas of a domain conversion, grouped by the way they
+    are computed. Columns that are copied from the same array of the source
+    table can be copied with a single fancy index, and columns whose compute
+    values share the same `compute_shared` can be computed together.
+
+    .. attribute:: from_X, from_Y, from_metas
+
+        Pairs of arrays with indices of columns in the destination and of
+        columns in the corresponding array of the source
+
+    .. attribute:: unknown
+
+        Indices of columns that cannot be computed from the source
+
+    .. attribute:: shared
+
+        A list of pairs `(compute_shared, columns)`, where `columns` is a
+        list of pairs `(index, compute_value)`
+
+    .. attribute:: computed
+
+        A list of pairs `(index, compute_value)` for the remaining columns
+    """
+    def __init__(self, cols, n_src_attrs):
+        from_X, from_Y, from_metas = [], [], []
+        self.unknown = []
+        self.computed = []
+        shared = {}
+        for i, col in enumerate(cols):
+            if col is None:
+                self.unknown.append(i)
+            elif not isinstance(col, Integral):
+                if isinstance(col, SharedComputeValue):
+                    # compute_shared is not necessarily hashable
+                    shared.setdefault(id(col.compute_shared),
+                                      (col.compute_shared, []))[1] \
+                        .append((i, col))
+                else:
+                    self.computed.append((i, col))
+            elif col < 0:
+                from_metas.append((i, -1 - col))
+            elif col < n_src_attrs:
+                from_X.append((i, col))
+            else:
+                from_Y.append((i, col - n_src_attrs))
+        self.shared = list(shared.values())
+
+        def as_arrays(pairs):
+            dst, src = zip(*pairs) if pairs else ((), ())
+            return np.array(dst, dtype=int), np.array(src, dtype=int)
+
+        self.from_X = as_arrays(from_X)
+        self.from_Y = as_arrays(from_Y)
+        self.from_metas = as_arrays(from_metas)
 
 
 class DomainConversion:
@@ -24,10 +84,15 @@ class DomainConversion:
     source domain, or the variable's compute_value function if the source
     domain does not contain the variable.
 
+    Conversions are usually obtained by :obj:`Domain.get_conversion`, which
+    caches them.
+
     .. attribute:: source
 
         The source domain. The destination is not stored since destination
         domain is the one which contains the instance of DomainConversion.
+        The source is referenced weakly, so conversions can be cached by
+        the destination without keeping the source alive.
 
     .. attribute:: attributes
 
@@ -57,6 +122,11 @@ class DomainConversion:
     .. attribute:: sparse_metas
 
         Flag whether the resulting metas matrix should be sparse.
+
+    .. attribute:: plan_X, plan_Y, plan_metas
+
+        :obj:`ConversionPlan` for attributes, class variables and metas;
+        computed when first needed.
     """
 
     def __init__(self, source, destination):
@@ -73,13 +143,16 @@ class DomainConversion:
                 return source.index(var)
             return var.compute_value  # , which may also be None
 
-        self.source = source
+        self._source = weakref.ref(source)
 
         self.attributes = [match(var) for var in destination.attributes]
         self.class_vars = [match(var) for var in destination.class_vars]
         self.variables = self.attributes + self.class_vars
         self.metas = [match(var) for var in destination.metas]
 
+        self._n_src_attrs = len(source.attributes)
+        self._plans = {}
+
         def should_be_sparse(feats):
             """
             For a matrix to be stored in sparse, more than 2/3 of columns
@@ -95,6 +168,29 @@ class DomainConversion:
         self.sparse_Y = should_be_sparse(destination.class_vars)
         self.sparse_metas = should_be_sparse(destination.metas)
 
+    @property
+    def source(self):
+        return self._source()
+
+    def _get_plan(self, part):
+        plan = self._plans.get(part)
+        if plan is None:
+            plan = self._plans[part] = \
+                ConversionPlan(getattr(self, part), self._n_src_attrs)
+        return plan
+
+    @property
+    def plan_X(self):
+        return self._get_plan("attributes")
+
+    @property
+    def plan_Y(self):
+        return self._get_plan("class_vars")
+
+    @property
+    def plan_metas(self):
+        return self._get_plan("metas")
+
 
 def filter_visible(feats):
     """
@@ -172,7 +268,7 @@ class Domain:
             for idx, var in enumerate(self.metas)))
 
         self.anonymous = False
-        self._known_domains = weakref.WeakKeyDictionary()
+        self._known_domains = {}
         self._last_conversion = None
 
         # Precompute hash, which is frequently used in domain conversions.
@@ -343,7 +439,36 @@ class Domain:
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self._known_domains = weakref.WeakKeyDictionary()
+        self._known_domains = {}
+
+    def get_conversion(self, source):
+        """
+        Return an instance of :class:`DomainConversion` for conversion from the
+        given source domain to this domain. Domain conversions are cached, so
+        repeated conversions of data from the same domain (e.g. when
+        predicting with a model that preprocesses data) skip recomputation
+        of indices.
+
+        :param source: the source domain
+        :type source: Orange.data.Domain
+        """
+        # the method is thread-safe
+        c = self._last_conversion
+        if c is not None and c.source is source:
+            return c
+        # Conversions are keyed by identity: equal domains may still differ,
+        # e.g. in the order of values of discrete variables
+        key = id(source)
+        c = self._known_domains.get(key)
+        if c is None or c.source is not source:
+            c = DomainConversion(source, self)
+            # forget conversions from domains that no longer exist
+            for k, old in list(self._known_domains.items()):
+                if old.source is None:
+                    self._known_domains.pop(k, None)
+            self._known_domains[key] = c
+        self._last_conversion = c
+        return c
 
     def index(self, var):
         """
@@ -415,7 +540,7 @@ class Domain:
         if isinstance(inst, Instance):
             if inst.domain == self:
                 return inst._x, inst._y, inst._metas
-            c = DomainConversion(inst.domain, self)
+            c = self.get_conversion(inst.domain)
             l = len(inst.domain.attributes)
             values = [(inst._x[i] if 0 <= i < l
                        else inst._y[i - l] if i >= l
@@ -492,6 +617,22 @@ class Domain:
     def checksum(self):
         return hash(self)
 
+    def content_hash(self):
+        """
+        Return a hash of the domain's structure: types, names and values of
+        its attributes, class variables and meta attributes. Unlike `hash`,
+        the result is equal across processes and sessions.
+
+        Returns:
+            str: a hex digest
+        """
+        structure = [
+            [(type(var).__qualname__, var.name,
+              tuple(var.values) if var.is_discrete else ())
+             for var in variables]
+            for variables in (self.attributes, self.class_vars, self.metas)]
+        return hashlib.sha256(repr(structure).encode("utf-8")).hexdigest()
+
     def copy(self):
         """
         Make a copy of the domain. New features are proxies of the old ones,
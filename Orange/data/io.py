@@ -1,13 +1,17 @@
 import contextlib
 import csv
+import hashlib
 import locale
+import logging
+import os
 import pickle
 import re
+import struct
 import sys
 import warnings
 from typing import List, Iterable
 
-from functools import lru_cache
+from functools import lru_cache, partial
 from importlib import import_module
 from itertools import chain
 
@@ -18,11 +22,13 @@ from urllib.request import urlopen, Request
 from pathlib import Path
 
 import numpy as np
+from scipy import sparse as sp
 
 import xlrd
 import xlsxwriter
 import openpyxl
 
+import Orange
 from Orange.data import _io, Table, Domain, ContinuousVariable
 from Orange.data import Compression, open_compressed, detect_encoding, \
     isnastr, guess_data_type, sanitize_variable
@@ -34,7 +40,9 @@ from Orange.util import flatten
 # Support values longer than 128K (i.e. text contents features)
 csv.field_size_limit(100*1024*1024)
 
-__all__ = ["Flags", "FileFormat"]
+__all__ = ["Flags", "FileFormat", "FileCache"]
+
+log = logging.getLogger(__name__)
 
 
 Compression = Compression
@@ -73,6 +81,10 @@ class FileFormat(FileFormatBase):
     # Priority when multiple formats support the same extension. Also
     # the sort order in file open/save combo boxes. Lower is better.
     PRIORITY = 10000
+    # Whether tables read by this format are stored in the file cache. Only
+    # formats whose tables depend solely on the file (and sheet) and are
+    # of class Table may enable it
+    CACHEABLE = False
     OPTIONAL_TYPE_ANNOTATIONS = False
     SUPPORT_COMPRESSED = False
     SUPPORT_SPARSE_DATA = False
@@ -108,6 +120,30 @@ class FileFormat(FileFormatBase):
         """
         self.sheet = sheet
 
+    def read_chunks(self, chunk_rows):
+        """
+        Return an iterator over tables with consecutive chunks of (at most)
+        `chunk_rows` rows of data. All tables have the same domain.
+
+        Formats that can be parsed incrementally override this method to
+        avoid loading the entire file; the default implementation reads the
+        data at once and splits it into chunks.
+
+        Parameters
+        ----------
+        chunk_rows : int
+            maximal number of rows in a chunk
+
+        Returns
+        -------
+        an iterator over Orange.data.Table
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        data = self.read()
+        for start in range(0, len(data), chunk_rows):
+            yield data[start:start + chunk_rows]
+
 
 def class_from_qualified_name(format_name):
     """ File format class from qualified name. """
@@ -126,15 +162,10 @@ class CSVReader(FileFormat, DataTableMixin):
     SUPPORT_SPARSE_DATA = False
     PRIORITY = 20
     OPTIONAL_TYPE_ANNOTATIONS = True
+    CACHEABLE = True
 
     def read(self):
-        for encoding in (lambda: ('us-ascii', None),                 # fast
-                         lambda: (detect_encoding(self.filename), None),  # precise
-                         lambda: (locale.getpreferredencoding(False), None),
-                         lambda: (sys.getdefaultencoding(), None),   # desperate
-                         lambda: ('utf-8', None),                    # ...
-                         lambda: ('utf-8', 'ignore')):               # fallback
-            encoding, errors = encoding()
+        for encoding, errors in self._encodings():
             # Clear the error flag for all except the last check, because
             # the error of second-to-last check is stored and shown as warning in owfile
             if errors != 'ignore':
@@ -143,18 +174,10 @@ class CSVReader(FileFormat, DataTableMixin):
                            encoding=encoding, errors=errors) as file:
                 # Sniff the CSV dialect (delimiter, quotes, ...)
                 try:
-                    dialect = csv.Sniffer().sniff(
-                        # Take first couple of *complete* lines as sample
-                        ''.join(file.readline() for _ in range(10)),
-                        self.DELIMITERS)
-                    delimiter = dialect.delimiter
-                    quotechar = dialect.quotechar
+                    delimiter, quotechar = self._sniff_dialect(file)
                 except UnicodeDecodeError as e:
                     error = e
                     continue
-                except csv.Error:
-                    delimiter = self.DELIMITERS[0]
-                    quotechar = csv.excel.quotechar
 
                 file.seek(0)
                 try:
@@ -184,6 +207,56 @@ class CSVReader(FileFormat, DataTableMixin):
                     continue
         raise ValueError('Cannot parse dataset {}: {}'.format(self.filename, error)) from error
 
+    def read_chunks(self, chunk_rows):
+        if not isinstance(self.filename, str):
+            # File-like objects can not be reopened for the second pass
+            yield from super().read_chunks(chunk_rows)
+            return
+
+        def rows(encoding, errors):
+            with self.open(self.filename, mode='rt', newline='',
+                           encoding=encoding, errors=errors) as file:
+                delimiter, quotechar = self._sniff_dialect(file)
+                file.seek(0)
+                yield from csv.reader(file, delimiter=delimiter,
+                                      quotechar=quotechar,
+                                      skipinitialspace=True)
+
+        for encoding, errors in self._encodings():
+            try:
+                # The first pass over the file, which infers the domain,
+                # also checks the encoding
+                chunks = self.data_table_chunks(
+                    partial(rows, encoding, errors), chunk_rows)
+            except UnicodeDecodeError:
+                continue
+            break
+
+        name = path.splitext(path.split(self.filename)[-1])[0]
+        for data in chunks:
+            data.name = name
+            self.set_table_metadata(self.filename, data)
+            yield data
+
+    def _encodings(self):
+        for encoding in (lambda: ('us-ascii', None),                 # fast
+                         lambda: (detect_encoding(self.filename), None),  # precise
+                         lambda: (locale.getpreferredencoding(False), None),
+                         lambda: (sys.getdefaultencoding(), None),   # desperate
+                         lambda: ('utf-8', None),                    # ...
+                         lambda: ('utf-8', 'ignore')):               # fallback
+            yield encoding()
+
+    def _sniff_dialect(self, file):
+        try:
+            dialect = csv.Sniffer().sniff(
+                # Take first couple of *complete* lines as sample
+                ''.join(file.readline() for _ in range(10)),
+                self.DELIMITERS)
+            return dialect.delimiter, dialect.quotechar
+        except csv.Error:
+            return self.DELIMITERS[0], csv.excel.quotechar
+
     @classmethod
     def write_file(cls, filename, data, with_annotations=True):
         with cls.open(filename, mode='wt', newline='', encoding='utf-8') as file:
@@ -222,6 +295,294 @@ class PickleReader(FileFormat):
             pickle.dump(data, f, protocol=PICKLE_PROTOCOL)
 
 
+class ColumnarReader(FileFormat):
+    """Reader for Orange's binary columnar format
+
+    X, Y, metas, W and ids are stored as separate blocks, aligned to page
+    boundaries; dense numeric blocks are stored column by column and opened
+    with :obj:`numpy.memmap`, so reading a table does not load its data.
+    Columns (and rows) are paged in when they are first accessed.
+
+    The domain, the table's name and attributes, and the block descriptors
+    are pickled into a footer; its offset is stored in the last bytes of the
+    file. The footer can also contain warnings that were issued when the
+    table was parsed from another format (see :obj:`FileCache`); they are
+    issued again when the table is read.
+    """
+    EXTENSIONS = ('.ocf',)
+    DESCRIPTION = 'Orange columnar data'
+    SUPPORT_COMPRESSED = False
+    SUPPORT_SPARSE_DATA = True
+    PRIORITY = 30
+
+    MAGIC = b'ORANGE-COLUMNAR\x00'
+    VERSION = 1
+    ALIGNMENT = 4096
+    _TRAILER = struct.Struct('<Q')
+
+    def read(self):
+        with open(self.filename, 'rb') as f:
+            header = self._read_header(f)
+            blocks = {name: self._read_block(f, desc)
+                      for name, desc in header['blocks'].items()}
+
+        table = Table()
+        table.domain = header['domain']
+        table.X = blocks['X']
+        table._Y = blocks['Y']  # pylint: disable=protected-access
+        table.metas = blocks['metas']
+        table.W = blocks['W']
+        table.ids = blocks['ids']
+        table.attributes = header['attributes']
+        table.name = header['name']
+        for category, message in header.get('warnings', ()):
+            warnings.warn(message, category)
+        return table
+
+    def _read_header(self, f):
+        trailer_size = self._TRAILER.size + len(self.MAGIC)
+        if f.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError(
+                "'{}' is not in Orange columnar format".format(self.filename))
+        f.seek(-trailer_size, 2)
+        header_offset, = self._TRAILER.unpack(f.read(self._TRAILER.size))
+        if f.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError(
+                "'{}' is truncated or corrupted".format(self.filename))
+        f.seek(header_offset)
+        header = pickle.load(f)
+        if header.get('version', 0) > self.VERSION:
+            raise ValueError(
+                "'{}' was written by a newer version of Orange"
+                .format(self.filename))
+        return header
+
+    def _read_block(self, f, desc):
+        kind = desc['kind']
+        if kind == 'dense':
+            shape, dtype = tuple(desc['shape']), np.dtype(desc['dtype'])
+            if not np.prod(shape):
+                # mmap can not map empty regions
+                return np.empty(shape, dtype=dtype)
+            # Copy-on-write: tables are modifiable, but the file never changes
+            return np.memmap(self.filename, dtype=dtype, mode='c',
+                             offset=desc['offset'], shape=shape, order='F')
+        elif kind == 'sparse':
+            matrix = sp.csr_matrix if desc['format'] == 'csr' \
+                else sp.csc_matrix
+            return matrix(tuple(self._read_block(f, desc[part])
+                                for part in ('data', 'indices', 'indptr')),
+                          shape=tuple(desc['shape']))
+        elif kind == 'pickle':
+            f.seek(desc['offset'])
+            return pickle.load(f)
+        raise ValueError("Unknown block type '{}'".format(kind))
+
+    @classmethod
+    def write_file(cls, filename, data, load_warnings=()):
+        """
+        Write `data` to `filename`; `load_warnings` is a list of warnings
+        (as given by `warnings.catch_warnings(record=True)`) that are issued
+        when the table is read.
+        """
+        with open(filename, 'wb') as f:
+            f.write(cls.MAGIC)
+            metas = data.metas
+            if not sp.issparse(metas) and metas.dtype == object \
+                    and all(var.is_primitive() for var in data.domain.metas):
+                metas = metas.astype(float)
+            blocks = {
+                'X': cls._write_block(f, data.X),
+                'Y': cls._write_block(f, data._Y),  # pylint: disable=protected-access
+                'metas': cls._write_block(f, metas),
+                'W': cls._write_block(f, data.W),
+                'ids': cls._write_block(f, np.asarray(data.ids, dtype=np.int64)),
+            }
+            header_offset = f.tell()
+            pickle.dump({'version': cls.VERSION,
+                         'domain': data.domain,
+                         'name': data.name,
+                         'attributes': dict(getattr(data, 'attributes', {})),
+                         'blocks': blocks,
+                         'warnings': [(w.category, str(w.message))
+                                      for w in load_warnings]},
+                        f, protocol=PICKLE_PROTOCOL)
+            f.write(cls._TRAILER.pack(header_offset))
+            f.write(cls.MAGIC)
+
+    @classmethod
+    def _write_block(cls, f, array):
+        if sp.issparse(array):
+            if array.format not in ('csr', 'csc'):
+                array = array.tocsr()
+            return {'kind': 'sparse', 'format': array.format,
+                    'shape': array.shape,
+                    'data': cls._write_block(f, array.data),
+                    'indices': cls._write_block(f, array.indices),
+                    'indptr': cls._write_block(f, array.indptr)}
+
+        f.write(b'\0' * (-f.tell() % cls.ALIGNMENT))
+        offset = f.tell()
+        if array.dtype == object:
+            pickle.dump(array, f, protocol=PICKLE_PROTOCOL)
+            return {'kind': 'pickle', 'offset': offset}
+
+        # Write column by column to keep the memory footprint low and to
+        # store each column contiguously
+        for column in (array.T if array.ndim == 2 else [array]):
+            f.write(np.ascontiguousarray(column).tobytes())
+        return {'kind': 'dense', 'offset': offset,
+                'dtype': array.dtype.str, 'shape': array.shape}
+
+
+class FileCache:
+    """
+    Cache of tables parsed from data files.
+
+    Tables are stored in Orange's columnar format, so a cached table is
+    memory mapped instead of parsed. The cache key consists of the file's
+    absolute path, modification time and size (and those of its .metadata
+    file), the reader class and the selected sheet, and the versions of
+    Orange and of the cache; a changed file (or a new version of Orange,
+    which may parse it differently) thus gets a new key and the stale entry
+    is eventually evicted. Warnings issued by the reader are stored with the
+    table and issued again when it is read from the cache.
+
+    Only files read by formats that enable `CACHEABLE` (tab-separated,
+    comma-separated and Excel files) are cached, and only if the reader
+    returns an instance of `Table` and not of a subclass.
+
+    When the total size of cached tables exceeds `max_size` bytes, the least
+    recently used tables are removed. Files smaller than `min_file_size`
+    are parsed quickly and are not cached.
+    """
+    EXTENSION = ColumnarReader.EXTENSIONS[0]
+    MIN_FILE_SIZE = 1 << 20
+    # Increase when the format of cached tables or of the key changes
+    VERSION = 1
+
+    _default = None
+
+    def __init__(self, directory, max_size, min_file_size=MIN_FILE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.min_file_size = min_file_size
+
+    @classmethod
+    def default(cls):
+        """
+        Return the cache in Orange's cache directory, with the size given by
+        :obj:`Orange.misc.environ.file_cache_size`.
+        """
+        from Orange.misc import environ
+        directory = path.join(environ.cache_dir(), "files")
+        max_size = environ.file_cache_size() << 20
+        default = cls._default
+        if default is None \
+                or (default.directory, default.max_size) \
+                != (directory, max_size):
+            default = cls._default = cls(directory, max_size)
+        return default
+
+    def key(self, reader):
+        """
+        Return the key for the table read by `reader`, or None if the table
+        must not be cached.
+        """
+        filename = reader.filename
+        if not (self.max_size and reader.CACHEABLE
+                and isinstance(filename, str) and path.isfile(filename)):
+            return None
+        stat = os.stat(filename)
+        if stat.st_size < self.min_file_size:
+            return None
+        metafile = filename + ".metadata"
+        meta_stat = os.stat(metafile) if path.exists(metafile) else None
+        fingerprint = (
+            path.abspath(filename), stat.st_mtime_ns, stat.st_size,
+            meta_stat and (meta_stat.st_mtime_ns, meta_stat.st_size),
+            type(reader).__module__, type(reader).__qualname__, reader.sheet,
+            Orange.__version__, Orange.__git_version__,
+            self.VERSION, ColumnarReader.VERSION)
+        return hashlib.sha1(repr(fingerprint).encode("utf-8")).hexdigest()
+
+    def read(self, reader):
+        """Return the table read by `reader`, from the cache if possible."""
+        key = self.key(reader)
+        if key is None:
+            return reader.read()
+        filename = path.join(self.directory, key + self.EXTENSION)
+        try:
+            table = ColumnarReader(filename).read()
+        except Exception:  # pylint: disable=broad-except
+            # Missing, corrupted or unreadable (e.g. due to changed classes)
+            # entries are replaced
+            pass
+        else:
+            # Mark as recently used
+            os.utime(filename)
+            Table._init_ids(table)  # pylint: disable=protected-access
+            return table
+
+        with warnings.catch_warnings(record=True) as load_warnings:
+            table = reader.read()
+        for warning in load_warnings:
+            warnings.warn_explicit(warning.message, warning.category,
+                                   warning.filename, warning.lineno)
+        # Cached tables are read as Table, so subclasses are not stored
+        if type(table) is Table:  # pylint: disable=unidiomatic-typecheck
+            self._store(filename, table, load_warnings)
+        return table
+
+    def _store(self, filename, table, load_warnings=()):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file, so other processes never read
+            # a partially written table
+            with NamedTemporaryFile(dir=self.directory, suffix=".tmp",
+                                    delete=False) as f:
+                tmpname = f.name
+            try:
+                ColumnarReader.write_file(tmpname, table, load_warnings)
+                os.replace(tmpname, filename)
+            finally:
+                if path.exists(tmpname):
+                    remove(tmpname)
+        except Exception:  # pylint: disable=broad-except
+            # Caching is an optimization; tables that can not be stored
+            # (e.g. due to lack of space or unpicklable attributes) are not
+            log.exception("Table could not be cached")
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                remove(filename)
+            except OSError:  # e.g. mapped by another process on Windows
+                continue
+            total -= size
+
+    def clear(self):
+        """Remove all cached tables."""
+        if not path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.EXTENSION):
+                try:
+                    remove(entry.path)
+                except OSError:
+                    pass
+
+
 class BasketReader(FileFormat):
     """Reader for basket (sparse) files"""
     EXTENSIONS = ('.basket', '.bsk')
@@ -251,6 +612,7 @@ class _BaseExcelReader(FileFormat, DataTableMixin):
     """Base class for reading excel files"""
     SUPPORT_COMPRESSED = False
     SUPPORT_SPARSE_DATA = False
+    CACHEABLE = True
 
     def __init__(self, filename):
         super().__init__(filename=filename)
@@ -2,26 +2,29 @@ import pickle
 import re
 import sys
 import warnings
-from typing import Iterable, Optional, Tuple, List, Generator, Callable, Any
+from typing import Iterable, Optional, Tuple, List, Generator, Callable, \
+    Any, Iterator
 
 from ast import literal_eval
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Executor
 from functools import lru_cache
-from itertools import chain, repeat
+from itertools import chain, repeat, islice
 from math import isnan
 
-from os import path, remove
+from os import path, remove, cpu_count
 from fnmatch import fnmatch
 from glob import glob
 
 import numpy as np
 
 from Orange.data import Table, Domain, Variable, DiscreteVariable, \
-    StringVariable, ContinuousVariable, TimeVariable
+    StringVariable, ContinuousVariable, TimeVariable, MISSING_VALUES
 from Orange.data.io_util import Compression, open_compressed, \
-    isnastr, guess_data_type, sanitize_variable
+    isnastr, parse_floats, guess_data_type, sanitize_variable
 from Orange.data.util import get_unique_names_duplicates
-from Orange.data.variable import VariableMeta
+from Orange.data.variable import VariableMeta, DISCRETE_MAX_VALUES, \
+    DISCRETE_MAX_ALLOWED_VALUES
 from Orange.misc.collections import natural_sorted
 from Orange.util import Registry, flatten, namegen
 
@@ -184,11 +187,13 @@ class _TableBuilder:
     DATA_IND, DOMAIN_IND, TYPE_IND = range(3)
 
     def __init__(self, data: np.ndarray, ncols: int,
-                 header: _TableHeader, offset: int):
+                 header: _TableHeader, offset: int,
+                 executor: Optional[Executor] = None):
         self.data = data
         self.ncols = ncols
         self.header = header
         self.offset = offset
+        self.executor = executor
         self.namegen: Generator[str] = namegen('Feature ', 1)
 
         self.cols_X: List[np.ndarray] = []
@@ -210,17 +215,43 @@ class _TableBuilder:
         names = self.header.names
         types = self.header.types
 
+        tasks = []
         for col in range(self.ncols):
             flag = Flags(Flags.split(self.header.flags[col]))
             if flag.i:
                 continue
 
             type_ = types and types[col].strip()
-            creator = self._get_column_creator(type_)
-            column = creator(self.data, col, values=type_, offset=self.offset)
+            tasks.append((col, flag, self._get_column_creator(type_), type_))
+
+        if self.executor is None or not self.data.size:
+            columns = (creator(self.data, col, values=type_,
+                               offset=self.offset)
+                       for col, _, creator, type_ in tasks)
+        else:
+            columns = self._create_columns_parallel(tasks)
+        for (col, flag, *_), column in zip(tasks, columns):
             self._take_column(names and names[col], column, flag)
             self._reclaim_memory(self.data, col)
 
+    def _create_columns_parallel(self, tasks: List[Tuple]) -> \
+            Iterator[_ColumnProperties]:
+        # Columns are typed by the executor, but taken in their original
+        # order, so that domain (and generated names) are the same as when
+        # typing columns sequentially. Only a limited number of columns is
+        # submitted ahead, so that strings of the columns that were already
+        # taken can be reclaimed.
+        ahead = 2 * (cpu_count() or 1)
+        futures = deque()
+        for col, _, creator, type_ in tasks:
+            futures.append(self.executor.submit(
+                creator, self.data[:, col:col + 1], 0, values=type_,
+                offset=self.offset, col_offset=col))
+            if len(futures) >= ahead:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
     @classmethod
     def _get_column_creator(cls, type_: str) -> Callable:
         if type_ in StringVariable.TYPE_HEADERS:
@@ -244,12 +275,10 @@ class _TableBuilder:
 
     @staticmethod
     def _cont_column(data: np.ndarray, col: int,
-                     offset=0, **_) -> _ColumnProperties:
+                     offset=0, col_offset=0, **_) -> _ColumnProperties:
         orig_vals, namask = _TableBuilder._values_mask(data, col)
-        values = np.empty(data.shape[0], dtype=float)
         try:
-            np.copyto(values, orig_vals, casting="unsafe", where=~namask)
-            values[namask] = np.nan
+            values = parse_floats(orig_vals, namask)
         except ValueError:
             row = 0
             for row, num in enumerate(orig_vals):
@@ -259,7 +288,7 @@ class _TableBuilder:
                     except ValueError:
                         break
             raise ValueError(f'Non-continuous value in (1-based) '
-                             f'line {row + offset + 1}, column {col + 1}')
+                             f'line {row + offset + 1}, column {col + col_offset + 1}')
         return _ColumnProperties(values=values, coltype=ContinuousVariable,
                                  orig_values=orig_vals)
 
@@ -370,10 +399,243 @@ class _TableBuilder:
         return array
 
 
+class _ColumnSummary:
+    """
+    Properties of a column that are needed to determine its type and
+    variable, collected incrementally, chunk by chunk.
+
+    The inferred column type and variable are the same as if the entire
+    column was processed at once by `_TableBuilder`.
+    """
+    def __init__(self, type_: str):
+        self.type = type_
+        self.creator = _TableBuilder._get_column_creator(type_)
+        self.n_values = 0
+        self.first_values: List[str] = []
+        self.uniques = set()
+        self.too_many_uniques = False
+        self.all_float = True
+        self.all_time = True
+        self.decimals_sample: Optional[str] = None
+
+    def update(self, data: np.ndarray, col: int, offset: int):
+        creator = self.creator
+        if creator is _TableBuilder._string_column \
+                or creator is _TableBuilder._time_column \
+                or creator is _TableBuilder._disc_with_vals_column:
+            return  # type and values do not depend on data
+        if creator is _TableBuilder._cont_column:
+            # raises an exception on non-numeric values
+            column = creator(data, col, offset=offset)
+            self._update_decimals(column.orig_values)
+        elif creator is _TableBuilder._disc_no_vals_column:
+            vals, _ = _TableBuilder._disc_column(data, col)
+            self.uniques.update(vals)
+            self.uniques.discard("")
+        else:
+            self._update_unknown(*_TableBuilder._values_mask(data, col))
+
+    def _update_unknown(self, orig_values: np.ndarray, namask: np.ndarray):
+        self.n_values += len(orig_values)
+        self.first_values.extend(orig_values[:3 - len(self.first_values)])
+        if not self.too_many_uniques:
+            self.uniques.update(orig_values)
+            if len(self.uniques) > DISCRETE_MAX_ALLOWED_VALUES:
+                self.too_many_uniques = True
+                self.uniques = set()
+
+        defined = np.asarray(orig_values[~namask], dtype=str)
+        if self.all_float:
+            try:
+                defined.astype(float)
+            except ValueError:
+                self.all_float = False
+            else:
+                self._update_decimals(defined)
+        if self.all_time:
+            tvar = TimeVariable('_')
+            try:
+                for value in defined:
+                    tvar.parse_exact_iso(value)
+            except ValueError:
+                self.all_time = False
+
+    def _update_decimals(self, orig_values: Iterable[str]):
+        # Keep the value with the most decimals for `sanitize_variable`
+        def ndecimals(value):
+            return len(value) - value.find(".") if "." in value else 1
+
+        values = [v for v in (self.decimals_sample, *orig_values) if v]
+        if values:
+            self.decimals_sample = max(values, key=ndecimals)
+
+    def _is_discrete(self):
+        # Mirrors `is_discrete_values` on the entire column
+        if not self.n_values:
+            return None
+        try:
+            for value in self.first_values:
+                float(value)
+        except ValueError:
+            is_numeric = False
+            max_values = int(round(self.n_values ** .7))
+        else:
+            is_numeric = True
+            max_values = DISCRETE_MAX_VALUES
+        if self.too_many_uniques or len(self.uniques) > max_values:
+            return False
+
+        unique = {i for i in self.uniques if i not in MISSING_VALUES}
+        if not unique:
+            return None
+        if not is_numeric:
+            return unique
+        try:
+            unique_float = set(map(float, unique))
+        except ValueError:
+            return unique
+        return (not (unique_float - {0, 1}) or
+                not (unique_float - {1, 2})) and unique
+
+    def column_properties(self) -> _ColumnProperties:
+        """
+        Return properties of the column, without values; `orig_values`
+        contain a sample that determines the number of decimals.
+        """
+        creator = self.creator
+        valuemap = None
+        if creator is _TableBuilder._string_column:
+            coltype = StringVariable
+        elif creator is _TableBuilder._cont_column:
+            coltype = ContinuousVariable
+        elif creator is _TableBuilder._time_column:
+            coltype = TimeVariable
+        elif creator is _TableBuilder._disc_with_vals_column:
+            valuemap, coltype = Flags.split(self.type), DiscreteVariable
+        elif creator is _TableBuilder._disc_no_vals_column:
+            valuemap = natural_sorted(self.uniques)
+            coltype = DiscreteVariable
+        else:
+            is_discrete = self._is_discrete()
+            if is_discrete:
+                valuemap = natural_sorted(is_discrete)
+                coltype = DiscreteVariable
+            elif self.all_float:
+                coltype = ContinuousVariable
+            else:
+                coltype = StringVariable
+            if coltype is not ContinuousVariable and self.all_time:
+                valuemap, coltype = None, TimeVariable
+        sample = [self.decimals_sample] \
+            if self.decimals_sample and coltype is ContinuousVariable else []
+        return _ColumnProperties(valuemap=valuemap, values=np.array([]),
+                                 orig_values=sample, coltype=coltype)
+
+
+class _ChunkedTableBuilder(_TableBuilder):
+    """
+    Build tables with a common domain from chunks of data.
+
+    All chunks are first passed to `update`, which collects the properties
+    needed to infer the domain. Tables are then constructed from the chunks
+    by `chunk_table`. The domain is the same as it would be if the data was
+    read at once.
+    """
+    def __init__(self, header: _TableHeader, offset: int):
+        super().__init__(np.empty((0, 0), dtype=object), 0, header, offset)
+        self.n_rows = 0
+        self.summaries: Optional[List[Optional[_ColumnSummary]]] = None
+        self.converters: \
+            Optional[List[Optional[Tuple[Flags, VariableMeta, Callable]]]] \
+            = None
+        self.domain: Optional[Domain] = None
+
+    def update(self, data: np.ndarray, ncols: int):
+        if self.summaries is None:
+            self.ncols = ncols
+            types = self.header.types
+            self.summaries = [
+                None if Flags(Flags.split(self.header.flags[col])).i
+                else _ColumnSummary(types and types[col].strip())
+                for col in range(ncols)]
+        for col, summary in enumerate(self.summaries):
+            if summary is not None:
+                summary.update(data, col, self.offset + self.n_rows)
+        self.n_rows += len(data)
+
+    def get_domain(self) -> Domain:
+        if self.domain is None:
+            self._create_variables()
+        return self.domain
+
+    def _create_variables(self):
+        names = self.header.names
+        self.converters = []
+        for col, summary in enumerate(self.summaries or []):
+            if summary is None:
+                self.converters.append(None)
+                continue
+            flag = Flags(Flags.split(self.header.flags[col]))
+            column = summary.column_properties()
+            _, dom_vars = self._lists_from_flag(flag, column.coltype)
+            var = None
+            if dom_vars is not None:
+                name = names and names[col] or next(self.namegen)
+                _, var = sanitize_variable(
+                    column.valuemap, column.values, column.orig_values,
+                    column.coltype, column.coltype_kwargs, name=name)
+                var.attributes.update(flag.attributes)
+                dom_vars.append(var)
+            self.converters.append(
+                (flag, column.coltype, self._converter(var, column.coltype)))
+        self.domain = Domain(self.attrs, self.clses, self.metas)
+
+    @staticmethod
+    def _converter(var: Optional[Variable], coltype: VariableMeta) -> Callable:
+        # Return a function that converts a column of string values in
+        # the same way as `sanitize_variable` does; weights (for which there
+        # is no variable) are converted to floats
+        if var is None:
+            coltype = ContinuousVariable
+        if coltype is DiscreteVariable:
+            mapping = defaultdict(
+                lambda: np.nan, {val: i for i, val in enumerate(var.values)})
+            mapping[""] = np.nan
+            mapvalues = np.frompyfunc(mapping.__getitem__, 1, 1)
+            return lambda vals: mapvalues(
+                vals, out=np.empty_like(vals, dtype=float))
+        elif coltype is TimeVariable:
+            return lambda vals: np.array([var.parse(i) for i in vals],
+                                         dtype=float)
+        elif coltype is StringVariable:
+            return lambda vals: vals
+        else:
+            return lambda vals: \
+                _TableBuilder._cont_column(vals[:, None], 0).values
+
+    def chunk_table(self, data: np.ndarray) -> Table:
+        """Construct a table with the inferred domain from a chunk"""
+        domain = self.get_domain()
+        self.data = data
+        for cols in (self.cols_X, self.cols_Y, self.cols_M, self.cols_W):
+            cols.clear()
+        if not data.size:
+            return Table.from_domain(domain, 0)
+        for col, converter in enumerate(self.converters):
+            if converter is None:
+                continue
+            flag, coltype, convert = converter
+            cols, _ = self._lists_from_flag(flag, coltype)
+            values, _ = self._values_mask(data, col)
+            cols.append(convert(values))
+        return Table.from_numpy(domain, *self.get_arrays())
+
+
 class DataTableMixin:
     @classmethod
     def data_table(cls, data: Iterable[List[str]],
-                   headers: Optional[List] = None) -> Table:
+                   headers: Optional[List] = None,
+                   executor: Optional[Executor] = None) -> Table:
         """
         Return Orange.data.Table given rows of `headers` (iterable of iterable)
         and rows of `data` (iterable of iterable).
@@ -390,6 +652,9 @@ class DataTableMixin:
             File content.
         headers: List (Optional)
             Header rows, to be used for constructing domain.
+        executor: Executor (Optional)
+            If given, columns are typed and converted in parallel by the
+            executor (e.g. `ThreadPoolExecutor` or `ProcessPoolExecutor`).
 
         Returns
         -------
@@ -402,9 +667,66 @@ class DataTableMixin:
         header = _TableHeader(headers)
         # adjusting data may change header properties
         array, n_columns = cls.adjust_data_width(data, header)
-        builder = _TableBuilder(array, n_columns, header, len(headers))
+        builder = _TableBuilder(array, n_columns, header, len(headers),
+                                executor)
         return builder.create_table()
 
+    @classmethod
+    def data_table_chunks(cls, data: Callable[[], Iterable[List[str]]],
+                          chunk_rows: int) -> Iterator[Table]:
+        """
+        Return an iterator over tables with (at most) `chunk_rows` rows
+        and a common domain, given a function that returns rows of data,
+        including the header rows.
+
+        The function is called twice. The first pass over data, which infers
+        the domain, is made before this method returns; the second pass is
+        made while iterating over the tables. The domain is the same as the
+        one that would be given by `data_table`.
+
+        Parameters
+        ----------
+        data: Callable
+            A function that returns an iterable over file content.
+        chunk_rows: int
+            Maximal number of rows in a table.
+
+        Returns
+        -------
+        tables: Iterator[Table]
+            Tables with consecutive chunks of data.
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+
+        headers, rows = cls.parse_headers(data())
+        header = _TableHeader(headers)
+        builder = _ChunkedTableBuilder(header, len(headers))
+        for array, n_columns in cls._chunks(rows, header, chunk_rows):
+            builder.update(array, n_columns)
+        if builder.summaries is None:  # no data; columns are given by header
+            builder.update(*cls.adjust_data_width([], header))
+        builder.get_domain()
+
+        def tables():
+            _, rows = cls.parse_headers(data())
+            for array, _ in cls._chunks(rows, header, chunk_rows):
+                yield builder.chunk_table(array)
+
+        return tables()
+
+    @classmethod
+    def _chunks(cls, rows: Iterable[List[str]], header: _TableHeader,
+                chunk_rows: int) -> Iterator[Tuple[np.ndarray, int]]:
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            array, n_columns = cls.adjust_data_width(chunk, header)
+            if len(array):
+                yield array, n_columns
+
     @classmethod
     def parse_headers(cls, data: Iterable[List[str]]) -> Tuple[List, Iterable]:
         """
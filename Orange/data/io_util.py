@@ -11,7 +11,7 @@ from Orange.data import (
 from Orange.misc.collections import natural_sorted
 
 __all__ = ["Compression", "open_compressed", "detect_encoding", "isnastr",
-           "guess_data_type", "sanitize_variable"]
+           "parse_floats", "guess_data_type", "sanitize_variable"]
 
 
 class Compression:
@@ -112,31 +112,58 @@ def isnastr(arr, out=None):
     return __isnastr(arr, out=out)
 
 
+def parse_floats(values, namask):
+    """
+    Convert an array of strings into an array of floats in a single pass.
+
+    Values at which `namask` is True are set to `nan`; the rest are converted
+    by numpy. Raises `ValueError` if any of the non-missing values is not
+    a number.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Input (object) array of strings.
+    namask : np.ndarray
+        Boolean mask of missing values, as returned by `isnastr`.
+
+    Returns
+    -------
+    floats : np.ndarray
+    """
+    values = np.asarray(values)
+    floats = np.full(len(values), np.nan)
+    present = ~namask
+    floats[present] = values[present]
+    return floats
+
+
 def guess_data_type(orig_values, namask=None):
     """
     Use heuristics to guess data type.
     """
     valuemap, values = None, orig_values
     is_discrete = is_discrete_values(orig_values)
-    orig_values = np.asarray(orig_values, dtype=str)
     if namask is None:
+        orig_values = np.asarray(orig_values, dtype=str)
         namask = isnastr(orig_values)
     if is_discrete:
         valuemap = natural_sorted(is_discrete)
         coltype = DiscreteVariable
     else:
-        # try to parse as float
-        values = np.empty_like(orig_values, dtype=float)
-        values[namask] = np.nan
+        # try to parse as float; this is the common case, so it avoids
+        # converting the values to a string array, which only other types need
         try:
-            np.copyto(values, orig_values, where=~namask, casting="unsafe")
+            values = parse_floats(orig_values, namask)
         except ValueError:
-            values = orig_values
             coltype = StringVariable
         else:
             coltype = ContinuousVariable
 
     if coltype is not ContinuousVariable:
+        orig_values = np.asarray(orig_values, dtype=str)
+        if coltype is StringVariable:
+            values = orig_values
         # when not continuous variable it can still be time variable even it
         # was before recognized as a discrete
         tvar = TimeVariable('_')
@@ -1,6 +1,7 @@
 """Pandas DataFrame↔Table conversion helpers"""
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from pandas.api.types import (
     is_categorical_dtype, is_object_dtype,
     is_datetime64_any_dtype, is_numeric_dtype,
@@ -11,10 +12,11 @@ from Orange.data import (
     ContinuousVariable,
 )
 
-__all__ = ['table_from_frame', 'table_to_frame']
+__all__ = ['table_from_frame', 'table_to_frame',
+           'table_from_arrow', 'table_to_arrow']
 
 
-def table_from_frame(df, *, force_nominal=False):
+def table_from_frame(df, *, force_nominal=False, copy=True):
     """
     Convert pandas.DataFrame to Orange.data.Table
 
@@ -23,6 +25,10 @@ def table_from_frame(df, *, force_nominal=False):
     df : pandas.DataFrame
     force_nominal : boolean
         If True, interpret ALL string columns as nominal (DiscreteVariable).
+    copy : boolean (default=True)
+        If False and all columns of `df` are stored in a single block of
+        floats, the table's X is a view of this block, so the table shares
+        memory with `df`.
 
     Returns
     -------
@@ -50,6 +56,12 @@ def table_from_frame(df, *, force_nominal=False):
                                        df.index.is_monotonic_decreasing)):
         df = df.reset_index()
 
+    if not copy:
+        X = _frame_float_view(df)
+        if X is not None:
+            attrs = [ContinuousVariable(str(name)) for name in df.columns]
+            return Table.from_numpy(Domain(attrs), X)
+
     attrs, metas = [], []
     X, M = [], []
 
@@ -59,7 +71,8 @@ def table_from_frame(df, *, force_nominal=False):
         if _is_discrete(s):
             discrete = s.astype('category').cat
             attrs.append(DiscreteVariable(name, discrete.categories.astype(str).tolist()))
-            X.append(discrete.codes.replace(-1, np.nan).values)
+            codes = discrete.codes.values
+            X.append(np.where(codes == -1, np.nan, codes))
         elif _is_datetime(s):
             tvar = TimeVariable(name)
             attrs.append(tvar)
@@ -78,7 +91,22 @@ def table_from_frame(df, *, force_nominal=False):
                             np.column_stack(M) if M else None)
 
 
-def table_to_frame(tab, include_metas=False):
+def _frame_float_view(df):
+    """
+    Return a 2d view of the values of `df` if they are stored in a single
+    contiguous block of (finite or missing) floats, or None otherwise.
+    """
+    if not len(df.columns) \
+            or any(dtype != np.float64 for dtype in df.dtypes):
+        return None
+    X = df.to_numpy(dtype=np.float64, copy=False)
+    # Table would replace infs with nans in the frame
+    if X.base is None or np.isinf(X).any():
+        return None
+    return X
+
+
+def table_to_frame(tab, include_metas=False, copy=True):
     """
     Convert Orange.data.Table to pandas.DataFrame
 
@@ -89,6 +117,11 @@ def table_to_frame(tab, include_metas=False):
     include_metas : bool, (default=False)
         Include table metas into dataframe.
 
+    copy : bool, (default=True)
+        If False and all attributes are continuous, the frame's columns for
+        attributes are a view of `tab.X`, so the frame shares memory with the
+        table. In this case, the columns are never converted to integers.
+
     Returns
     -------
     pandas.DataFrame
@@ -105,8 +138,7 @@ def table_to_frame(tab, include_metas=False):
         elif col.is_continuous:
             dt = float
             # np.nan are not compatible with int column
-            nan_values_in_column = [t for t in vals if np.isnan(t)]
-            if col.number_of_decimals == 0 and len(nan_values_in_column) == 0:
+            if col.number_of_decimals == 0 and not np.isnan(vals).any():
                 dt = int
             result = (col.name, pd.Series(vals).astype(dt))
         elif col.is_string:
@@ -118,17 +150,75 @@ def table_to_frame(tab, include_metas=False):
 
     x, y, metas = [], [], []
     domain = tab.domain
-    if domain.attributes:
+    x_view = not copy and domain.attributes and not sp.issparse(tab.X) \
+        and all(type(var) is ContinuousVariable  # pylint: disable=unidiomatic-typecheck
+                for var in domain.attributes)
+    if domain.attributes and not x_view:
         x = _columns_to_series(domain.attributes, tab.X)
     if domain.class_vars:
         y_values = tab.Y.reshape(tab.Y.shape[0], len(domain.class_vars))
         y = _columns_to_series(domain.class_vars, y_values)
-    if domain.metas:
+    if domain.metas and include_metas:
         metas = _columns_to_series(domain.metas, tab.metas)
     all_series = dict(x + y + metas)
-    all_vars = tab.domain.variables
+    all_vars = tab.domain.class_vars if x_view else tab.domain.variables
     if include_metas:
         all_vars += tab.domain.metas
     original_column_order = [var.name for var in all_vars]
-    unsorted_columns_df = pd.DataFrame(all_series)
-    return unsorted_columns_df[original_column_order]
+    unsorted_columns_df = pd.DataFrame(all_series, index=range(len(tab)))
+    df = unsorted_columns_df[original_column_order]
+    if x_view:
+        x_df = pd.DataFrame(tab.X, columns=[var.name for var in domain.attributes],
+                            copy=False)
+        df = pd.concat([x_df, df], axis=1, copy=False)
+    return df
+
+
+def table_from_arrow(batch, *, force_nominal=False):
+    """
+    Convert pyarrow.RecordBatch (or pyarrow.Table) to Orange.data.Table
+
+    Columns are converted as in `table_from_frame`; dictionary-encoded
+    columns become discrete variables and timestamps time variables.
+    Arrow's columns are first copied into a data frame. If all columns are
+    floats, the table's X is a view of the frame's block, so the data is
+    copied once; otherwise columns are converted and stacked into the
+    table's arrays as in `table_from_frame`, which copies them again.
+
+    Parameters
+    ----------
+    batch : pyarrow.RecordBatch or pyarrow.Table
+    force_nominal : boolean
+        If True, interpret ALL string columns as nominal (DiscreteVariable).
+
+    Returns
+    -------
+    Table
+    """
+    return table_from_frame(batch.to_pandas(), force_nominal=force_nominal,
+                            copy=False)
+
+
+def table_to_arrow(tab, include_metas=False):
+    """
+    Convert Orange.data.Table to pyarrow.RecordBatch
+
+    Discrete variables become dictionary-encoded columns and time variables
+    timestamps. Columns of continuous attributes from Fortran-ordered `tab.X`
+    are passed to Arrow without copying. Missing values are encoded as
+    nulls.
+
+    Parameters
+    ----------
+    tab : Table
+    include_metas : bool, (default=False)
+        Include table metas into record batch.
+
+    Returns
+    -------
+    pyarrow.RecordBatch
+    """
+    import pyarrow  # pylint: disable=import-outside-toplevel
+
+    df = table_to_frame(tab, include_metas=include_metas, copy=False)
+    return pyarrow.RecordBatch.from_pandas(df, preserve_index=False)
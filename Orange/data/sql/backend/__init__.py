@@ -9,3 +9,8 @@ try:
     from .mssql import PymssqlBackend
 except ImportError:
     pass
+
+try:
+    from .sqlite import SqliteBackend
+except ImportError:
+    pass
@@ -1,5 +1,9 @@
 import logging
+import re
+import threading
+from collections import OrderedDict, deque
 from contextlib import contextmanager
+from time import time
 
 from Orange.util import Registry
 
@@ -22,8 +26,20 @@ class Backend(metaclass=Registry):
 
     display_name = ""
 
+    #: the maximal number of result rows kept in the query cache
+    query_cache_rows = 100000
+    #: the number of seconds for which cached results are valid; results
+    #: of queries may thus be stale for this long after the data changes,
+    #: unless `clear_cache` is called (0, the default, disables the cache)
+    query_cache_ttl = 0
+    #: the number of latest queries whose latencies are kept
+    query_log_size = 100
+
     def __init__(self, connection_params):
         self.connection_params = connection_params
+        self.query_cache = QueryCache(self.query_cache_rows,
+                                      self.query_cache_ttl)
+        self.query_times = deque(maxlen=self.query_log_size)
 
     @classmethod
     def available_backends(cls):
@@ -84,6 +100,21 @@ class Backend(metaclass=Registry):
         with self.execute_sql_query(query) as cur:
             return cur.description
 
+    def primary_key(self, table_name):
+        """Return the names of columns of the table's primary key
+
+        Parameters
+        ----------
+        table_name: str
+            the (quoted) name of a table
+
+        Returns
+        -------
+        a list of (unquoted) column names, or None if the table has no
+        primary key or the backend can not determine it
+        """
+        return None
+
     def get_distinct_values(self, field_name, table_name):
         """Return a list of distinct values of field
 
@@ -101,8 +132,7 @@ class Backend(metaclass=Registry):
         query = self.create_sql_query(table_name, fields,
                                       group_by=fields, order_by=fields,
                                       limit=21)
-        with self.execute_sql_query(query) as cur:
-            values = cur.fetchall()
+        values = self.fetch_all(query)
         if len(values) > 20:
             return ()
         else:
@@ -191,6 +221,146 @@ class Backend(metaclass=Registry):
         """
         raise NotImplementedError
 
+    def fetch_all(self, query, params=None):
+        """Return all rows of the query's result, using the query cache
+
+        Results are cached by the (normalized) text of the query and its
+        parameters, so the method must only be used for queries whose
+        results do not change, except when the data in the database
+        changes; call clear_cache in that case.
+
+        Parameters
+        ----------
+        query : string
+            query to be executed
+        params: tuple
+            parameters to be passed to the query
+
+        Returns
+        -------
+        a list of rows
+        """
+        rows = self.query_cache.get(query, params)
+        if rows is None:
+            args = () if params is None else (params, )
+            with self.execute_sql_query(query, *args) as cur:
+                rows = cur.fetchall()
+            self.query_cache.put(query, params, rows)
+        else:
+            log.debug("Cached: %s", query)
+        return rows
+
+    def clear_cache(self):
+        """Remove all results from the query cache"""
+        self.query_cache.clear()
+
+    def _log_query(self, query, start):
+        """Log the time since start, at which the query was started"""
+        elapsed = time() - start
+        self.query_times.append((query, elapsed))
+        log.info("%.2f ms: %s", 1000 * elapsed, query)
+
+    def query_statistics(self):
+        """Return latencies of the latest queries and query cache counts
+
+        Returns
+        -------
+        a dictionary with a list of (query, seconds) for the latest
+        queries ("latencies"), and the numbers of cache hits ("cache_hits")
+        and misses ("cache_misses")
+        """
+        return dict(latencies=list(self.query_times),
+                    cache_hits=self.query_cache.hits,
+                    cache_misses=self.query_cache.misses)
+
+    def bin_expression(self, field, low, high, n_bins):
+        """Return an expression with index of the bin of the field's value
+
+        Values between low and high (inclusive) are split into n_bins bins
+        of equal width; indices go from 0 to n_bins - 1.
+
+        Parameters
+        ----------
+        field : str
+            an SQL expression with numeric values
+        low, high : float
+            the range of values
+        n_bins : int
+            the number of bins
+
+        Returns
+        -------
+        string containing SQL expression
+        """
+        return "CASE WHEN {0} >= {2!r} THEN {3} " \
+               "ELSE FLOOR(({0} - {1!r}) / {4!r}) END".format(
+                   field, float(low), float(high), n_bins - 1,
+                   float(high - low) / n_bins)
+
+    def create_quantiles_query(self, table_name, fields, quantiles,
+                               filters=()):
+        """Construct a query that computes quantiles of the fields
+
+        Parameters
+        ----------
+        table_name : str
+        fields : List[str]
+            SQL expressions with numeric values
+        quantiles : List[float]
+            quantiles (between 0 and 1)
+        filters : List[str]
+
+        Returns
+        -------
+        string containing sql query, which returns a single row; its
+        items are quantiles or sequences of quantiles, which give the
+        quantiles of the first field, followed by those of the second...
+        """
+        raise NotImplementedError
+
+    def create_sample_query(self, table_name, method, parameter):
+        """Construct a query that selects a random sample of table's rows
+
+        Parameters
+        ----------
+        table_name : str
+        method : str
+            "system" (the parameter is the percentage of rows) or
+            "system_time" (the parameter is the time in milliseconds)
+        parameter : str
+
+        Returns
+        -------
+        string containing sql query
+        """
+        return " ".join(["SELECT * FROM", table_name,
+                         "TABLESAMPLE", method, "(", parameter, ")"])
+
+    def fetch_batches(self, query, batch_size):
+        """Execute the query and yield its results in batches
+
+        The default implementation fetches the rows from the cursor returned
+        by execute_sql_query. Backends should override it if the cursor
+        would otherwise load the entire result into memory.
+
+        Parameters
+        ----------
+        query : string
+            query to be executed
+        batch_size : int
+            the maximal number of rows in a batch
+
+        Returns
+        -------
+        yields lists of (at most batch_size) rows
+        """
+        with self.execute_sql_query(query) as cur:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+
     def quote_identifier(self, name):
         """Quote identifier name so it can be safely used in queries
 
@@ -221,6 +391,77 @@ class Backend(metaclass=Registry):
         raise NotImplementedError
 
 
+class QueryCache:
+    """A thread-safe cache of query results
+
+    Results are keyed by queries (with whitespace outside string literals
+    normalized) and their parameters. Results older than `ttl` seconds are
+    discarded, and the least recently used results are removed when the
+    total number of rows exceeds `max_rows`; results with more rows are not
+    cached at all. Nothing is cached if `ttl` is 0.
+    """
+    _LITERAL = re.compile(r"('(?:[^']|'')*')")
+
+    def __init__(self, max_rows, ttl):
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()  # key -> (time, rows)
+        self._n_rows = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def key(cls, query, params=None):
+        parts = cls._LITERAL.split(query.strip())
+        parts[::2] = (" ".join(part.split()) for part in parts[::2])
+        return "".join(parts), repr(params)
+
+    def get(self, query, params=None):
+        key = self.key(query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time() - entry[0] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, query, params, rows):
+        if len(rows) > self.max_rows or self.ttl <= 0:
+            return
+        key = self.key(query, params)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time(), rows)
+            self._n_rows += len(rows)
+            while self._n_rows > self.max_rows:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._n_rows = 0
+
+    def _remove(self, key):
+        _, rows = self._entries.pop(key)
+        self._n_rows -= len(rows)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Locks cannot be pickled; cached results are not worth pickling
+        return dict(max_rows=self.max_rows, ttl=self.ttl)
+
+    def __setstate__(self, state):
+        self.__init__(state["max_rows"], state["ttl"])
+
+
 class TableDesc:
     def __init__(self, name, schema, sql):
         self.name = name
@@ -231,6 +472,9 @@ class TableDesc:
         return self.name
 
 class ToSql:
+    # Columns of discrete variables contain values, not their indices
+    values_as_strings = True
+
     def __init__(self, sql):
         self.sql = sql
 
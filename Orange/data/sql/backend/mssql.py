@@ -1,6 +1,8 @@
 import re
+import threading
 import warnings
 from contextlib import contextmanager
+from time import time
 
 import pymssql  # pylint: disable=import-error
 
@@ -16,8 +18,63 @@ def parse_ex(ex: Exception) -> str:
         return str(ex)
 
 
+class ConnectionPool:
+    """A thread-safe pool of pymssql connections
+
+    Like psycopg2's ThreadedConnectionPool, the pool opens `minconn`
+    connections in advance and at most `maxconn` connections in total.
+    Connections are taken with `getconn` and returned with `putconn`.
+    """
+    def __init__(self, minconn, maxconn, **connection_params):
+        self.maxconn = maxconn
+        self.connection_params = connection_params
+        self._idle = []
+        self._n_used = 0
+        self._lock = threading.Lock()
+        for _ in range(minconn):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        try:
+            return pymssql.connect(login_timeout=5, **self.connection_params)
+        except pymssql.Error as ex:
+            raise BackendError(parse_ex(ex)) from ex
+        except ValueError:
+            # ValueError is raised when 'server' contains "\\"
+            raise BackendError("Incorrect format of connection details")
+
+    def getconn(self):
+        with self._lock:
+            if not self._idle and self._n_used >= self.maxconn:
+                raise BackendError("Connection pool exhausted")
+            self._n_used += 1
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._connect()
+        except BackendError:
+            with self._lock:
+                self._n_used -= 1
+            raise
+
+    def putconn(self, connection, close=False):
+        with self._lock:
+            self._n_used -= 1
+            if not close:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def closeall(self):
+        with self._lock:
+            for connection in self._idle:
+                connection.close()
+            self._idle = []
+
+
 class PymssqlBackend(Backend):
     display_name = "SQL Server"
+    connection_pool = None
 
     def __init__(self, connection_params):
         connection_params["server"] = connection_params.pop("host", None)
@@ -27,13 +84,11 @@ class PymssqlBackend(Backend):
                 del connection_params[key]
 
         super().__init__(connection_params)
-        try:
-            self.connection = pymssql.connect(login_timeout=5, **connection_params)
-        except pymssql.Error as ex:
-            raise BackendError(parse_ex(ex)) from ex
-        except ValueError:
-            # ValueError is raised when 'server' contains "\\"
-            raise BackendError("Incorrect format of connection details")
+        if self.connection_pool is None:
+            self._create_connection_pool()
+
+    def _create_connection_pool(self):
+        self.connection_pool = ConnectionPool(1, 16, **self.connection_params)
 
     def list_tables_query(self, schema=None):
         return """
@@ -65,7 +120,8 @@ class PymssqlBackend(Backend):
             sql.extend(["GROUP BY", ", ".join(group_by)])
 
         if offset and not order_by:
-            order_by = fields[0].split("AS")[1:]
+            # OFFSET requires ORDER BY; (SELECT NULL) keeps the natural order
+            order_by = fields[0].split("AS")[1:] or ["(SELECT NULL)"]
 
         if order_by:
             sql.extend(["ORDER BY", ",".join(order_by)])
@@ -76,14 +132,47 @@ class PymssqlBackend(Backend):
 
         return " ".join(sql)
 
+    def create_quantiles_query(self, table_name, fields, quantiles,
+                               filters=()):
+        # PERCENTILE_CONT is a window function in SQL Server; all rows
+        # contain the same values
+        fields = ["PERCENTILE_CONT({!r}) WITHIN GROUP (ORDER BY {}) OVER ()"
+                  .format(float(q), field)
+                  for field in fields for q in quantiles]
+        return self.create_sql_query(table_name, fields, filters, limit=1)
+
+    def primary_key(self, table_name):
+        query = """
+            SELECT c.name
+              FROM sys.indexes i
+              JOIN sys.index_columns ic ON ic.object_id = i.object_id
+                                       AND ic.index_id = i.index_id
+              JOIN sys.columns c ON c.object_id = ic.object_id
+                                AND c.column_id = ic.column_id
+             WHERE i.is_primary_key = 1 AND i.object_id = OBJECT_ID(%s)
+             ORDER BY ic.key_ordinal"""
+        try:
+            columns = [name for name, in self.fetch_all(query, (table_name,))]
+        except BackendError:
+            return None
+        return columns or None
+
     @contextmanager
     def execute_sql_query(self, query, params=()):
+        connection = self.connection_pool.getconn()
         try:
-            with self.connection.cursor() as cur:
+            with connection.cursor() as cur:
+                t = time()
                 cur.execute(query, *params)
                 yield cur
+                self._log_query(query, t)
         except pymssql.Error as ex:
             raise BackendError(parse_ex(ex)) from ex
+        finally:
+            try:
+                connection.commit()
+            finally:
+                self.connection_pool.putconn(connection)
 
     def create_variable(self, field_name, field_metadata, type_hints, inspect_table=None):
         if field_name in type_hints:
@@ -128,27 +217,43 @@ class PymssqlBackend(Backend):
     EST_ROWS_RE = re.compile(r'StatementEstRows="(\d+)"')
 
     def count_approx(self, query):
-        with self.connection.cursor() as cur:
-            try:
-                cur.execute("SET SHOWPLAN_XML ON")
+        connection = self.connection_pool.getconn()
+        try:
+            with connection.cursor() as cur:
                 try:
-                    cur.execute(query)
-                    result = cur.fetchone()
-                    match = self.EST_ROWS_RE.search(result[0])
-                    if not match:
-                    # Either StatementEstRows was not found or
-                    # a float is received.
-                    # If it is a float then it is most probable
-                    # that the server's statistics are out of date
-                    # and the result is false. In that case
-                    # it is preferable to return None so
-                    # an exact count be used.
+                    cur.execute("SET SHOWPLAN_XML ON")
+                    try:
+                        cur.execute(query)
+                        result = cur.fetchone()
+                        match = self.EST_ROWS_RE.search(result[0])
+                        if not match:
+                        # Either StatementEstRows was not found or
+                        # a float is received.
+                        # If it is a float then it is most probable
+                        # that the server's statistics are out of date
+                        # and the result is false. In that case
+                        # it is preferable to return None so
+                        # an exact count be used.
+                            return None
+                        return int(match.group(1))
+                    finally:
+                        cur.execute("SET SHOWPLAN_XML OFF")
+                except pymssql.Error as ex:
+                    if "SHOWPLAN permission denied" in str(ex):
+                        warnings.warn("SHOWPLAN permission denied, count approximates will not be used")
                         return None
-                    return int(match.group(1))
-                finally:
-                    cur.execute("SET SHOWPLAN_XML OFF")
-            except pymssql.Error as ex:
-                if "SHOWPLAN permission denied" in str(ex):
-                    warnings.warn("SHOWPLAN permission denied, count approximates will not be used")
-                    return None
-                raise BackendError(parse_ex(ex)) from ex
+                    raise BackendError(parse_ex(ex)) from ex
+        finally:
+            self.connection_pool.putconn(connection)
+
+    def __getstate__(self):
+        # Drop connection_pool from state as it cannot be pickled
+        state = dict(self.__dict__)
+        state.pop('connection_pool', None)
+        return state
+
+    def __setstate__(self, state):
+        # Create a new connection pool if none exists
+        self.__dict__.update(state)
+        if self.connection_pool is None:
+            self._create_connection_pool()
@@ -3,6 +3,7 @@ import re
 import warnings
 from contextlib import contextmanager
 from time import time
+from uuid import uuid4
 
 from psycopg2 import Error, ProgrammingError  # pylint: disable=import-error
 from psycopg2.pool import ThreadedConnectionPool  # pylint: disable=import-error
@@ -70,6 +71,20 @@ class Psycopg2Backend(Backend):
             sql.extend(["LIMIT", str(limit)])
         return " ".join(sql)
 
+    def primary_key(self, table_name):
+        query = """
+            SELECT a.attname
+              FROM pg_index i
+              JOIN pg_attribute a ON a.attrelid = i.indrelid
+                                 AND a.attnum = ANY(i.indkey)
+             WHERE i.indrelid = %s::regclass AND i.indisprimary
+             ORDER BY a.attnum"""
+        try:
+            columns = [name for name, in self.fetch_all(query, (table_name,))]
+        except BackendError:
+            return None
+        return columns or None
+
     @contextmanager
     def execute_sql_query(self, query, params=None):
         connection = self.connection_pool.getconn()
@@ -80,12 +95,54 @@ class Psycopg2Backend(Backend):
             t = time()
             cur.execute(query, params)
             yield cur
-            log.info("%.2f ms: %s", 1000 * (time() - t), utfquery)
+            self._log_query(utfquery, t)
+        except (Error, ProgrammingError) as ex:
+            raise BackendError(str(ex)) from ex
+        finally:
+            try:
+                connection.commit()
+            finally:
+                self.connection_pool.putconn(connection)
+
+    def bin_expression(self, field, low, high, n_bins):
+        # width_bucket puts the upper bound into an additional bucket;
+        # LEAST would ignore NULLs, so they are kept by CASE
+        return "CASE WHEN {0} >= {2!r} THEN {3} " \
+               "ELSE width_bucket({0}, {1!r}, {2!r}, {4}) - 1 END".format(
+                   field, float(low), float(high), n_bins - 1, n_bins)
+
+    def create_quantiles_query(self, table_name, fields, quantiles,
+                               filters=()):
+        fields = [
+            "percentile_cont(ARRAY{}::double precision[]) "
+            "WITHIN GROUP (ORDER BY {})".format(
+                [float(q) for q in quantiles], field)
+            for field in fields]
+        return self.create_sql_query(table_name, fields, filters)
+
+    def fetch_batches(self, query, batch_size):
+        # A named (server-side) cursor transfers rows in batches;
+        # an ordinary cursor would transfer the entire result at once
+        connection = self.connection_pool.getconn()
+        try:
+            cur = connection.cursor(name="orange_{}".format(uuid4().hex))
+            log.debug("Executing: %s", query)
+            t = time()
+            cur.execute(query)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+            cur.close()
+            self._log_query(query, t)
         except (Error, ProgrammingError) as ex:
             raise BackendError(str(ex)) from ex
         finally:
-            connection.commit()
-            self.connection_pool.putconn(connection)
+            try:
+                connection.commit()
+            finally:
+                self.connection_pool.putconn(connection)
 
     def quote_identifier(self, name):
         return '"%s"' % name
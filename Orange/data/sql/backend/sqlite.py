@@ -0,0 +1,288 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from time import time
+from uuid import uuid4
+
+import numpy as np
+
+from Orange.data import ContinuousVariable, DiscreteVariable, StringVariable, TimeVariable
+from Orange.data.sql.backend.base import Backend, ToSql, BackendError
+
+log = logging.getLogger(__name__)
+
+# Substrings of declared types of columns with real (or numeric) affinity
+REAL_TYPES = ("REAL", "FLOA", "DOUB", "NUMERIC", "DECIMAL")
+
+
+class _StdDev:
+    """Sample standard deviation, like STDDEV in PostgreSQL"""
+    def __init__(self):
+        self.n = 0
+        self.mean = self.m2 = 0.
+
+    def step(self, value):
+        if value is None:
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def finalize(self):
+        if self.n < 2:
+            return None
+        return math.sqrt(self.m2 / (self.n - 1))
+
+
+class _Quantile:
+    """Quantile with linear interpolation, like percentile_cont"""
+    def __init__(self):
+        self.values = []
+        self.q = None
+
+    def step(self, value, q):
+        self.q = q
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        return float(np.percentile(self.values, 100 * self.q))
+
+
+class SqliteBackend(Backend):
+    """Backend for accessing data stored in an SQLite database file
+
+    Connection parameter `database` is the name of the file (or an URI
+    starting with "file:"). Each thread uses its own connection.
+    """
+
+    display_name = "SQLite"
+
+    #: the number of rows sampled per millisecond of sampling time;
+    #: SQLite has no time-limited sampling
+    SAMPLE_ROWS_PER_MS = 100
+
+    def __init__(self, connection_params):
+        database = connection_params.get("database")
+        if connection_params.get("host") or not database \
+                or not (database.startswith("file:")
+                        or os.path.isfile(database)):
+            raise BackendError(
+                "'{}' is not an SQLite database file".format(database))
+        super().__init__(connection_params)
+        self._local = threading.local()
+        # Fail early if the file is not an SQLite database
+        with self.execute_sql_query("SELECT COUNT(*) FROM sqlite_master"):
+            pass
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _connect(self):
+        database = self.connection_params["database"]
+        try:
+            connection = sqlite3.connect(
+                database, uri=database.startswith("file:"))
+            # LIKE is case sensitive in other databases
+            connection.execute("PRAGMA case_sensitive_like = ON")
+            connection.create_aggregate("STDDEV", 1, _StdDev)
+            connection.create_aggregate("QUANTILE", 2, _Quantile)
+            try:
+                # Math functions are not compiled into all builds
+                connection.execute("SELECT FLOOR(0.5)")
+            except sqlite3.OperationalError:
+                connection.create_function("FLOOR", 1, math.floor)
+        except sqlite3.Error as ex:
+            raise BackendError(str(ex)) from ex
+        return connection
+
+    def list_tables_query(self, schema=None):
+        master = "{}.sqlite_master".format(
+            self.quote_identifier(schema)) if schema else "sqlite_master"
+        return """SELECT {}, name
+                    FROM {}
+                   WHERE type IN ('table', 'view')
+                     AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+                     AND name NOT LIKE '\\_\\_%' ESCAPE '\\'
+                ORDER BY name""".format(
+                    "'{}'".format(schema) if schema else "NULL", master)
+
+    def get_fields(self, table_name):
+        # Declared types are not available from the cursor, but they are
+        # listed for columns of a view
+        view = self.quote_identifier("__orange_{}".format(uuid4().hex))
+        with self.execute_sql_query("CREATE TEMP VIEW {} AS SELECT * FROM {}"
+                                    .format(view, table_name)):
+            pass
+        try:
+            with self.execute_sql_query(
+                    "PRAGMA table_info({})".format(view)) as cur:
+                fields = [(name, type_name)
+                          for _, name, type_name, *_ in cur.fetchall()]
+        finally:
+            with self.execute_sql_query("DROP VIEW {}".format(view)):
+                pass
+
+        # Expressions have no declared type; use the type of the first value
+        for i, (name, type_name) in enumerate(fields):
+            if not type_name:
+                field = self.quote_identifier(name)
+                query = self.create_sql_query(
+                    table_name, ["typeof({})".format(field)],
+                    filters=["{} IS NOT NULL".format(field)], limit=1)
+                with self.execute_sql_query(query) as cur:
+                    row = cur.fetchone()
+                fields[i] = (name, row[0] if row else "")
+        return fields
+
+    def create_sql_query(self, table_name, fields, filters=(),
+                         group_by=None, order_by=None,
+                         offset=None, limit=None,
+                         use_time_sample=None):
+        # SQLite does not support sampling; use_time_sample is ignored
+        sql = ["SELECT", ', '.join(fields),
+               "FROM", table_name]
+        if filters:
+            sql.extend(["WHERE", " AND ".join(filters)])
+        if group_by is not None:
+            sql.extend(["GROUP BY", ", ".join(group_by)])
+        if order_by is not None:
+            sql.extend(["ORDER BY", ",".join(order_by)])
+        if limit is not None or offset is not None:
+            sql.extend(["LIMIT", str(-1 if limit is None else limit)])
+        if offset is not None:
+            sql.extend(["OFFSET", str(offset)])
+        return " ".join(sql)
+
+    def create_quantiles_query(self, table_name, fields, quantiles,
+                               filters=()):
+        fields = ["QUANTILE({}, {!r})".format(field, float(q))
+                  for field in fields for q in quantiles]
+        return self.create_sql_query(table_name, fields, filters)
+
+    def create_sample_query(self, table_name, method, parameter):
+        if method == "system":
+            fraction = float(parameter) / 100
+        else:
+            n_rows = self.count_approx("SELECT * FROM " + table_name)
+            fraction = self.SAMPLE_ROWS_PER_MS * float(parameter) \
+                / max(n_rows, 1)
+        return "SELECT * FROM {} WHERE abs(random() % 1000000) < {}".format(
+            table_name, int(round(min(fraction, 1) * 1000000)))
+
+    def primary_key(self, table_name):
+        try:
+            with self.execute_sql_query(
+                    "PRAGMA table_info({})".format(table_name)) as cur:
+                columns = sorted((pk, name)
+                                 for _, name, _, _, _, pk in cur.fetchall()
+                                 if pk)
+        except BackendError:
+            return None
+        return [name for _, name in columns] or None
+
+    @contextmanager
+    def execute_sql_query(self, query, params=()):
+        connection = self.connection
+        cur = connection.cursor()
+        try:
+            log.debug("Executing: %s", query)
+            t = time()
+            cur.execute(query, params or ())
+            yield cur
+            self._log_query(query, t)
+        except sqlite3.Error as ex:
+            raise BackendError(str(ex)) from ex
+        finally:
+            cur.close()
+            connection.commit()
+
+    def quote_identifier(self, name):
+        return '"%s"' % name
+
+    def unquote_identifier(self, quoted_name):
+        if quoted_name.startswith('"'):
+            return quoted_name[1:len(quoted_name) - 1]
+        else:
+            return quoted_name
+
+    def create_variable(self, field_name, field_metadata,
+                        type_hints, inspect_table=None):
+        if field_name in type_hints:
+            var = type_hints[field_name]
+        else:
+            var = self._guess_variable(field_name, field_metadata,
+                                       inspect_table)
+
+        field_name_q = self.quote_identifier(field_name)
+        if var.is_continuous:
+            if isinstance(var, TimeVariable):
+                var.to_sql = ToSql(
+                    "ROUND((julianday({}) - 2440587.5) * 86400.0, 3)"
+                    .format(field_name_q))
+            else:
+                var.to_sql = ToSql("CAST({} AS REAL)".format(field_name_q))
+        elif any(name in (field_metadata[0] or "").upper()
+                 for name in REAL_TYPES):
+            # Format integral numbers without decimals, like other databases
+            var.to_sql = ToSql(
+                "CAST(CASE WHEN {0} = CAST({0} AS INTEGER) "
+                "THEN CAST({0} AS INTEGER) ELSE {0} END AS TEXT)"
+                .format(field_name_q))
+        else:  # discrete or string
+            var.to_sql = ToSql("CAST({} AS TEXT)".format(field_name_q))
+        return var
+
+    def _guess_variable(self, field_name, field_metadata, inspect_table):
+        # Types are matched like in SQLite's rules for column affinity
+        type_name = (field_metadata[0] or "").upper()
+
+        if "DATE" in type_name or "TIME" in type_name:
+            tv = TimeVariable.make(field_name)
+            tv.have_date |= "DATE" in type_name or "TIMESTAMP" in type_name
+            tv.have_time |= "TIME" in type_name
+            return tv
+
+        if "INT" in type_name or "BOOL" in type_name:
+            if inspect_table:
+                values = self.get_distinct_values(field_name, inspect_table)
+                if values:
+                    return DiscreteVariable.make(field_name, values)
+            return ContinuousVariable.make(field_name)
+
+        if any(name in type_name for name in REAL_TYPES):
+            return ContinuousVariable.make(field_name)
+
+        if any(name in type_name for name in ("CHAR", "CLOB", "TEXT")):
+            if inspect_table:
+                values = self.get_distinct_values(field_name, inspect_table)
+                if values:
+                    return DiscreteVariable.make(field_name, values)
+
+        return StringVariable.make(field_name)
+
+    def count_approx(self, query):
+        # SQLite has no row estimates, but counting is fast
+        with self.execute_sql_query(
+                "SELECT COUNT(*) FROM ({})".format(query)) as cur:
+            return cur.fetchone()[0]
+
+    def __getstate__(self):
+        # Drop connections from state as they cannot be pickled
+        state = dict(self.__dict__)
+        state.pop('_local', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
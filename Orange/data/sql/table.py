@@ -1,12 +1,10 @@
 """
 Support for example tables wrapping data stored on a PostgreSQL server.
 """
-import functools
 import logging
 import threading
 import warnings
 from contextlib import contextmanager
-from itertools import islice
 from time import strftime
 
 import numpy as np
@@ -15,10 +13,17 @@ from Orange.data import (
 from Orange.data.sql import filter as sql_filter
 from Orange.data.sql.backend import Backend
 from Orange.data.sql.backend.base import TableDesc, BackendError
+from Orange.misc.cache import memoize_method
 
 LARGE_TABLE = 100000
 AUTO_DL_LIMIT = 10000
+# Number of rows fetched and decoded at once by SqlTable.download_data
+DOWNLOAD_BATCH_SIZE = 10000
+# Number of neighbouring rows fetched together when a single row is requested
+ROW_BLOCK_SIZE = 100
 DEFAULT_SAMPLE_TIME = 1
+# The number of bins for distributions of continuous variables in large tables
+DISTRIBUTION_BINS = 1000
 sql_log = logging.getLogger('sql_log')
 sql_log.debug("Logging started: {}".format(strftime("%Y-%m-%d %H:%M:%S")))
 
@@ -27,6 +32,8 @@ class SqlTable(Table):
     table_name = None
     domain = None
     row_filters = ()
+    # Quoted names of columns by which rows are ordered, or None
+    key_columns = None
 
     def __new__(cls, *args, **kwargs):
         # We do not (yet) need the magic of the Table.__new__, so we call it
@@ -35,7 +42,7 @@ class SqlTable(Table):
 
     def __init__(
             self, connection_params, table_or_sql, backend=None,
-            type_hints=None, inspect_values=False):
+            type_hints=None, inspect_values=False, key=None):
         """
         Create a new proxy for sql table.
 
@@ -66,6 +73,12 @@ class SqlTable(Table):
         type_hints parameter. Variables from the domain are used for
         the columns with the matching names; for columns without the matching
         name in the domain, types are inferred as described above.
+
+        Rows are ordered by the table's primary key or, if given, by
+        column(s) `key` (a name or a list of names), so positions of rows
+        are the same in all queries; this is needed for selecting rows by
+        indices. Without a key, rows are in the order in which the database
+        returns them, which is usually, but not necessarily, the same.
         """
         if isinstance(connection_params, str):
             connection_params = dict(database=connection_params)
@@ -92,6 +105,15 @@ class SqlTable(Table):
             self.table_name = table
             self.domain = self.get_domain(type_hints, inspect_values)
             self.name = table
+            if isinstance(key, str):
+                key = [key]
+            elif key is None and table_or_sql is not None \
+                    and (isinstance(table_or_sql, TableDesc)
+                         or "select" not in table_or_sql.lower()):
+                key = self.backend.primary_key(table)
+            if key:
+                self.key_columns = [self.backend.quote_identifier(name)
+                                    for name in key]
 
     @property
     def connection_params(self):
@@ -129,7 +151,8 @@ class SqlTable(Table):
         returned as a SqlRowInstance.
 
         A new SqlTable with appropriate filters is constructed and returned
-        otherwise.
+        otherwise. Rows can be selected by slices with positive steps,
+        increasing sequences of indices or boolean masks.
         """
         if isinstance(key, int):
             # one row
@@ -153,32 +176,103 @@ class SqlTable(Table):
                 )
             except TypeError:
                 pass
+            # single row, multiple columns
+            table = self.copy()
+        elif row_idx is Ellipsis or \
+                isinstance(row_idx, slice) and row_idx == slice(None):
+            table = self.copy()
+        else:
+            table = self._select_rows(row_idx)
 
-        elif not (row_idx is Ellipsis or row_idx == slice(None)):
-            # TODO if row_idx specify multiple rows, one of the following must
-            # happen
-            #  - the new table remembers which rows are selected (implement
-            #     table.limit_rows and whatever else is necessary)
-            #  - return an ordinary (non-SQL) Table
-            #  - raise an exception
-            raise NotImplementedError("Row indices must be integers.")
-
-        # multiple rows OR single row but multiple columns:
         # construct a new table
-        table = self.copy()
         table.domain = self.domain.select_columns(col_idx)
-        # table.limit_rows(row_idx)
         return table
 
-    @functools.lru_cache(maxsize=128)
+    def _select_rows(self, rows):
+        """
+        Return a table with the given rows: a slice, a sequence of
+        increasing indices or a boolean mask.
+
+        Ranges of rows are selected with OFFSET and LIMIT, and other
+        sequences with a predicate on row numbers.
+        """
+        if isinstance(rows, slice) and rows.step in (None, 1) \
+                and (rows.start or 0) >= 0 \
+                and (rows.stop is None or rows.stop >= 0):
+            start, stop = rows.start or 0, rows.stop
+        else:
+            if isinstance(rows, slice):
+                rows = np.arange(len(self))[rows]
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+            elif rows.size and not np.issubdtype(rows.dtype, np.integer):
+                raise IndexError("Row indices must be integers.")
+            rows = rows.astype(int)
+            if rows.size and rows.min() < 0:
+                rows = np.where(rows < 0, rows + len(self), rows)
+            if np.any(np.diff(rows) <= 0):
+                raise NotImplementedError(
+                    "Rows of sql tables can only be selected in order.")
+            if not rows.size:
+                start = stop = 0
+            elif rows[-1] - rows[0] + 1 == len(rows):
+                start, stop = int(rows[0]), int(rows[-1]) + 1
+            else:
+                return self._restrict(self._row_numbers_query(rows))
+
+        if stop is not None and stop <= start:
+            query = self._sql_query(["*"], ["1 = 0"])
+        else:
+            query = self._sql_query(
+                ["*"], order_by=self.key_columns, offset=start or None,
+                limit=None if stop is None else stop - start)
+        return self._restrict(query)
+
+    def _row_numbers_query(self, rows):
+        row_number = self.backend.quote_identifier("__row_number")
+        numbered = self._sql_query(
+            ["*", "ROW_NUMBER() OVER (ORDER BY {}) - 1 AS {}".format(
+                ", ".join(self.key_columns or ["(SELECT NULL)"]),
+                row_number)])
+        # Runs of consecutive rows are selected by ranges
+        runs = np.split(rows, np.flatnonzero(np.diff(rows) != 1) + 1)
+        singles = [str(run[0]) for run in runs if len(run) == 1]
+        conditions = ["{} BETWEEN {} AND {}".format(row_number, run[0], run[-1])
+                      for run in runs if len(run) > 1]
+        if singles:
+            conditions.append(
+                "{} IN ({})".format(row_number, ", ".join(singles)))
+        # Columns are listed, so the row number is not a column of the table
+        columns = [self.backend.quote_identifier(name)
+                   for name, *_ in self.backend.get_fields(self.table_name)]
+        return self.backend.create_sql_query(
+            "({}) AS numbered".format(numbered), columns,
+            ["({})".format(" OR ".join(conditions))])
+
+    def _restrict(self, query):
+        table = self.copy()
+        table.table_name = "({}) AS my_table".format(query)
+        table.row_filters = ()
+        return table
+
     def _fetch_row(self, row_index):
-        attributes = self.domain.variables + self.domain.metas
-        rows = [row_index]
-        values = list(self._query(attributes, rows=rows))
-        if not values:
+        # Rows are fetched in blocks, so browsing through neighbouring rows
+        # does not issue a query for each row
+        block, index = divmod(row_index, ROW_BLOCK_SIZE)
+        rows = self._fetch_block(block) if row_index >= 0 else ()
+        if index >= len(rows):
             raise IndexError('Could not retrieve row {} from table {}'.format(
                 row_index, self.name))
-        return SqlRowInstance(self.domain, values[0])
+        return rows[index]
+
+    @memoize_method(maxsize=16)
+    def _fetch_block(self, block):
+        attributes = self.domain.variables + self.domain.metas
+        start = block * ROW_BLOCK_SIZE
+        rows = slice(start, start + ROW_BLOCK_SIZE)
+        return [SqlRowInstance(self.domain, values)
+                for values in self._query(attributes, rows=rows)]
 
     def __iter__(self):
         """ Iterating through the rows executes the query using a cursor and
@@ -189,16 +283,19 @@ class SqlTable(Table):
         for row in self._query(attributes):
             yield SqlRowInstance(self.domain, row)
 
+    @staticmethod
+    def _sql_fields(attributes):
+        fields = []
+        for attr in attributes:
+            field_str = '(%s) AS "%s"' % (attr.to_sql(), attr.name)
+            fields.append(field_str)
+        if not fields:
+            raise ValueError("No fields selected.")
+        return fields
+
     def _query(self, attributes=None, filters=(), rows=None):
         if attributes is not None:
-            fields = []
-            for attr in attributes:
-                assert hasattr(attr, 'to_sql'), \
-                    "Cannot use ordinary attributes with sql backend"
-                field_str = '(%s) AS "%s"' % (attr.to_sql(), attr.name)
-                fields.append(field_str)
-            if not fields:
-                raise ValueError("No fields selected.")
+            fields = self._sql_fields(attributes)
         else:
             fields = ["*"]
 
@@ -216,7 +313,8 @@ class SqlTable(Table):
                 limit = stop - offset + 1
 
         # TODO: this returns all rows between min(rows) and max(rows): fix!
-        query = self._sql_query(fields, filters, offset=offset, limit=limit)
+        query = self._sql_query(fields, filters, order_by=self.key_columns,
+                                offset=offset, limit=limit)
         with self.backend.execute_sql_query(query) as cur:
             while True:
                 row = cur.fetchone()
@@ -232,6 +330,7 @@ class SqlTable(Table):
         table.row_filters = self.row_filters
         table.table_name = self.table_name
         table.name = self.name
+        table.key_columns = self.key_columns
         return table
 
     def __bool__(self):
@@ -253,8 +352,7 @@ class SqlTable(Table):
 
     def _count_rows(self):
         query = self._sql_query(["COUNT(*)"])
-        with self.backend.execute_sql_query(query) as cur:
-            self._cached__len__ = cur.fetchone()[0]
+        self._cached__len__ = self.backend.fetch_all(query)[0][0]
         return self._cached__len__
 
     def approx_len(self, get_exact=False):
@@ -285,16 +383,37 @@ class SqlTable(Table):
         """Download SQL data and store it in memory as numpy matrices."""
         if limit and not partial and self.approx_len() > limit:
             raise ValueError("Too many rows to download the data into memory.")
-        X = [np.empty((0, len(self.domain.attributes)))]
-        Y = [np.empty((0, len(self.domain.class_vars)))]
-        metas = [np.empty((0, len(self.domain.metas)))]
-        for row in islice(self, limit):
-            X.append(row._x)
-            Y.append(row._y)
-            metas.append(row._metas)
-        self._X = np.vstack(X).astype(np.float64)
-        self._Y = np.vstack(Y).astype(np.float64)
-        self._metas = np.vstack(metas).astype(object)
+        domain = self.domain
+        n_attrs, n_vars = len(domain.attributes), len(domain.variables)
+        # Arrays are allocated once and filled by batches; they are enlarged
+        # only if the table has more rows than counted (or estimated)
+        n_rows = min(limit, self.approx_len()) if limit else len(self)
+        arrays = [np.empty((n_rows, n_attrs)),
+                  np.empty((n_rows, len(domain.class_vars))),
+                  np.empty((n_rows, len(domain.metas)), dtype=object)]
+        query = self._sql_query(
+            self._sql_fields(domain.variables + domain.metas),
+            order_by=self.key_columns, limit=limit)
+        filled = 0
+        for rows in self.backend.fetch_batches(query, DOWNLOAD_BATCH_SIZE):
+            end = filled + len(rows)
+            if end > len(arrays[0]):
+                arrays = [_enlarged(array, end) for array in arrays]
+            X, Y, metas = arrays
+            columns = list(zip(*rows))
+            for i, var in enumerate(domain.variables):
+                values = _column_values(var, columns[i])
+                if i < n_attrs:
+                    X[filled:end, i] = values
+                else:
+                    Y[filled:end, i - n_attrs] = values
+            for i, column in enumerate(columns[n_vars:]):
+                metas[filled:end, i] = column
+            filled = end
+        for array in arrays:
+            if len(array) != filled:
+                array.resize((filled, array.shape[1]), refcheck=False)
+        self._X, self._Y, self._metas = arrays
         self._W = np.empty((self._X.shape[0], 0))
         self._init_ids(self)
         if not partial or limit and self._X.shape[0] < limit:
@@ -366,8 +485,7 @@ class SqlTable(Table):
             stats = self.CONTINUOUS_STATS if continuous else self.DISCRETE_STATS
             sql_fields.append(stats % dict(field_name=field_name))
         query = self._sql_query(sql_fields)
-        with self.backend.execute_sql_query(query) as cur:
-            results = cur.fetchone()
+        results = self.backend.fetch_all(query)[0]
         stats = []
         i = 0
         for ci, (field_name, continuous) in enumerate(columns):
@@ -379,10 +497,20 @@ class SqlTable(Table):
                 i += 2
         return stats
 
-    def _compute_distributions(self, columns=None):
-        if self.approx_len() > LARGE_TABLE:
-            self = self.sample_time(DEFAULT_SAMPLE_TIME)
+    def _iter_chunks(self, columns=None, chunk_size=None):
+        if columns is not None:
+            columns = [self.domain[col] for col in columns]
+        else:
+            columns = self.domain.variables
+        query = self._sql_query(self._sql_fields(columns))
+        for rows in self.backend.fetch_batches(
+                query, chunk_size or DOWNLOAD_BATCH_SIZE):
+            values = list(zip(*rows))
+            yield [_column_values(var, col) if var.is_primitive()
+                   else np.array(col, dtype=object)
+                   for var, col in zip(columns, values)], None
 
+    def _compute_distributions(self, columns=None):
         if columns is not None:
             columns = [self.domain[col] for col in columns]
         else:
@@ -390,33 +518,31 @@ class SqlTable(Table):
         return self._get_distributions(columns)
 
     def _get_distributions(self, columns):
+        fields, centers = self._binned_fields(columns)
         dists = []
-        for col in columns:
-            field_name = col.to_sql()
-            fields = field_name, "COUNT(%s)" % field_name
-            query = self._sql_query(fields,
-                                    filters=['%s IS NOT NULL' % field_name],
-                                    group_by=[field_name],
-                                    order_by=[field_name])
-            with self.backend.execute_sql_query(query) as cur:
-                dist = np.array(cur.fetchall())
-            if col.is_continuous:
-                dists.append((dist.T, []))
+        for var, counts, var_centers in zip(
+                columns, self._grouped_counts(fields), centers):
+            values, counts = counts.T
+            known = ~np.isnan(values)
+            unknowns = counts[~known].sum()
+            values, counts = values[known], counts[known]
+            if var_centers is not None:
+                values = var_centers[values.astype(int)]
+            if var.is_continuous:
+                order = np.argsort(values)
+                dist = np.vstack((values[order], counts[order]))
             else:
-                dists.append((dist[:, 1].T, []))
+                dist = _bincount(values, counts, len(var.values))
+            dists.append((dist, unknowns))
         return dists
 
     def _compute_contingency(self, col_vars=None, row_var=None):
-        if self.approx_len() > LARGE_TABLE:
-            self = self.sample_time(DEFAULT_SAMPLE_TIME)
-
         if col_vars is None:
             col_vars = range(len(self.domain.variables))
-        if len(col_vars) != 1:
-            raise NotImplementedError("Contingency for multiple columns "
-                                      "has not yet been implemented.")
         if row_var is None:
-            raise NotImplementedError("Defaults have not been implemented yet")
+            row_var = self.domain.class_var
+            if row_var is None:
+                raise ValueError("No row variable")
 
         row = self.domain[row_var]
         if not row.is_discrete:
@@ -429,51 +555,187 @@ class SqlTable(Table):
             raise ValueError("contingency can be computed only for discrete "
                              "and continuous values")
 
-        row_field = row.to_sql()
-
-        all_contingencies = [None] * len(columns)
-        for i, column in enumerate(columns):
-            column_field = column.to_sql()
-            fields = [row_field, column_field, "COUNT(%s)" % column_field]
-            group_by = [row_field, column_field]
-            order_by = [column_field]
-            filters = ['%s IS NOT NULL' % f
-                       for f in (row_field, column_field)]
-            query = self._sql_query(fields, filters=filters,
-                                    group_by=group_by, order_by=order_by)
-            with self.backend.execute_sql_query(query) as cur:
-                data = list(cur.fetchall())
-                if column.is_continuous:
-                    all_contingencies[i] = \
-                        (self._continuous_contingencies(data, row), [], [], 0)
-                else:
-                    all_contingencies[i] =\
-                        (self._discrete_contingencies(data, row, column), [],
-                         [], 0)
-        return all_contingencies
-
-    def _continuous_contingencies(self, data, row):
-        values = np.zeros(len(data))
-        counts = np.zeros((len(row.values), len(data)))
-        last = None
-        i = -1
-        for row_value, column_value, count in data:
-            if column_value == last:
-                counts[row.to_val(row_value), i] += count
+        n_rows = len(row.values)
+        fields, centers = self._binned_fields(columns)
+        all_counts = self._grouped_counts(fields, _sql_numeric(row))
+        contingencies = []
+        for column, counts, column_centers in zip(
+                columns, all_counts, centers):
+            row_values, values, counts = counts.T
+            row_known, known = ~np.isnan(row_values), ~np.isnan(values)
+            if column_centers is not None:
+                values[known] = column_centers[values[known].astype(int)]
+            unknowns = counts[~row_known & ~known].sum()
+            col_unknowns = _bincount(row_values[row_known & ~known],
+                                     counts[row_known & ~known], n_rows)
+            row_values, values, counts, row_known = \
+                row_values[known], values[known], counts[known], \
+                row_known[known]
+            if column.is_continuous:
+                values, indices = np.unique(values, return_inverse=True)
+                n_values = len(values)
+            else:
+                indices = values.astype(int)
+                n_values = len(column.values)
+            row_unknowns = _bincount(indices[~row_known],
+                                     counts[~row_known], n_values)
+            cont = np.zeros((n_rows, n_values))
+            np.add.at(cont, (row_values[row_known].astype(int),
+                             indices[row_known]),
+                      counts[row_known])
+            if column.is_continuous:
+                cont = (values, cont)
+            contingencies.append((cont, col_unknowns, row_unknowns, unknowns))
+        return contingencies
+
+    def _binned_fields(self, columns):
+        """
+        Return numeric SQL expressions for counting values of columns.
+
+        Continuous columns of large tables have too many distinct values, so
+        their values are replaced by bins (see :obj:`histograms`). Counts of
+        such columns are thus exact, but values are rounded to the centers
+        of `DISTRIBUTION_BINS` bins.
+
+        Returns:
+            tuple: a list of expressions and a list with an array of bin
+                centers (or None, for columns that are not binned) for each
+                column
+        """
+        fields = [_sql_numeric(var) for var in columns]
+        centers = [None] * len(columns)
+        binned = [i for i, var in enumerate(columns) if var.is_continuous]
+        if not binned or self.approx_len() <= LARGE_TABLE:
+            return fields, centers
+        bin_fields, all_edges = self._bin_fields(
+            [columns[i] for i in binned], DISTRIBUTION_BINS)
+        for i, field, edges in zip(binned, bin_fields, all_edges):
+            fields[i] = field
+            centers[i] = (edges[:-1] + edges[1:]) / 2
+        return fields, centers
+
+    def _bin_fields(self, columns, bins):
+        """
+        Return SQL expressions with bin indices of continuous columns and
+        the bin edges, which are computed from column ranges in one query.
+        """
+        fields = [self.domain[col].to_sql() for col in columns]
+        if not fields:
+            return [], []
+        query = self._sql_query(
+            ["MIN({0}), MAX({0})".format(field) for field in fields])
+        ranges = np.array(self.backend.fetch_all(query)[0],
+                          dtype=float).reshape(-1, 2)
+
+        bin_fields, all_edges = [], []
+        for field, (low, high) in zip(fields, ranges):
+            if np.isnan(low):  # no known values
+                low = high = 0
+            if high <= low:
+                high = low + 1
+            bin_fields.append(self.backend.bin_expression(
+                field, low, high, bins))
+            all_edges.append(np.linspace(low, high, bins + 1))
+        return bin_fields, all_edges
+
+    def _grouped_counts(self, fields, row_field=None):
+        """
+        Count the rows for each value of each field (and for each value of
+        `row_field`, if given) in a single query.
+
+        Args:
+            fields (list of str): numeric SQL expressions
+            row_field (str): a numeric SQL expression or None
+
+        Returns:
+            list of np.ndarray: an array for each field, with rows
+                ([row value,] value, count); unknown values are nan
+        """
+        group_fields = [] if row_field is None else [row_field]
+        queries = []
+        for i, field in enumerate(fields):
+            queries.append(self._sql_query(
+                ["{} AS col".format(i)]
+                + ["CAST({} AS double precision)".format(f)
+                   for f in group_fields + [field]]
+                + ["COUNT(*)"],
+                group_by=group_fields + [field]))
+        if not queries:
+            return []
+        results = np.array(
+            self.backend.fetch_all(" UNION ALL ".join(queries)), dtype=float)
+        results = results.reshape(-1, len(group_fields) + 3)
+        return [results[results[:, 0] == i, 1:] for i in range(len(fields))]
+
+    def quantiles(self, columns, quantiles):
+        """
+        Compute quantiles of continuous columns in the database.
+
+        Args:
+            columns (list): continuous variables (or their names or indices)
+            quantiles (list of float): quantiles between 0 and 1
+
+        Returns:
+            np.ndarray: quantiles, one row for each column
+        """
+        fields = [self.domain[col].to_sql() for col in columns]
+        row_filters = [f.to_sql() for f in self.row_filters]
+        query = self.backend.create_quantiles_query(
+            self.table_name, fields, quantiles, row_filters)
+        values = np.full((len(fields), len(quantiles)), np.nan)
+        rows = self.backend.fetch_all(query)
+        # Window functions (as in SQL Server) give no rows for no data
+        if not rows:
+            return values
+        row = rows[0]
+        # Items are either sequences of quantiles for each field or single
+        # quantiles; a NULL stands for a field without non-NULL values
+        per_item = len(quantiles) if len(row) == len(fields) else 1
+        values = values.reshape(-1, per_item)
+        for i, value in enumerate(row):
+            if value is not None:
+                values[i] = value
+        return values.reshape(len(fields), len(quantiles))
+
+    def histograms(self, columns, bins=10, row_var=None):
+        """
+        Compute histograms of continuous columns in the database.
+
+        The range of each column is split into `bins` bins of equal width.
+        If `row_var` is given, the histograms are computed for each of its
+        values. Ranges and counts are computed with two queries in total.
+
+        Args:
+            columns (list): continuous variables (or their names or indices)
+            bins (int): the number of bins
+            row_var: a discrete variable (or its name or index) or None
+
+        Returns:
+            list of tuple: a tuple (edges, counts) for each column, where
+                counts has shape `(bins, )` or (when `row_var` is given)
+                `(len(row_var.values), bins)`; unknown values are not counted
+        """
+        bin_fields, all_edges = self._bin_fields(columns, bins)
+        if not bin_fields:
+            return []
+        if row_var is None:
+            all_counts = self._grouped_counts(bin_fields)
+        else:
+            row = self.domain[row_var]
+            all_counts = self._grouped_counts(bin_fields, _sql_numeric(row))
+
+        histograms = []
+        for edges, counts in zip(all_edges, all_counts):
+            counts = counts[~np.isnan(counts).any(axis=1)]
+            if row_var is None:
+                hist = _bincount(counts[:, 0], counts[:, 1], bins)
             else:
-                i += 1
-                last = column_value
-                values[i] = column_value
-                counts[row.to_val(row_value), i] += count
-        return (values, counts)
-
-    def _discrete_contingencies(self, data, row, column):
-        conts = np.zeros((len(row.values), len(column.values)))
-        for row_value, col_value, count in data:
-            row_index = row.to_val(row_value)
-            col_index = column.to_val(col_value)
-            conts[row_index, col_index] = count
-        return conts
+                hist = np.zeros((len(row.values), bins))
+                np.add.at(hist, (counts[:, 0].astype(int),
+                                 counts[:, 1].astype(int)),
+                          counts[:, 2])
+            histograms.append((edges, hist))
+        return histograms
 
     def X_density(self):
         return self.DENSE
@@ -579,10 +841,10 @@ class SqlTable(Table):
                      "ELSE 0 END), " \
                      "SUM(CASE TRUE WHEN %(field_name)s IS NULL THEN 0 " \
                      "ELSE 1 END)"
-    CONTINUOUS_STATS = "MIN(%(field_name)s)::double precision, " \
-                       "MAX(%(field_name)s)::double precision, " \
-                       "AVG(%(field_name)s)::double precision, " \
-                       "STDDEV(%(field_name)s)::double precision, " \
+    CONTINUOUS_STATS = "CAST(MIN(%(field_name)s) AS double precision), " \
+                       "CAST(MAX(%(field_name)s) AS double precision), " \
+                       "CAST(AVG(%(field_name)s) AS double precision), " \
+                       "CAST(STDDEV(%(field_name)s) AS double precision), " \
                        + DISCRETE_STATS
 
     def sample_percentage(self, percentage, no_cache=False):
@@ -596,9 +858,6 @@ class SqlTable(Table):
                             no_cache=no_cache)
 
     def _sample(self, method, parameter, no_cache=False):
-        # the module is optional, but this function is not called if it's not installed
-        # pylint: disable=import-error
-        import psycopg2
         if "," in self.table_name:
             raise NotImplementedError("Sampling of complex queries is not supported")
 
@@ -632,10 +891,12 @@ class SqlTable(Table):
             create = True
 
         if create:
+            # Results of queries on the former sample are no longer valid
+            self.backend.clear_cache()
             with self.backend.execute_sql_query(
                     " ".join(["CREATE TABLE", sample_table_q, "AS",
-                              "SELECT * FROM", self.table_name,
-                              "TABLESAMPLE", method, "(", parameter, ")"])):
+                              self.backend.create_sample_query(
+                                  self.table_name, method, parameter)])):
                 pass
 
         sampled_table = self.copy()
@@ -655,6 +916,38 @@ class SqlTable(Table):
         return np.nan
 
 
+def _sql_numeric(var):
+    # Orange.preprocess imports this module, hence the local import
+    from Orange.preprocess.transformation import sql_numeric as to_numeric
+    return to_numeric(var)
+
+
+def _bincount(indices, weights, n_values):
+    return np.bincount(indices.astype(int), weights,
+                       minlength=n_values)[:n_values].astype(float)
+
+
+def _enlarged(array, n_rows):
+    """Return a copy of `array` with at least `n_rows` rows."""
+    larger = np.empty((max(n_rows, 2 * len(array)),) + array.shape[1:],
+                      dtype=array.dtype)
+    larger[:len(array)] = array
+    return larger
+
+
+def _column_values(var, values):
+    """Convert a column of values fetched from the database to floats."""
+    if var.is_continuous:
+        try:
+            # Numbers, Decimals and None (which becomes nan)
+            return np.array(values, dtype=float)
+        except (TypeError, ValueError):
+            pass
+    # Discrete columns have few distinct values, so each is converted once
+    mapping = {value: var.to_val(value) for value in set(values)}
+    return np.fromiter(map(mapping.__getitem__, values), float, len(values))
+
+
 class SqlRowInstance(Instance):
     """
     Extends :obj:`Orange.data.Instance` to correctly handle values of meta
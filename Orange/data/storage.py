@@ -41,6 +41,43 @@ class Storage:
         """
         raise NotImplementedError
 
+    def _iter_chunks(self, columns=None, chunk_size=None):
+        """Iterate over chunks of rows.
+
+        :param columns: columns to include in chunks. None = all variables
+        :param chunk_size: the maximal number of rows in a chunk
+        :return: yields a list with an array of values of each column
+                 (float for primitive variables, object for others)
+                 and an array of weights (or None) for each chunk
+        """
+        raise NotImplementedError
+
+    def _compute_accumulators(self, columns=None, chunk_size=None,
+                              sketch_size=2000, random_state=0):
+        """Compute statistics of columns chunk by chunk, with bounded memory.
+
+        :param columns: columns to compute statistics for. None = all
+                        variables
+        :param chunk_size: the maximal number of rows in a chunk
+        :param sketch_size: the size of quantile sketches for continuous
+                            variables; None = no sketches
+        :param random_state: the seed for quantile sketches
+        :return: a list of
+                 :obj:`Orange.statistics.accumulators.ColumnStats`
+        """
+        # pylint: disable=import-outside-toplevel
+        from Orange.statistics.accumulators import ColumnStats
+
+        if columns is None:
+            columns = self.domain.variables
+        accumulators = [ColumnStats(self.domain[col], sketch_size,
+                                    random_state)
+                        for col in columns]
+        for chunk, weights in self._iter_chunks(columns, chunk_size):
+            for accumulator, values in zip(accumulators, chunk):
+                accumulator.update(values, weights)
+        return accumulators
+
     def _compute_distributions(self, columns=None):
         """Compute distribution of values for the given columns.
 
@@ -1,3 +1,5 @@
+import hashlib
+import inspect
 import operator
 import os
 import threading
@@ -5,32 +7,35 @@ import warnings
 import weakref
 import zlib
 from collections.abc import Iterable, Sequence, Sized
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import reduce, partial
 from itertools import chain
 from numbers import Real, Integral
 from threading import Lock
 
 import bottleneck as bn
 import numpy as np
+from Orange.misc import environ
 from Orange.misc.collections import frozendict
 from Orange.util import OrangeDeprecationWarning
 from scipy import sparse as sp
-from scipy.sparse import issparse, csc_matrix
+from scipy.sparse import issparse
 
 import Orange.data  # import for io.py
 from Orange.data import (
     _contingency, _valuecount,
     Domain, Variable, Storage, StringVariable, Unknown, Value, Instance,
-    ContinuousVariable, DiscreteVariable, MISSING_VALUES,
-    DomainConversion)
-from Orange.data.util import SharedComputeValue, \
+    ContinuousVariable, DiscreteVariable, MISSING_VALUES)
+from Orange.data.util import \
     assure_array_dense, assure_array_sparse, \
     assure_column_dense, assure_column_sparse, get_unique_names_duplicates
 from Orange.statistics.util import bincount, countnans, contingency, \
     stats as fast_stats, sparse_has_implicit_zeros, sparse_count_implicit_zeros, \
     sparse_implicit_zero_weights
 
-__all__ = ["dataset_dirs", "get_sample_datasets_dir", "RowInstance", "Table"]
+__all__ = ["dataset_dirs", "get_sample_datasets_dir", "RowInstance", "Table",
+           "parallel_compute_values", "lazy_transforms"]
 
 
 def get_sample_datasets_dir():
@@ -49,10 +54,216 @@ class _ThreadLocal(threading.local):
         # here instead of as a class variable of a Table so that caching also works
         # with descendants of Table.
         self.conversion_cache = None
+        # Number of threads for computing values in Table.from_table, as set
+        # by parallel_compute_values; None stands for the configured default
+        self.compute_value_workers = None
+        # Weak references to tables created by Table.transform within
+        # lazy_transforms; None when transformations are not deferred
+        self.lazy_tables = None
 
 
 _thread_local = _ThreadLocal()
 
+_compute_value_executors = {}
+_compute_value_executors_lock = Lock()
+
+
+@contextmanager
+def parallel_compute_values(workers=None):
+    """
+    Context manager that makes `Table.from_table` (and thus
+    `Table.transform`) in the current thread compute values of derived
+    variables in parallel, using `workers` threads. The same threads are
+    used by `Table.content_hash` for hashing large arrays.
+
+    Most compute values are implemented with numpy, which releases the GIL.
+    Outside of this context, the number of threads is given by
+    :obj:`Orange.misc.environ.compute_value_workers`.
+
+    Args:
+        workers (int): the number of threads; defaults to the number of CPUs
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    old_workers = _thread_local.compute_value_workers
+    _thread_local.compute_value_workers = workers
+    try:
+        yield
+    finally:
+        _thread_local.compute_value_workers = old_workers
+
+
+def _compute_value_workers():
+    workers = _thread_local.compute_value_workers
+    if workers is None:
+        workers = environ.compute_value_workers()
+    return workers
+
+
+def _run_compute_value_tasks(tasks):
+    workers = _compute_value_workers() if len(tasks) > 1 else 1
+    if workers <= 1:
+        for task in tasks:
+            task()
+        return
+
+    def run_in_worker(task):
+        # Conversions nested in compute values are computed sequentially,
+        # so that tasks in the pool never wait for other tasks
+        _thread_local.compute_value_workers = 1
+        task()
+
+    with _compute_value_executors_lock:
+        executor = _compute_value_executors.get(workers)
+        if executor is None:
+            executor = _compute_value_executors[workers] = \
+                ThreadPoolExecutor(workers,
+                                   thread_name_prefix="compute_value")
+    futures = [executor.submit(run_in_worker, task) for task in tasks]
+    wait(futures)
+    for future in futures:
+        future.result()
+
+
+@contextmanager
+def lazy_transforms():
+    """
+    Context manager that defers the computation of tables returned by
+    `Table.transform` in the current thread.
+
+    A deferred table stores its domain and the source table, and computes
+    its data on the first access to `X`, `Y` or `metas`.
+    Transformations of deferred tables are fused: the new table's columns
+    are computed from the original source, and intermediate tables whose
+    data is never accessed are never computed.
+
+    Tables that are still deferred at the exit of the outermost context are
+    computed then, so the source tables may again be modified in place.
+    This also holds when the context exits with an exception; tables whose
+    computation then fails are given a copy of their source.
+    """
+    outermost = _thread_local.lazy_tables is None
+    if outermost:
+        _thread_local.lazy_tables = []
+    try:
+        yield
+    except BaseException:
+        if outermost:
+            tables, _thread_local.lazy_tables = _thread_local.lazy_tables, None
+            _materialize_lazy(tables, detach_failed=True)
+        raise
+    if outermost:
+        tables, _thread_local.lazy_tables = _thread_local.lazy_tables, None
+        _materialize_lazy(tables)
+
+
+def _materialize_lazy(refs, detach_failed=False):
+    # pylint: disable=protected-access
+    copies = {}
+    # Later tables are computed first, so their sources are released
+    # before they are (unnecessarily) computed
+    for ref in reversed(refs):
+        table = ref()
+        if table is not None and "_lazy_source" in table.__dict__:
+            if not detach_failed:
+                table._materialize()
+                continue
+            try:
+                table._materialize()
+            except Exception:  # pylint: disable=broad-except
+                # The exception that exited the context is more relevant;
+                # the table is detached from the source, which may change
+                while "_lazy_source" in table._lazy_source.__dict__:
+                    table = table._lazy_source
+                source = table._lazy_source
+                if id(source) not in copies:
+                    copies[id(source)] = source, source.copy()
+                table._lazy_source = copies[id(source)][1]
+        table = None
+
+
+# Number of bytes of array data that are hashed by a single task
+_HASH_CHUNK_SIZE = 1 << 22
+
+# Number of rows in a chunk for which statistics are computed by a single task
+_STATS_CHUNK_SIZE = 100000
+
+
+def _hash_pieces(array):
+    """
+    Yield the pieces of data that are hashed for the array: headers with the
+    array's type and shape (as bytes), and contiguous 1d chunks of data.
+    """
+    if sp.issparse(array):
+        array = array.tocsr(copy=True)
+        # Canonical form: sorted indices, no duplicates or explicit zeros
+        array.sum_duplicates()
+        array.eliminate_zeros()
+        yield repr(("sparse", array.shape)).encode()
+        yield from _hash_pieces(array.data)
+        yield from _hash_pieces(array.indices.astype(np.int64))
+        yield from _hash_pieces(array.indptr.astype(np.int64))
+        return
+    array = np.asarray(array)
+    yield repr((array.dtype.str, array.shape)).encode()
+    flat = np.ascontiguousarray(array).reshape(-1)
+    step = max(_HASH_CHUNK_SIZE // flat.itemsize, 1)
+    for start in range(0, len(flat), step):
+        yield flat[start:start + step]
+
+
+def _piece_digest(piece):
+    if isinstance(piece, np.ndarray) and piece.dtype == object:
+        # Hash representations, which (unlike pickles and memory contents)
+        # do not depend on the process
+        piece = "\n".join(map(repr, piece)).encode("utf-8", "backslashreplace")
+    return hashlib.sha256(piece).digest()
+
+
+def _content_hash(header, arrays):
+    """
+    Return a hash (as a hex string) of the header and arrays.
+
+    Arrays are split into chunks whose digests are computed in parallel
+    (see `parallel_compute_values`); the hash is computed from the digests.
+    """
+    pieces = [piece for array in arrays for piece in _hash_pieces(array)]
+    digests = [None] * len(pieces)
+
+    def compute(i):
+        digests[i] = _piece_digest(pieces[i])
+
+    tasks = [partial(compute, i) for i in range(len(pieces))]
+    if sum(piece.nbytes for piece in pieces
+           if isinstance(piece, np.ndarray)) < _HASH_CHUNK_SIZE:
+        for task in tasks:
+            task()
+    else:
+        _run_compute_value_tasks(tasks)
+    content = hashlib.sha256(header.encode("utf-8"))
+    for digest in digests:
+        content.update(digest)
+    return content.hexdigest()
+
+
+class _DeferredArray:
+    """
+    Default value of a table's data array. For deferred tables (see
+    `lazy_transforms`), the first access computes the data.
+    """
+    def __init__(self, default):
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None or "_lazy_source" not in instance.__dict__:
+            return self.default
+        instance._materialize()  # pylint: disable=protected-access
+        return instance.__dict__[self.name]
+
 
 class DomainTransformationError(Exception):
     pass
@@ -96,6 +307,7 @@ class RowInstance(Instance):
         if not self.table.has_weights():
             self.table.set_weights()
         self.table.W[self.row_index] = weight
+        self.table._invalidate_content_hash()
 
     def set_class(self, value):
         self._check_single_class()
@@ -104,6 +316,7 @@ class RowInstance(Instance):
         self._y[0] = value
         if self.sparse_y:
             self.table._Y[self.row_index, 0] = value
+        self.table._invalidate_content_hash()
 
     def __setitem__(self, key, value):
         if not isinstance(key, Integral):
@@ -127,6 +340,7 @@ class RowInstance(Instance):
             self._metas[-1 - key] = value
             if self.sparse_metas:
                 self.table.metas[self.row_index, -1 - key] = value
+        self.table._invalidate_content_hash()
 
     def _str(self, limit):
         def sp_values(matrix, variables):
@@ -184,8 +398,9 @@ class Table(Sequence, Storage):
     name = "untitled"
 
     domain = Domain([])
-    X = _Y = metas = W = np.zeros((0, 0))
-    X.setflags(write=False)
+    W = np.zeros((0, 0))
+    W.setflags(write=False)
+    X, _Y, metas = _DeferredArray(W), _DeferredArray(W), _DeferredArray(W)
     ids = np.zeros(0)
     ids.setflags(write=False)
     attributes = frozendict()
@@ -323,109 +538,151 @@ class Table(Sequence, Storage):
                     return False
             return True
 
+        def get_shared(compute_shared, shared_cache):
+            shared, weakrefs = shared_cache.get(
+                (id(compute_shared), id(source)), (None, None))
+            if shared is None or not valid_refs(weakrefs):
+                shared, _ = shared_cache[(id(compute_shared), id(source))] = \
+                    compute_shared(source), \
+                    (weakref.ref(compute_shared), weakref.ref(source))
+            return shared
+
+        lazy_source = source.__dict__.get("_lazy_source")
+
+        def source_columns(part, row_indices, cols):
+            if lazy_source is None:
+                return _subarray(getattr(source, part), row_indices, cols)
+            # Columns of a deferred table are computed from its source instead
+            # of computing the entire table
+            variables = {"X": source.domain.attributes,
+                         "_Y": source.domain.class_vars,
+                         "metas": source.domain.metas}[part]
+            variables = [variables[i] for i in cols]
+            if part == "metas":
+                arr = cls.from_table(Domain([], metas=variables),
+                                     lazy_source).metas
+            else:
+                arr = cls.from_table(Domain(variables), lazy_source).X
+            return arr if row_indices is ... else arr[row_indices]
+
+        def get_dense_columns(row_indices, plan, n_rows, dtype, variables):
+            # F-order enables faster writing to the array while accessing and
+            # matrix operations work with same speed (e.g. dot)
+            a = np.zeros((n_rows, len(variables)), order="F", dtype=dtype)
+            for (dst, src), part in ((plan.from_X, "X"),
+                                     (plan.from_Y, "_Y"),
+                                     (plan.from_metas, "metas")):
+                if len(dst):
+                    a[:, dst] = assure_array_dense(
+                        source_columns(part, row_indices, src))
+            for i in plan.unknown:
+                a[:, i] = variables[i].Unknown
+
+            # tasks may run in other threads, which have their own caches
+            shared_cache = _thread_local.conversion_cache
+
+            def set_column(i, col_array):
+                if row_indices is not ...:
+                    col_array = col_array[row_indices]
+                a[:, i] = assure_column_dense(col_array)
+
+            def compute_shared_columns(compute_shared, cols):
+                shared = get_shared(compute_shared, shared_cache)
+                for i, col in cols:
+                    set_column(i, col(source, shared_data=shared))
+
+            def compute_column(i, col):
+                set_column(i, col(source))
+
+            _run_compute_value_tasks(
+                [partial(compute_shared_columns, *group)
+                 for group in plan.shared]
+                + [partial(compute_column, *column)
+                   for column in plan.computed])
+            return a
+
+        def get_sparse_columns(row_indices, plan, n_rows, dtype, variables):
+            # Copied columns are sliced from each source array at once; blocks
+            # are stacked and then reordered to match the destination domain
+            blocks, columns = [], []
+            for (dst, src), part in ((plan.from_X, "X"),
+                                     (plan.from_Y, "_Y"),
+                                     (plan.from_metas, "metas")):
+                if len(dst):
+                    blocks.append(assure_array_sparse(
+                        source_columns(part, row_indices, src)))
+                    columns.append(dst)
+            if plan.unknown:
+                blocks.append(assure_array_sparse(
+                    np.full((n_rows, len(plan.unknown)),
+                            [variables[i].Unknown for i in plan.unknown])))
+                columns.append(plan.unknown)
+
+            shared_cache = _thread_local.conversion_cache
+            computed = {}
+
+            def set_column(i, col_array):
+                if row_indices is not ...:
+                    col_array = col_array[row_indices]
+                computed[i] = assure_column_sparse(col_array)
+
+            def compute_shared_columns(compute_shared, cols):
+                shared = get_shared(compute_shared, shared_cache)
+                for i, col in cols:
+                    set_column(i, col(source, shared_data=shared))
+
+            def compute_column(i, col):
+                set_column(i, col(source))
+
+            _run_compute_value_tasks(
+                [partial(compute_shared_columns, *group)
+                 for group in plan.shared]
+                + [partial(compute_column, *column)
+                   for column in plan.computed])
+            if computed:
+                blocks += computed.values()
+                columns.append(list(computed))
+
+            a = sp.hstack(blocks, format="csc", dtype=dtype)
+            order = np.argsort(np.concatenate(columns))
+            if np.any(order != np.arange(len(order))):
+                a = a[:, order]
+            return a.tocsr()
+
         def get_columns(row_indices, src_cols, n_rows, dtype=np.float64,
-                        is_sparse=False, variables=[]):
+                        is_sparse=False, variables=[], plan=None):
             if not len(src_cols):
+                # deferred tables are not computed just to get the dtype
+                x_dtype = np.float64 if lazy_source is not None \
+                    else source.X.dtype
                 if is_sparse:
-                    return sp.csr_matrix((n_rows, 0), dtype=source.X.dtype)
+                    return sp.csr_matrix((n_rows, 0), dtype=x_dtype)
                 else:
-                    return np.zeros((n_rows, 0), dtype=source.X.dtype)
+                    return np.zeros((n_rows, 0), dtype=x_dtype)
 
             # match density for subarrays
             match_density = assure_array_sparse if is_sparse else assure_array_dense
             n_src_attrs = len(source.domain.attributes)
             if all(isinstance(x, Integral) and 0 <= x < n_src_attrs
                    for x in src_cols):
-                return match_density(_subarray(source.X, row_indices, src_cols))
+                return match_density(
+                    source_columns("X", row_indices, src_cols))
             if all(isinstance(x, Integral) and x < 0 for x in src_cols):
-                arr = match_density(_subarray(source.metas, row_indices,
-                                              [-1 - x for x in src_cols]))
+                arr = match_density(source_columns(
+                    "metas", row_indices, [-1 - x for x in src_cols]))
                 if arr.dtype != dtype:
                     return arr.astype(dtype)
                 return arr
             if all(isinstance(x, Integral) and x >= n_src_attrs
                    for x in src_cols):
-                return match_density(_subarray(
-                    source._Y, row_indices,
-                    [x - n_src_attrs for x in src_cols]))
-
-            # initialize arrays & set `match_density` for columns
-            # F-order enables faster writing to the array while accessing and
-            # matrix operations work with same speed (e.g. dot)
-            a = None if is_sparse else np.zeros(
-                (n_rows, len(src_cols)), order="F", dtype=dtype)
-            data = []
-            sp_col = []
-            sp_row = []
-            match_density = (
-                assure_column_sparse if is_sparse else assure_column_dense
-            )
-
-            # converting to csc before instead of each column is faster
-            # do not convert if not required
-            if any([isinstance(x, int) for x in src_cols]):
-                X = csc_matrix(source.X) if is_sparse else source.X
-                Y = csc_matrix(source._Y) if is_sparse else source._Y
-
-            shared_cache = _thread_local.conversion_cache
-            for i, col in enumerate(src_cols):
-                if col is None:
-                    col_array = match_density(
-                        np.full((n_rows, 1), variables[i].Unknown)
-                    )
-                elif not isinstance(col, Integral):
-                    if isinstance(col, SharedComputeValue):
-                        shared, weakrefs = shared_cache.get(
-                            (id(col.compute_shared), id(source)),
-                            (None, None)
-                        )
-                        if shared is None or not valid_refs(weakrefs):
-                            shared, _ = shared_cache[(id(col.compute_shared), id(source))] = \
-                                col.compute_shared(source), \
-                                (weakref.ref(col.compute_shared), weakref.ref(source))
-
-                        if row_indices is not ...:
-                            col_array = match_density(
-                                col(source, shared_data=shared)[row_indices])
-                        else:
-                            col_array = match_density(
-                                col(source, shared_data=shared))
-                    else:
-                        if row_indices is not ...:
-                            col_array = match_density(col(source)[row_indices])
-                        else:
-                            col_array = match_density(col(source))
-                elif col < 0:
-                    col_array = match_density(
-                        source.metas[row_indices, -1 - col]
-                    )
-                elif col < n_src_attrs:
-                    col_array = match_density(X[row_indices, col])
-                else:
-                    col_array = match_density(
-                        Y[row_indices, col - n_src_attrs]
-                    )
-
-                if is_sparse:
-                    # col_array should be coo matrix
-                    data.append(col_array.data)
-                    sp_col.append(np.full(len(col_array.data), i))
-                    sp_row.append(col_array.indices)  # row indices should be same
-                else:
-                    a[:, i] = col_array
-
-            if is_sparse:
-                # creating csr directly would need plenty of manual work which
-                # would probably slow down the process - conversion coo to csr
-                # is fast
-                a = sp.coo_matrix(
-                    (np.hstack(data), (np.hstack(sp_row), np.hstack(sp_col))),
-                    shape=(n_rows, len(src_cols)),
-                    dtype=dtype
-                )
-                a = a.tocsr()
+                return match_density(source_columns(
+                    "_Y", row_indices, [x - n_src_attrs for x in src_cols]))
 
-            return a
+            if not is_sparse:
+                return get_dense_columns(row_indices, plan, n_rows, dtype,
+                                         variables)
+            return get_sparse_columns(row_indices, plan, n_rows, dtype,
+                                      variables)
 
         new_cache = _thread_local.conversion_cache is None
         try:
@@ -436,6 +693,16 @@ class Table(Sequence, Storage):
                     _thread_local.conversion_cache.get((id(domain), id(source)), (None, None))
                 if cached and valid_refs(weakrefs):
                     return cached
+            if lazy_source is not None:
+                # Columns that are only copied from a deferred table can be
+                # taken (or computed) from its source
+                conversion = domain.get_conversion(source.domain)
+                if all(isinstance(col, Integral)
+                       for col in chain(conversion.attributes,
+                                        conversion.class_vars,
+                                        conversion.metas)):
+                    return cls.from_table(domain, lazy_source, row_indices)
+
             if domain is source.domain:
                 table = cls.from_table_rows(source, row_indices)
                 # assure resulting domain is the instance passed on input
@@ -446,7 +713,7 @@ class Table(Sequence, Storage):
                 return table
 
             if isinstance(row_indices, slice):
-                n_rows = len(range(*row_indices.indices(source.X.shape[0])))
+                n_rows = len(range(*row_indices.indices(len(source))))
             elif row_indices is ...:
                 n_rows = len(source)
             else:
@@ -454,16 +721,18 @@ class Table(Sequence, Storage):
 
             self = cls()
             self.domain = domain
-            conversion = DomainConversion(source.domain, domain)
+            conversion = domain.get_conversion(source.domain)
             self.X = get_columns(row_indices, conversion.attributes, n_rows,
                                  is_sparse=conversion.sparse_X,
-                                 variables=domain.attributes)
+                                 variables=domain.attributes,
+                                 plan=conversion.plan_X)
             if self.X.ndim == 1:
                 self.X = self.X.reshape(-1, len(self.domain.attributes))
 
             self.Y = get_columns(row_indices, conversion.class_vars, n_rows,
                                  is_sparse=conversion.sparse_Y,
-                                 variables=domain.class_vars)
+                                 variables=domain.class_vars,
+                                 plan=conversion.plan_Y)
 
             dtype = np.float64
             if any(isinstance(var, StringVariable) for var in domain.metas):
@@ -471,7 +740,8 @@ class Table(Sequence, Storage):
             self.metas = get_columns(row_indices, conversion.metas,
                                      n_rows, dtype,
                                      is_sparse=conversion.sparse_metas,
-                                     variables=domain.metas)
+                                     variables=domain.metas,
+                                     plan=conversion.plan_metas)
             if self.metas.ndim == 1:
                 self.metas = self.metas.reshape(-1, len(self.domain.metas))
             if source.has_weights():
@@ -508,13 +778,57 @@ class Table(Sequence, Storage):
             table = data.transform(domain)
             table[:, new_attribute] = new_column
 
+        Within :obj:`lazy_transforms`, the returned table is deferred: its
+        data is computed on the first access.
+
         Args:
             domain (Domain): new domain
 
         Returns:
             A new table
         """
-        return type(self).from_table(domain, self)
+        cls = type(self)
+        lazy_tables = _thread_local.lazy_tables
+        if lazy_tables is None or not cls._supports_lazy():
+            return cls.from_table(domain, self)
+        table = cls()
+        table.domain = domain
+        table._lazy_source = self
+        # weights and ids of deferred tables are set, hence also available
+        # without computing the source
+        if self.has_weights():
+            table.W = self.W
+        else:
+            table.W = np.empty((len(self), 0))
+        table.ids = self.ids
+        table.name = getattr(self, 'name', '')
+        table.attributes = getattr(self, 'attributes', {})
+        lazy_tables.append(weakref.ref(table))
+        return table
+
+    @classmethod
+    def _supports_lazy(cls):
+        # Subclasses that store data differently (e.g. SqlTable) or construct
+        # tables differently are never deferred
+        return cls.from_table.__func__ is Table.from_table.__func__ \
+            and all(isinstance(inspect.getattr_static(cls, name),
+                               _DeferredArray)
+                    for name in ("X", "_Y", "metas"))
+
+    def _materialize(self):
+        source = self.__dict__.get("_lazy_source")
+        if source is None:
+            return
+        table = type(self).from_table(self.domain, source)
+        for name in ("X", "_Y", "metas"):
+            self.__dict__[name] = table.__dict__[name]
+        self.__dict__.pop("_lazy_source", None)
+
+    def __getstate__(self):
+        self._materialize()
+        state = self.__dict__.copy()
+        state.pop("_content_hash", None)
+        return state
 
     @classmethod
     def from_table_rows(cls, source, row_indices):
@@ -528,6 +842,10 @@ class Table(Sequence, Storage):
         :return: a new table
         :rtype: Orange.data.Table
         """
+        if isinstance(row_indices, np.ndarray) and row_indices.dtype == bool \
+                and len(row_indices) == len(source):
+            # Each array would otherwise convert the mask to indices again
+            row_indices = np.flatnonzero(row_indices)
         self = cls()
         self.domain = source.domain
         self.X = source.X[row_indices]
@@ -685,12 +1003,12 @@ class Table(Sequence, Storage):
         :return: a new data table
         :rtype: Orange.data.Table
         """
-        from Orange.data.io import FileFormat
+        from Orange.data.io import FileFormat, FileCache
 
         absolute_filename = FileFormat.locate(filename, dataset_dirs)
         reader = FileFormat.get_reader(absolute_filename)
         reader.select_sheet(sheet)
-        data = reader.read()
+        data = FileCache.default().read(reader)
 
         # Readers return plain table. Make sure to cast it to appropriate
         # (subclass) type
@@ -798,6 +1116,7 @@ class Table(Sequence, Storage):
         return self.from_table(domain, self, row_idx)
 
     def __setitem__(self, key, value):
+        self._invalidate_content_hash()
         if not isinstance(key, tuple):
             if isinstance(value, Real):
                 self.X[key, :] = value
@@ -880,6 +1199,9 @@ class Table(Sequence, Storage):
                 self.metas[row_idx, meta_cols] = value
 
     def __len__(self):
+        lazy_source = self.__dict__.get("_lazy_source")
+        if lazy_source is not None:
+            return len(lazy_source)
         return self.X.shape[0]
 
     def __str__(self):
@@ -975,6 +1297,7 @@ class Table(Sequence, Storage):
             # them creates copies in constructor we can skip this check here.
             return not sp.issparse(x) and x.base is not None
 
+        self._invalidate_content_hash()
         if is_view(self.X):
             self.X = self.X.copy()
         if is_view(self._Y):
@@ -1023,6 +1346,7 @@ class Table(Sequence, Storage):
         if not self.W.shape[-1]:
             self.W = np.empty(len(self))
         self.W[:] = weight
+        self._invalidate_content_hash()
 
     def has_weights(self):
         """Return `True` if the data instances are weighed. """
@@ -1072,6 +1396,41 @@ class Table(Sequence, Storage):
         cs = zlib.adler32(np.ascontiguousarray(self.W), cs)
         return cs
 
+    def content_hash(self):
+        """
+        Return a hash of the table's content: the structure of its domain
+        and the values in X, Y, metas and W.
+
+        Unlike `checksum`, the hash is equal across processes and sessions
+        (also for tables with object metas), so it can be used as a key
+        for caching results of computations on the data. Large arrays are
+        hashed in chunks in multiple threads (see `parallel_compute_values`).
+
+        The hash is memoized. It is recomputed when arrays or the domain are
+        replaced or when data is changed through the table's or its rows'
+        methods (e.g. `__setitem__` or `set_weights`); code that modifies
+        the arrays in place must call `ensure_copy` first (which it must do
+        anyway, to not modify the data of other tables).
+
+        Returns:
+            str: a hex digest
+        """
+        arrays = (self.X, self._Y, self.metas, self.W)
+        memo = self.__dict__.get("_content_hash")
+        if memo is not None:
+            domain, refs, digest = memo
+            if domain is self.domain \
+                    and all(ref() is arr for ref, arr in zip(refs, arrays)):
+                return digest
+        digest = _content_hash(
+            repr(("table", self.domain.content_hash())), arrays)
+        self._content_hash = \
+            (self.domain, tuple(weakref.ref(arr) for arr in arrays), digest)
+        return digest
+
+    def _invalidate_content_hash(self):
+        self.__dict__.pop("_content_hash", None)
+
     def shuffle(self):
         """Randomly shuffle the rows of the table."""
         if not self._check_all_dense():
@@ -1180,7 +1539,7 @@ class Table(Sequence, Storage):
         selection = self._values_filter_to_indicator(filter)
         return self.from_table(self.domain, self, selection)
 
-    def _values_filter_to_indicator(self, filter):
+    def _values_filter_to_indicator(self, filter, factorized=None):
         """Return selection of rows matching the filter conditions
 
         Handles conjunction/disjunction and negate modifiers
@@ -1188,6 +1547,8 @@ class Table(Sequence, Storage):
         Parameters
         ----------
         filter: Values object containing the conditions
+        factorized: dict with factorized string columns (see
+            `_filter_to_indicator`); shared by nested conditions
 
         Returns
         -------
@@ -1195,6 +1556,8 @@ class Table(Sequence, Storage):
         """
         from Orange.data.filter import Values
 
+        if factorized is None:
+            factorized = {}
         if isinstance(filter, Values):
             conditions = filter.conditions
             conjunction = filter.conjunction
@@ -1207,7 +1570,7 @@ class Table(Sequence, Storage):
             sel = np.zeros(len(self), dtype=bool)
 
         for f in conditions:
-            selection = self._filter_to_indicator(f)
+            selection = self._filter_to_indicator(f, factorized)
 
             if conjunction:
                 sel *= selection
@@ -1218,12 +1581,17 @@ class Table(Sequence, Storage):
             sel = ~sel
         return sel
 
-    def _filter_to_indicator(self, filter):
+    def _filter_to_indicator(self, filter, factorized=None):
         """Return selection of rows that match the condition.
 
+        String conditions on columns of objects are evaluated on distinct
+        values, which are then mapped to rows. Factorized columns are
+        stored into `factorized`, so other conditions can reuse them.
+
         Parameters
         ----------
         filter: ValueFilter describing the condition
+        factorized: dict with columns' codes and distinct values, or None
 
         Returns
         -------
@@ -1233,8 +1601,10 @@ class Table(Sequence, Storage):
             FilterContinuous, FilterDiscrete, FilterRegex, FilterString,
             FilterStringList, IsDefined, Values
         )
+        if factorized is None:
+            factorized = {}
         if isinstance(filter, Values):
-            return self._values_filter_to_indicator(filter)
+            return self._values_filter_to_indicator(filter, factorized)
 
         def get_col_indices():
             cols = chain(self.domain.variables, self.domain.metas)
@@ -1256,6 +1626,32 @@ class Table(Sequence, Storage):
                 return [col for col in cols if col.is_string]
             raise TypeError("Invalid filter")
 
+        def string_list_filter(col):
+            if not filter.case_sensitive:
+                col = np.char.lower(np.array(col, dtype=str))
+                vals = [val.lower() for val in filter.values]
+            else:
+                vals = filter.values
+            return reduce(operator.add, (col == val for val in vals))
+
+        def distinct_values_filter(col_idx, col, indicator):
+            if col.dtype != object:
+                return indicator(col)
+            col_idx = self.domain.index(col_idx)
+            if col_idx not in factorized:
+                factorized[col_idx] = _factorize(col)
+            codes, uniques = factorized[col_idx]
+            sel = np.zeros(len(col), dtype=bool)
+            # Codes of None and nan are -1; their strings differ
+            unknown = codes == -1
+            if len(uniques):
+                known = ~unknown
+                sel[known] = np.asarray(indicator(uniques), dtype=bool)[
+                    codes[known]]
+            if unknown.any():
+                sel[unknown] = indicator(col[unknown])
+            return sel
+
         def col_filter(col_idx):
             col = self.get_column_view(col_idx)[0]
             if isinstance(filter, IsDefined):
@@ -1268,16 +1664,14 @@ class Table(Sequence, Storage):
             if isinstance(filter, FilterContinuous):
                 return self._continuous_filter_to_indicator(filter, col)
             if isinstance(filter, FilterString):
-                return self._string_filter_to_indicator(filter, col)
+                return distinct_values_filter(
+                    col_idx, col,
+                    partial(self._string_filter_to_indicator, filter))
             if isinstance(filter, FilterStringList):
-                if not filter.case_sensitive:
-                    col = np.char.lower(np.array(col, dtype=str))
-                    vals = [val.lower() for val in filter.values]
-                else:
-                    vals = filter.values
-                return reduce(operator.add, (col == val for val in vals))
+                return distinct_values_filter(col_idx, col, string_list_filter)
             if isinstance(filter, FilterRegex):
-                return np.vectorize(filter)(col)
+                return distinct_values_filter(
+                    col_idx, col, np.vectorize(filter, otypes=[bool]))
             raise TypeError("Invalid filter")
 
         col_indices = get_col_indices()
@@ -1359,14 +1753,11 @@ class Table(Sequence, Storage):
             fmax = fmax.lower()
 
         if filter.oper == filter.Contains:
-            return np.fromiter((fmin in e for e in col),
-                               dtype=bool)
+            return np.char.find(col, fmin) != -1
         if filter.oper == filter.StartsWith:
-            return np.fromiter((e.startswith(fmin) for e in col),
-                               dtype=bool)
+            return np.char.startswith(col, fmin)
         if filter.oper == filter.EndsWith:
-            return np.fromiter((e.endswith(fmin) for e in col),
-                               dtype=bool)
+            return np.char.endswith(col, fmin)
 
         return self._range_filter_to_indicator(filter, col, fmin, fmax)
 
@@ -1422,6 +1813,76 @@ class Table(Sequence, Storage):
                 stats.append(S[0])
         return stats
 
+    def _iter_chunks(self, columns=None, chunk_size=None):
+        if columns is None:
+            columns = self.domain.variables
+        indices = [self.domain.index(col) for col in columns]
+        chunk_size = chunk_size or _STATS_CHUNK_SIZE
+        W = self.W if self.has_weights() else None
+        for start in range(0, len(self), chunk_size):
+            rows = slice(start, start + chunk_size)
+            yield (self._chunk_columns(indices, rows),
+                   None if W is None else W[rows])
+
+    def _chunk_columns(self, indices, rows):
+        n_attrs = self.X.shape[1]
+        columns = []
+        for index in indices:
+            if 0 <= index < n_attrs:
+                col = self.X[rows, index]
+            elif index >= n_attrs:
+                col = self._Y[rows, index - n_attrs]
+            else:
+                col = self.metas[rows, -1 - index]
+            if sp.issparse(col):
+                col = col.toarray().ravel()
+            if self.domain[index].is_primitive():
+                col = col.astype(float)
+            columns.append(col)
+        return columns
+
+    def _compute_accumulators(self, columns=None, chunk_size=None,
+                              sketch_size=2000, random_state=0):
+        # pylint: disable=import-outside-toplevel
+        from Orange.statistics.accumulators import ColumnStats
+
+        if columns is None:
+            columns = self.domain.variables
+        variables = [self.domain[col] for col in columns]
+        indices = [self.domain.index(col) for col in columns]
+        chunk_size = chunk_size or _STATS_CHUNK_SIZE
+        W = self.W if self.has_weights() else None
+        accumulators = [ColumnStats(var, sketch_size, random_state)
+                        for var in variables]
+        lock = Lock()
+        finished = {}
+        merged = 0
+
+        # Chunks are processed by the threads for computing values (in
+        # parallel, if enabled); their statistics are merged in the order
+        # of chunks, so that quantile sketches do not depend on timing
+        def compute_chunk(index, rows):
+            nonlocal merged
+            weights = None if W is None else W[rows]
+            chunk_stats = [
+                ColumnStats(var, sketch_size, random_state).update(
+                    values, weights)
+                for var, values in zip(variables,
+                                       self._chunk_columns(indices, rows))]
+            with lock:
+                finished[index] = chunk_stats
+                while merged in finished:
+                    for accumulator, stats in zip(accumulators,
+                                                  finished.pop(merged)):
+                        accumulator.merge(stats)
+                    merged += 1
+
+        _run_compute_value_tasks(
+            [partial(compute_chunk, index,
+                     slice(start, start + chunk_size))
+             for index, start in enumerate(range(0, len(self), chunk_size))])
+        return accumulators
+
     def _compute_distributions(self, columns=None):
         if columns is None:
             columns = range(len(self.domain.variables))
@@ -1536,22 +1997,17 @@ class Table(Sequence, Storage):
             vars = [(e, f_ind(col_indi[e]), col_desc[e]) for e in arr_indi]
             disc_vars = [v for v in vars if v[2].is_discrete]
             if disc_vars:
-                if sp.issparse(arr):
-                    max_vals = max(len(v[2].values) for v in disc_vars)
-                    disc_indi = {i for _, i, _ in disc_vars}
-                    mask = [i in disc_indi for i in range(arr.shape[1])]
-                    conts, nans_cols, nans_rows, nans = contingency(
-                        arr, row_data, max_vals - 1, n_rows - 1, W, mask)
-                    for col_i, arr_i, var in disc_vars:
-                        n_vals = len(var.values)
-                        contingencies[col_i] = (
-                            conts[arr_i][:, :n_vals], nans_cols[arr_i],
-                            nans_rows[arr_i], nans[arr_i])
-                else:
-                    for col_i, arr_i, var in disc_vars:
-                        contingencies[col_i] = contingency(
-                            arr[:, arr_i].astype(float),
-                            row_data, len(var.values) - 1, n_rows - 1, W)
+                # all discrete columns are computed in a single pass
+                max_vals = max(len(v[2].values) for v in disc_vars)
+                disc_indi = {i for _, i, _ in disc_vars}
+                mask = [i in disc_indi for i in range(arr.shape[1])]
+                conts, nans_cols, nans_rows, nans = contingency(
+                    arr, row_data, max_vals - 1, n_rows - 1, W, mask)
+                for col_i, arr_i, var in disc_vars:
+                    n_vals = len(var.values)
+                    contingencies[col_i] = (
+                        conts[arr_i][:, :n_vals], nans_cols[arr_i],
+                        nans_rows[arr_i][:n_vals], nans[arr_i])
 
             cont_vars = [v for v in vars if v[2].is_continuous]
             if cont_vars:
@@ -1724,6 +2180,17 @@ class Table(Sequence, Storage):
         return t
 
 
+def _factorize(values):
+    """
+    Return integer codes of values and an array of distinct values.
+    Missing values (None and nan) get code -1.
+    """
+    # pandas is imported only when needed since it is slow to import
+    import pandas as pd
+    codes, uniques = pd.factorize(values)
+    return codes, np.asarray(uniques, dtype=object)
+
+
 def _check_arrays(*arrays, dtype=None, shape_1=None):
     checked = []
     if not len(arrays):
@@ -1867,7 +2334,7 @@ def assure_domain_conversion_sparsity(target, source):
         Table: with fixed sparsity. The sparsity is set as it is recommended by domain conversion
             for transformation from source to the target domain.
     """
-    conversion = DomainConversion(source.domain, target.domain)
+    conversion = target.domain.get_conversion(source.domain)
     match_density = [assure_array_dense, assure_array_sparse]
     target.X = match_density[conversion.sparse_X](target.X)
     target.Y = match_density[conversion.sparse_Y](target.Y)
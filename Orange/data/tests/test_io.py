@@ -3,7 +3,7 @@ import numpy as np
 
 from Orange.data import ContinuousVariable, DiscreteVariable, StringVariable, \
     TimeVariable
-from Orange.data.io_util import guess_data_type
+from Orange.data.io_util import guess_data_type, parse_floats, isnastr
 from Orange.misc.collections import natural_sorted
 
 
@@ -45,6 +45,26 @@ class TestTableFilters(unittest.TestCase):
         self.assertEqual(natural_sorted(set(in_values)), valuemap)
         np.testing.assert_array_equal(in_values, values)
 
+    def test_guess_data_type_missing(self):
+        in_values = np.array([str(x / 10) for x in range(50)] + ["?", ""],
+                             dtype=object)
+        valuemap, values, coltype = guess_data_type(in_values,
+                                                    isnastr(in_values))
+        self.assertEqual(ContinuousVariable, coltype)
+        self.assertIsNone(valuemap)
+        np.testing.assert_array_equal(values[:50], np.arange(50) / 10)
+        self.assertTrue(np.isnan(values[50:]).all())
+
+    def test_parse_floats(self):
+        in_values = np.array(["1", "?", "2.5", "-1e3", ""], dtype=object)
+        np.testing.assert_array_equal(
+            parse_floats(in_values, isnastr(in_values)),
+            [1, np.nan, 2.5, -1000, np.nan])
+
+        in_values = np.array(["1", "a"], dtype=object)
+        self.assertRaises(ValueError,
+                          parse_floats, in_values, isnastr(in_values))
+
     def test_guess_data_type_string(self):
         # should be StringVariable
         # too many different values for discrete
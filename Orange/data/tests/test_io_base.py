@@ -1,5 +1,6 @@
 # pylint: disable=protected-access
 import unittest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from unittest.mock import Mock
 
 import numpy as np
@@ -159,6 +160,27 @@ class TestDataTableMixin(InitTestData):
     def test_data_table_3(self):
         self.assertIsInstance(DataTableMixin.data_table(self.header3), Table)
 
+    def test_data_table_executor(self):
+        data = [["a", "b", "c", "d", "e"],
+                ["", "", "d", "", "c"],
+                ["", "", "", "i", ""]] + \
+            [[str(i), f"{i % 3}", "x", str(i), f"{i / 7:.2f}"]
+             for i in range(100)]
+        data[10][4] = "?"
+        expected = DataTableMixin.data_table(data)
+        for executor_type in (ThreadPoolExecutor, ProcessPoolExecutor):
+            with executor_type(2) as executor:
+                table = DataTableMixin.data_table(data, executor=executor)
+            self.assertEqual(table.domain, expected.domain)
+            np.testing.assert_array_equal(table.X, expected.X)
+            np.testing.assert_array_equal(table.Y, expected.Y)
+
+    def test_data_table_executor_raises(self):
+        data = [["a", "b"], ["c", "c"], ["", ""], ["1", "2"], ["3", "x"]]
+        with ThreadPoolExecutor(2) as executor:
+            with self.assertRaisesRegex(ValueError, "line 5, column 2"):
+                DataTableMixin.data_table(data, executor=executor)
+
     def test_parse_headers_empty(self):
         headers, data = DataTableMixin.parse_headers([])
         self.assertListEqual(headers, [])
@@ -239,5 +261,68 @@ class TestDataTableMixin(InitTestData):
         self.assertListEqual(flags, [])
 
 
+class TestDataTableChunks(InitTestData):
+    def assert_chunks_equal(self, data, chunk_rows):
+        table = DataTableMixin.data_table(data)
+        chunks = list(DataTableMixin.data_table_chunks(
+            lambda: iter(data), chunk_rows))
+        self.assertEqual(sum(map(len, chunks)), len(table))
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), chunk_rows)
+            self.assertEqual(chunk.domain, table.domain)
+            self.assertIs(chunk.domain, chunks[0].domain)
+        for var, chunk_var in zip(table.domain.variables + table.domain.metas,
+                                  chunks[0].domain.variables
+                                  + chunks[0].domain.metas):
+            self.assertIs(type(var), type(chunk_var))
+            if var.is_discrete:
+                self.assertEqual(var.values, chunk_var.values)
+            if var.is_continuous:
+                self.assertEqual(var.number_of_decimals,
+                                 chunk_var.number_of_decimals)
+        conc = Table.concatenate(chunks)
+        np.testing.assert_equal(conc.X, table.X)
+        np.testing.assert_equal(conc.Y, table.Y)
+        np.testing.assert_equal(conc.metas, table.metas)
+        np.testing.assert_equal(conc.W, table.W)
+
+    def test_headers(self):
+        for data in (self.header0, self.header1, self.header1_flags,
+                     self.header3):
+            for chunk_rows in (1, 2, 10):
+                self.assert_chunks_equal(data, chunk_rows)
+
+    def test_inferred_types(self):
+        rng = np.random.RandomState(0)
+        data = [["disc", "num", "bin", "str", "time", "mixed"]] + [
+            [rng.choice(["a", "b", "c", "?"]),
+             str(rng.randint(100) / 8),
+             rng.choice(["0", "1", ""]),
+             f"s{rng.randint(10000)}",
+             f"2020-01-{rng.randint(1, 29):02}",
+             "x" if i == 77 else str(i)]
+            for i in range(100)]
+        table = DataTableMixin.data_table(data)
+        self.assertEqual(
+            [type(var) for var in table.domain.variables
+             + table.domain.metas],
+            [DiscreteVariable, ContinuousVariable, DiscreteVariable,
+             TimeVariable, StringVariable, StringVariable])
+        for chunk_rows in (1, 7, 50, 1000):
+            self.assert_chunks_equal(data, chunk_rows)
+
+    def test_empty(self):
+        self.assertEqual(
+            list(DataTableMixin.data_table_chunks(lambda: iter([]), 10)), [])
+        tables = list(DataTableMixin.data_table_chunks(
+            lambda: iter(self.header3[:3]), 10))
+        self.assertEqual(tables, [])
+
+    def test_non_continuous_value(self):
+        data = self.header3 + [["red", "x", "0", "0", "1", "a", "a", "no"]]
+        with self.assertRaises(ValueError):
+            DataTableMixin.data_table_chunks(lambda: iter(data), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -89,6 +89,65 @@ class TestPandasCompat(unittest.TestCase):
         cols = pd.Index([var.name for var in domain.variables + domain.metas])
         pd.testing.assert_index_equal(df.columns, cols)
 
+    def test_table_from_frame_no_copy(self):
+        from Orange.data.pandas_compat import table_from_frame
+
+        df = pd.DataFrame(np.arange(12, dtype=float).reshape(4, 3),
+                          columns=list("abc"))
+        table = table_from_frame(df, copy=False)
+        self.assertTrue(np.shares_memory(table.X, df.values))
+        self.assertEqual([var.name for var in table.domain.attributes],
+                         list("abc"))
+        np.testing.assert_equal(table.X, df.values)
+
+        table = table_from_frame(df)
+        self.assertFalse(np.shares_memory(table.X, df.values))
+
+        # infinities would be replaced in the frame
+        df.iloc[0, 0] = np.inf
+        with self.assertWarns(RuntimeWarning):
+            table = table_from_frame(df, copy=False)
+        self.assertFalse(np.shares_memory(table.X, df.values))
+        self.assertEqual(df.iloc[0, 0], np.inf)
+
+        # categorical columns cannot be viewed
+        df["d"] = pd.Categorical(["x", "y", None, "x"])
+        table = table_from_frame(df, copy=False)
+        self.assertIsInstance(table.domain["d"], DiscreteVariable)
+        np.testing.assert_equal(table.X[:, 3], [0, 1, np.nan, 0])
+
+    def test_table_to_frame_no_copy(self):
+        from Orange.data.pandas_compat import table_to_frame
+        table = Table("iris")
+        df = table_to_frame(table, copy=False)
+        self.assertTrue(np.shares_memory(df["sepal length"].values, table.X))
+        pd.testing.assert_frame_equal(df, table_to_frame(table))
+
+        table = Table("zoo")
+        df = table_to_frame(table, include_metas=True, copy=False)
+        pd.testing.assert_frame_equal(
+            df, table_to_frame(table, include_metas=True))
+
+    def test_arrow(self):
+        from Orange.data.pandas_compat import table_to_arrow, table_from_arrow
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.skipTest("Missing package 'pyarrow'")
+
+        table = Table("iris")
+        table.X = np.asfortranarray(table.X)
+        batch = table_to_arrow(table)
+        self.assertEqual(batch.schema.names,
+                         [var.name for var in table.domain.variables])
+        self.assertIsInstance(batch.column(4).type, pa.DictionaryType)
+        self.assertTrue(
+            np.shares_memory(batch.column(0).to_numpy(), table.X))
+
+        new = table_from_arrow(batch)
+        self.assertEqual(new.domain.attributes, table.domain.variables)
+        np.testing.assert_equal(new.X, np.hstack((table.X, table.Y[:, None])))
+
     @unittest.skip("Convert all Orange demo dataset. It takes about 5s which is way to slow")
     def test_table_to_frame_on_all_orange_dataset(self):
         from os import listdir
@@ -470,6 +470,22 @@ class Variable(Reprable, metaclass=VariableMeta):
     def compute_value(self):
         return self._compute_value
 
+    def to_sql(self):
+        """
+        Return an SQL expression that computes the variable's values in
+        a database (see :obj:`Orange.data.sql.table.SqlTable`).
+
+        Backends replace the method for variables that correspond to columns
+        of database tables. Other variables get the expression from their
+        `compute_value`, if it has a method `to_sql`; expressions of discrete
+        variables give indices of values.
+        """
+        to_sql = getattr(self._compute_value, "to_sql", None)
+        if to_sql is None:
+            raise ValueError("values of '{}' can not be computed in a database"
+                             .format(self.name))
+        return to_sql()
+
     def __reduce__(self):
         if not self.name:
             raise PickleError("Variables without names cannot be pickled")
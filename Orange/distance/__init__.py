@@ -3,5 +3,7 @@ from .distance import (Distance, DistanceModel,
                        SpearmanR, SpearmanRAbsolute, PearsonR, PearsonRAbsolute,
                        Mahalanobis, MahalanobisDistance, Hamming, Bhattacharyya)
 
+from .neighbors import KNNIndex
+
 from .base import (
     _preprocess, remove_discrete_features, remove_nonbinary_features, impute)
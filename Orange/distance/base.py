@@ -5,7 +5,7 @@ import numpy as np
 import sklearn.metrics as skl_metrics
 
 from Orange.data import Table, Domain, Instance, RowInstance
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 from Orange.preprocess import SklImpute
 from Orange.statistics import util
 
@@ -280,6 +280,80 @@ class DistanceModel:
                 dist = DistMatrix(dist)
             return dist
 
+    #: the number of distances computed at once by :obj:`condensed`
+    condensed_block_size = 2 ** 22
+
+    def condensed(self, e1, dtype=None):
+        """
+        Compute distances between rows or columns of `e1` and return them
+        as :obj:`~Orange.misc.CondensedDistMatrix`.
+
+        Distances between rows are computed in blocks of rows, each
+        against the rows that follow it, so the square matrix is never
+        constructed. Distances between columns are computed as usual and
+        then condensed.
+
+        Since blocks are compared with the data as two tables, distances
+        equal those from `model(e1, e1)`. For correlation distances on data
+        with missing values, these can differ from `model(e1)`; e.g.
+        Spearman correlation ranks missing values instead of returning nan.
+
+        Args:
+            e1 (Orange.data.Table or numpy.ndarray): input data
+            dtype: the type of stored distances (e.g. `np.float32`);
+                `np.float64` by default
+
+        Returns:
+            A condensed distance matrix (Orange.misc.CondensedDistMatrix)
+        """
+        if self.axis == 0:
+            return self(e1).to_condensed(dtype)
+
+        x = _orange_to_numpy(e1)
+        n = x.shape[0]
+        condensed = np.empty(n * (n - 1) // 2, dtype=dtype or np.float64)
+        step = max(1, self.condensed_block_size // max(n, 1))
+        callback, self.callback = self.callback, None
+        try:
+            start = 0
+            for row_start in range(0, n - 1, step):
+                row_end = min(row_start + step, n)
+                with np.errstate(invalid="ignore"):
+                    dist = self.compute_distances(x[row_start:row_end],
+                                                  x[row_start:])
+                if self.impute:
+                    dist = np.nan_to_num(dist)
+                for i, row in enumerate(dist, start=1):
+                    condensed[start:start + len(row) - i] = row[i:]
+                    start += len(row) - i
+                if callback is not None:
+                    callback(100 * start / len(condensed))
+        finally:
+            self.callback = callback
+        items = e1 if isinstance(e1, Table) else None
+        return CondensedDistMatrix(condensed, items, self.axis)
+
+    def vector_space(self, x):
+        """
+        Return rows of `x` as vectors whose distances by a metric from
+        `sklearn.neighbors` order the rows as the distances of this model.
+
+        Models that can express their distances this way allow tree-based
+        and approximate search in :obj:`~Orange.distance.KNNIndex`.
+        The default implementation returns `None`, which is also returned
+        when this is not possible for the given data (e.g. because of
+        missing values).
+
+        Args:
+            x (np.ndarray): data
+
+        Returns:
+            `None` or a tuple with vectors (np.ndarray), the name of the
+            metric, and a function that transforms distances between
+            vectors into distances of this model (or `None` for identity)
+        """
+        return None
+
     def compute_distances(self, x1, x2):
         """
         Abstract method for computation of distances between rows or columns of
@@ -314,6 +388,12 @@ class FittedDistanceModel(DistanceModel):
             raise ValueError("mismatching domains")
         return super().__call__(e1, e2)
 
+    def condensed(self, e1, dtype=None):
+        if self.attributes is not None \
+                and e1.domain.attributes != self.attributes:
+            raise ValueError("mismatching domains")
+        return super().condensed(e1, dtype)
+
     def continuous_columns(self, x1, x2, offset, scale):
         """
         Extract and scale continuous columns from data tables.
@@ -1,5 +1,7 @@
 from typing import Callable
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from threading import Lock
 from unittest.mock import patch
 
 import numpy as np
@@ -11,7 +13,9 @@ from sklearn.utils.extmath import row_norms, safe_sparse_dot
 from sklearn.metrics import pairwise_distances
 
 from Orange.distance import _distance
+from Orange.misc import environ
 from Orange.statistics import util
+from Orange.statistics.accumulators import approx_quantiles
 
 from .base import (Distance, DistanceModel, FittedDistance, FittedDistanceModel,
                    SklDistance, _orange_to_numpy)
@@ -26,11 +30,81 @@ def _safe_sparse_dot(a: np.ndarray, b: np.ndarray,
         return _interruptible_dot(a, b, step, callback)
 
 
-def _interruptible_dot(a: np.ndarray, b: np.ndarray, step: int = 100,
-                       callback: Callable = None) -> np.ndarray:
+_block_executors = {}
+_block_executors_lock = Lock()
+
+
+def _block_bounds(n_rows: int, step: int = None,
+                  triangular: bool = False) -> (np.ndarray, np.ndarray):
+    """
+    Return boundaries of blocks of rows and the amount of work preceding
+    each boundary.
+
+    Blocks have `step` rows (by default 1 % of rows, but at least 100).
+    In triangular computations, which compare each row only with the
+    preceding rows, boundaries are moved so that blocks contain equal
+    numbers of pairs.
+    """
+    if step is None:
+        step = max(n_rows // 100, 100)
+    n_blocks = -(-n_rows // step)
+    if triangular:
+        bounds = np.round(np.sqrt(np.linspace(0, 1, n_blocks + 1)) * n_rows)
+        bounds = np.unique(bounds.astype(int))
+        return bounds, bounds.astype(float) ** 2
+    bounds = np.append(np.arange(0, n_rows, step), n_rows)
+    return bounds, bounds.astype(float)
+
+
+def _run_blocks(kernel: Callable, args: tuple, n_rows: int,
+                callback: Callable = None, step: int = None,
+                triangular: bool = False):
+    """
+    Call `kernel(*args, start, end)` for blocks of rows (see `_block_bounds`).
+
+    Blocks are run in a pool of threads (see
+    :obj:`Orange.misc.environ.distance_workers`), hence kernels must release
+    the GIL and write into disjoint parts of the output. The callback is
+    called from the calling thread with the percentage of finished work.
+    If it raises an exception (e.g. to interrupt the computation), blocks
+    that have not started yet are cancelled and the exception is propagated
+    after the running blocks finish.
+    """
     if callback is None:
         callback = lambda x: x
 
+    bounds, work = _block_bounds(n_rows, step, triangular)
+    blocks = [(int(start), int(end)) for start, end in zip(bounds, bounds[1:])]
+    workers = environ.distance_workers()
+    if workers <= 1 or len(blocks) <= 1:
+        for (start, end), done in zip(blocks, work):
+            callback(done * 100 / work[-1])
+            kernel(*args, start, end)
+        return
+
+    with _block_executors_lock:
+        executor = _block_executors.get(workers)
+        if executor is None:
+            executor = _block_executors[workers] = \
+                ThreadPoolExecutor(workers, thread_name_prefix="distance")
+    callback(0)
+    futures = {executor.submit(kernel, *args, start, end): block_work
+               for (start, end), block_work in zip(blocks, np.diff(work))}
+    done = 0
+    try:
+        for future in as_completed(futures):
+            future.result()
+            done += futures[future]
+            callback(done * 100 / work[-1])
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        raise
+
+
+def _interruptible_dot(a: np.ndarray, b: np.ndarray, step: int = 100,
+                       callback: Callable = None) -> np.ndarray:
     if not isinstance(a, np.ndarray):
         a = np.array(a)
     if not isinstance(b, np.ndarray):
@@ -39,30 +113,35 @@ def _interruptible_dot(a: np.ndarray, b: np.ndarray, step: int = 100,
         return np.dot(a, b)
 
     c = np.zeros((a.shape[0], b.shape[1]), dtype=float)
-    n_cols = b.shape[1]
-    for col in range(0, n_cols, step):
-        callback(col * 100 / n_cols)
-        c[:, col: col + step] = np.dot(a, b[:, col: col + step])
+
+    def dot_rows(start, end):
+        c[start:end] = np.dot(a[start:end], b)
+
+    _run_blocks(dot_rows, (), len(a), callback, step)
     return c
 
 
 def _interruptible_sqrt(a: np.ndarray, step: int = 100,
                         callback: Callable = None) -> np.ndarray:
-    if callback is None:
-        callback = lambda x: x
-
     if not isinstance(a, np.ndarray):
         a = np.array(a)
     if a.ndim < 2:
         return np.sqrt(a)
     new_a = np.zeros(a.shape, dtype=float)
-    n_rows = len(a)
-    for row in range(0, n_rows, step):
-        callback(row * 100 / n_rows)
-        new_a[row: row + step, :] = np.sqrt(a[row: row + step, :])
+
+    def sqrt_rows(start, end):
+        new_a[start:end] = np.sqrt(a[start:end])
+
+    _run_blocks(sqrt_rows, (), len(a), callback, step)
     return new_a
 
 
+def _any_nan_row(x: np.ndarray, callback: Callable = None) -> np.ndarray:
+    flags = np.zeros(len(x), dtype=np.int8)
+    _run_blocks(_distance.any_nan_row, (flags, x), len(x), callback)
+    return flags
+
+
 class StepwiseCallbacks:
     def __init__(self, callback, weights):
         self.step_counter = -1
@@ -131,23 +210,35 @@ class EuclideanRowsModel(FittedDistanceModel):
                 distances.flat[::distances.shape[0] + 1] = 0.0
             fixer = _distance.fix_euclidean_rows_normalized if self.normalize \
                 else _distance.fix_euclidean_rows
-            fixer(distances, data1, data2,
-                  self.means, self.vars, self.dist_missing2_cont,
-                  x2 is not None, callbacks.next())
+            _run_blocks(fixer,
+                        (distances, data1, data2, self.means, self.vars,
+                         self.dist_missing2_cont, x2 is not None),
+                        len(data1), callbacks.next(), triangular=x2 is None)
         else:
             distances = np.zeros((x1.shape[0],
                                   (x2 if x2 is not None else x1).shape[0]))
 
         if np.any(self.discrete):
             data1, data2 = self.discrete_columns(x1, x2)
-            _distance.euclidean_rows_discrete(
-                distances, data1, data2, self.dist_missing_disc,
-                self.dist_missing2_disc, x2 is not None, callbacks.next())
+            _run_blocks(_distance.euclidean_rows_discrete,
+                        (distances, data1, data2, self.dist_missing_disc,
+                         self.dist_missing2_disc, x2 is not None),
+                        len(data1), callbacks.next(), triangular=x2 is None)
 
         if x2 is None:
-            _distance.lower_to_symmetric(distances, callbacks.next())
+            _run_blocks(_distance.lower_to_symmetric, (distances, ),
+                        len(distances), callbacks.next(), triangular=True)
         return _interruptible_sqrt(distances, callback=callbacks.next())
 
+    def vector_space(self, x):
+        if self.discrete.any() or sp.issparse(x):
+            return None
+        data, _ = self.continuous_columns(
+            x, None, self.means, np.sqrt(2 * self.vars))
+        if np.isnan(data).any():
+            return None
+        return data, "euclidean", None
+
 
 class EuclideanColumnsModel(FittedDistanceModel):
     """
@@ -190,7 +281,8 @@ class EuclideanColumnsModel(FittedDistanceModel):
 
         fixer = _distance.fix_euclidean_cols_normalized if self.normalize \
             else _distance.fix_euclidean_cols
-        fixer(distances, x1, self.means, self.vars, callbacks.next())
+        _run_blocks(fixer, (distances, x1, self.means, self.vars),
+                    x1.shape[1], callbacks.next(), triangular=True)
         return _interruptible_sqrt(distances, callback=callbacks.next())
 
 
@@ -287,16 +379,21 @@ class ManhattanRowsModel(FittedDistanceModel):
         if self.continuous.any():
             data1, data2 = self.continuous_columns(
                 x1, x2, self.medians, 2 * self.mads)
-            distances = _distance.manhattan_rows_cont(
-                data1, data2, x2 is not None, callbacks.next())
+            distances = np.zeros((len(data1), len(data2)))
+            _run_blocks(_distance.manhattan_rows_cont,
+                        (distances, data1, data2, x2 is not None),
+                        len(data1), callbacks.next(), triangular=x2 is None)
             if self.normalize:
-                _distance.fix_manhattan_rows_normalized(
-                    distances, data1, data2, x2 is not None, callbacks.next())
+                _run_blocks(_distance.fix_manhattan_rows_normalized,
+                            (distances, data1, data2, x2 is not None),
+                            len(data1), callbacks.next(),
+                            triangular=x2 is None)
             else:
-                _distance.fix_manhattan_rows(
-                    distances, data1, data2,
-                    self.medians, self.mads, self.dist_missing2_cont,
-                    x2 is not None, callbacks.next())
+                _run_blocks(_distance.fix_manhattan_rows,
+                            (distances, data1, data2, self.medians, self.mads,
+                             self.dist_missing2_cont, x2 is not None),
+                            len(data1), callbacks.next(),
+                            triangular=x2 is None)
         else:
             distances = np.zeros((x1.shape[0],
                                   (x2 if x2 is not None else x1).shape[0]))
@@ -304,14 +401,25 @@ class ManhattanRowsModel(FittedDistanceModel):
         if np.any(self.discrete):
             data1, data2 = self.discrete_columns(x1, x2)
             # For discrete attributes, Euclidean is same as Manhattan
-            _distance.euclidean_rows_discrete(
-                distances, data1, data2, self.dist_missing_disc,
-                self.dist_missing2_disc, x2 is not None, callbacks.next())
+            _run_blocks(_distance.euclidean_rows_discrete,
+                        (distances, data1, data2, self.dist_missing_disc,
+                         self.dist_missing2_disc, x2 is not None),
+                        len(data1), callbacks.next(), triangular=x2 is None)
 
         if x2 is None:
-            _distance.lower_to_symmetric(distances, callbacks.next())
+            _run_blocks(_distance.lower_to_symmetric, (distances, ),
+                        len(distances), callbacks.next(), triangular=True)
         return distances
 
+    def vector_space(self, x):
+        if self.discrete.any() or sp.issparse(x):
+            return None
+        data, _ = self.continuous_columns(
+            x, None, self.medians, 2 * self.mads)
+        if np.isnan(data).any():
+            return None
+        return data, "manhattan", None
+
 
 class ManhattanColumnsModel(FittedDistanceModel):
     """
@@ -333,9 +441,11 @@ class ManhattanColumnsModel(FittedDistanceModel):
             x1 = x1 - self.medians
             x1 /= 2
             x1 /= self.mads
-        callback = self.callback or (lambda x: x)
-        return _distance.manhattan_cols(x1, self.medians, self.mads,
-                                        self.normalize, callback)
+        distances = np.zeros((x1.shape[1], x1.shape[1]))
+        _run_blocks(_distance.manhattan_cols,
+                    (distances, x1, self.medians, self.mads, self.normalize),
+                    x1.shape[1], self.callback, triangular=True)
+        return distances
 
 
 class Manhattan(FittedDistance):
@@ -345,20 +455,30 @@ class Manhattan(FittedDistance):
     fallback = SklDistance('manhattan')
     rows_model_type = ManhattanRowsModel
 
+    approximate = False
+
     def __new__(cls, e1=None, e2=None, axis=1, impute=False, normalize=False,
-                callback=None):
+                callback=None, approximate=False):
         # pylint: disable=arguments-differ
         return super().__new__(cls, e1, e2, axis, impute, callback,
-                               normalize=normalize)
+                               normalize=normalize, approximate=approximate)
+
+    def _median(self, x, axis=None):
+        if self.approximate:
+            return approx_quantiles(x, 0.5, axis=axis)
+        return np.nanmedian(x, axis=axis)
 
     def get_continuous_stats(self, column):
         """
         Return median, MAD and distance betwwen pairs of missing values
         for the given columns. The method is called by inherited `fit_rows`
-        to construct a row-distance model
+        to construct a row-distance model.
+
+        If `approximate` is set, medians and MADs are approximated with
+        a quantile sketch instead of sorting the column.
         """
-        median = np.nanmedian(column)
-        mad = np.nanmedian(np.abs(column - median))
+        median = self._median(column)
+        mad = self._median(np.abs(column - median))
         if self.normalize:
             if mad == 0:
                 return None
@@ -379,8 +499,8 @@ class Manhattan(FittedDistance):
             medians = np.zeros(len(x))
             mads = np.zeros(len(x))
         else:
-            medians = np.nanmedian(x, axis=0)
-            mads = np.nanmedian(np.abs(x - medians), axis=0)
+            medians = self._median(x, axis=0)
+            mads = self._median(np.abs(x - medians), axis=0)
         if self.normalize and (np.isnan(mads).any() or not mads.all()):
             raise ValueError(
                 "some columns have zero absolute distance from median, "
@@ -429,6 +549,20 @@ class Cosine(FittedDistance):
             self.discrete = discrete
             self.means = means
 
+        def prepare_data(self, x):
+            """Impute means, transpose if needed and normalize the vectors."""
+            if self.discrete.any():
+                data = Cosine.discrete_to_indicators(x, self.discrete)
+            else:
+                data = x.copy()
+            for col, mean in enumerate(self.means):
+                column = data[:, col]
+                column[np.isnan(column)] = mean
+            if self.axis == 0:
+                data = data.T
+            data /= row_norms(data)[:, np.newaxis]
+            return data
+
         def compute_distances(self, x1, x2):
             """
             The method imputes the missing values as means and calls
@@ -436,22 +570,8 @@ class Cosine(FittedDistance):
             (theoretically) slightly wrong distance between pairs of missing
              values.
             """
-
-            def prepare_data(x):
-                if self.discrete.any():
-                    data = Cosine.discrete_to_indicators(x, self.discrete)
-                else:
-                    data = x.copy()
-                for col, mean in enumerate(self.means):
-                    column = data[:, col]
-                    column[np.isnan(column)] = mean
-                if self.axis == 0:
-                    data = data.T
-                data /= row_norms(data)[:, np.newaxis]
-                return data
-
-            data1 = prepare_data(x1)
-            data2 = data1 if x2 is None else prepare_data(x2)
+            data1 = self.prepare_data(x1)
+            data2 = data1 if x2 is None else self.prepare_data(x2)
             dist = _safe_sparse_dot(data1, data2.T, callback=self.callback)
             np.clip(dist, -1, 1, out=dist)
             if x2 is None:
@@ -459,6 +579,17 @@ class Cosine(FittedDistance):
                 dist[diag] = np.where(np.isnan(dist[diag]), np.nan, 1.0)
             return 1 - dist
 
+        def vector_space(self, x):
+            # For unit vectors, cosine distance is a half of squared
+            # Euclidean distance
+            if self.axis == 0 or sp.issparse(x):
+                return None
+            with np.errstate(invalid="ignore"):
+                data = self.prepare_data(x)
+            if np.isnan(data).any():
+                return None
+            return data, "euclidean", lambda dist: dist ** 2 / 2
+
 
 class JaccardModel(FittedDistanceModel):
     """
@@ -492,24 +623,30 @@ class JaccardModel(FittedDistanceModel):
             weights = [5, 45, 50] if x2 is None else [5, 5, 45, 45]
             callbacks = StepwiseCallbacks(self.callback, weights)
 
-            nans1 = _distance.any_nan_row(x1, callbacks.next())
+            nans1 = _any_nan_row(x1, callbacks.next())
             if x2 is None:
                 nonzeros2, nans2 = nonzeros1, nans1
             else:
                 nonzeros2 = np.not_equal(x2, 0).view(np.int8)
-                nans2 = _distance.any_nan_row(x2, callbacks.next())
-            return _distance.jaccard_rows(
-                nonzeros1, nonzeros2,
-                x1, x1 if x2 is None else x2,
-                nans1, nans2,
-                self.ps, x2 is not None,
-                callbacks.next(), callbacks.next()
-            )
+                nans2 = _any_nan_row(x2, callbacks.next())
+            distances = np.zeros((len(x1), len(x1 if x2 is None else x2)))
+            _run_blocks(_distance.jaccard_rows,
+                        (distances, nonzeros1, nonzeros2,
+                         x1, x1 if x2 is None else x2,
+                         nans1, nans2, self.ps, x2 is not None),
+                        len(x1), callbacks.next(), triangular=x2 is None)
+            if x2 is None:
+                _run_blocks(_distance.lower_to_symmetric, (distances, ),
+                            len(distances), callbacks.next(), triangular=True)
+            return distances
         else:
             callbacks = StepwiseCallbacks(self.callback, [10, 90])
-            nans1 = _distance.any_nan_row(x1.T, callbacks.next())
-            return _distance.jaccard_cols(
-                nonzeros1, x1, nans1, self.ps, callbacks.next())
+            nans1 = _any_nan_row(x1.T, callbacks.next())
+            distances = np.zeros((x1.shape[1], x1.shape[1]))
+            _run_blocks(_distance.jaccard_cols,
+                        (distances, nonzeros1, x1, nans1, self.ps),
+                        x1.shape[1], callbacks.next(), triangular=True)
+            return distances
 
     def _compute_sparse(self, x1, x2=None):
         callback = self.callback or (lambda x: x)
@@ -0,0 +1,290 @@
+"""
+Index for finding nearest neighbors by distances from :obj:`Orange.distance`.
+"""
+import numpy as np
+from scipy import sparse as sp
+from sklearn.neighbors import BallTree, DistanceMetric
+
+from .base import Distance, _orange_to_numpy
+
+__all__ = ["KNNIndex"]
+
+
+class _RandomProjectionTree:
+    """
+    A tree that recursively splits rows by random hyperplanes, placed at
+    the median of projections, until leaves have at most `leaf_size` rows.
+
+    Internal nodes are stored in arrays `normals`, `thresholds` and
+    `children`; a child with a negative code `c` is the leaf `-c - 1`,
+    whose rows are `order[leaf_bounds[-c - 1]:leaf_bounds[-c]]`.
+    """
+    def __init__(self, x, leaf_size, rng):
+        n, dim = x.shape
+        self.order = np.arange(n)
+        normals, thresholds, children = [], [], []
+        leaf_bounds = [0]
+
+        def add_leaf(end):
+            leaf_bounds.append(end)
+            return -len(leaf_bounds) + 1
+
+        # items on the stack: start, end, index of the parent, side
+        stack = [(0, n, -1, 0)]
+        self.root = 0
+        while stack:
+            start, end, parent, side = stack.pop()
+            if end - start <= leaf_size:
+                # leaves are added in the order of their rows because the
+                # right branch is always pushed onto the stack first
+                code = add_leaf(end)
+            else:
+                rows = self.order[start:end]
+                normal = rng.standard_normal(dim)
+                projections = x[rows] @ normal
+                sort = np.argsort(projections, kind="stable")
+                self.order[start:end] = rows[sort]
+                mid = (end - start) // 2
+                thresholds.append(
+                    (projections[sort[mid - 1]] + projections[sort[mid]]) / 2)
+                normals.append(normal)
+                children.append([0, 0])
+                code = len(normals) - 1
+                stack.append((start + mid, end, code, 1))
+                stack.append((start, start + mid, code, 0))
+            if parent == -1:
+                self.root = code
+            else:
+                children[parent][side] = code
+        self.normals = np.array(normals).reshape(-1, dim)
+        self.thresholds = np.array(thresholds)
+        self.children = np.array(children, dtype=int).reshape(-1, 2)
+        self.leaf_bounds = np.array(leaf_bounds)
+
+    def leaves(self, x):
+        """Return the indices of leaves that contain rows of `x`."""
+        codes = np.full(len(x), self.root)
+        active = np.flatnonzero(codes >= 0)
+        while len(active):
+            nodes = codes[active]
+            projections = np.einsum("ij,ij->i", x[active], self.normals[nodes])
+            sides = (projections > self.thresholds[nodes]).astype(int)
+            codes[active] = self.children[nodes, sides]
+            active = active[codes[active] >= 0]
+        return -codes - 1
+
+    def rows(self, leaf):
+        return self.order[self.leaf_bounds[leaf]:self.leaf_bounds[leaf + 1]]
+
+
+class KNNIndex:
+    """
+    Index for finding the nearest neighbors of data rows.
+
+    The index is built from a fitted distance model (e.g.
+    `Euclidean(normalize=True).fit(data)`), so normalization, imputation
+    and handling of discrete values are the same as in distance matrices
+    computed by the model. Queries are answered in batches, so the memory
+    does not grow with the square of the number of rows.
+
+    The exact search computes distances to all indexed rows by blocks.
+    If the model can map the data into a vector space (see
+    :obj:`~Orange.distance.DistanceModel.vector_space`), as Euclidean,
+    Manhattan and cosine distances on data without discrete and missing
+    values do, the search can use a ball tree instead.
+
+    The approximate search builds a forest of random projection trees;
+    candidates for neighbors of a row are the rows in the same leaves,
+    and the distances to them are exact.
+
+    Args:
+        model (DistanceModel or Distance): a model for distances between
+            rows; if a distance (or its class) is given, it is fit to `data`
+        data (Orange.data.Table or np.ndarray): indexed data
+        algorithm (str): "brute", "ball_tree", or "auto", which uses a ball
+            tree if possible and if data has at most 15 dimensions
+        approximate (bool): if `True`, the search is approximate
+        n_trees (int): the number of trees for approximate search
+        leaf_size (int): the maximal number of rows in leaves of trees
+        block_size (int): the maximal number of distances computed at once
+            by brute-force search
+        random_state (int or np.random.RandomState): seed for approximate
+            search
+    """
+    algorithms = ("auto", "brute", "ball_tree")
+    max_tree_dimensions = 15
+    tree_batch_size = 1024
+
+    def __init__(self, model, data, algorithm="auto", approximate=False,
+                 n_trees=10, leaf_size=40, block_size=2 ** 22,
+                 random_state=None):
+        if algorithm not in self.algorithms:
+            raise ValueError("unknown algorithm '{}'".format(algorithm))
+        if leaf_size < 1:
+            raise ValueError("leaf size must be positive")
+        if isinstance(model, type):
+            model = model()
+        if isinstance(model, Distance):
+            model = model.fit(data)
+        if model.axis != 1:
+            raise ValueError("neighbors can be found only among rows")
+        self.model = model
+        self.data = data
+        self.approximate = approximate
+        self.block_size = block_size
+        self._x = _orange_to_numpy(data)
+        self._space = model.vector_space(self._x)
+        self._tree = self._forest = None
+
+        if approximate:
+            if sp.issparse(self._x):
+                raise ValueError("approximate search requires dense data")
+            if isinstance(random_state, np.random.RandomState):
+                rng = random_state
+            else:
+                rng = np.random.RandomState(random_state)
+            if self._space is None:
+                self._means = np.nan_to_num(np.nanmean(self._x, axis=0))
+            vectors = self._forest_vectors(self._x)
+            self._forest = [_RandomProjectionTree(vectors, leaf_size, rng)
+                            for _ in range(n_trees)]
+        elif algorithm == "ball_tree" \
+                or algorithm == "auto" and self._space is not None \
+                and self._space[0].shape[1] <= self.max_tree_dimensions:
+            if self._space is None:
+                raise ValueError(
+                    "ball tree cannot be used with this distance or data")
+            vectors, metric, _ = self._space
+            self._tree = BallTree(vectors, leaf_size=leaf_size, metric=metric)
+
+    def __len__(self):
+        return self._x.shape[0]
+
+    def query(self, data=None, k=5, callback=None):
+        """
+        Find the `k` nearest indexed rows for each row of `data`.
+
+        If `data` is omitted, the method finds neighbors of indexed rows,
+        excluding each row from its own neighbors.
+
+        Args:
+            data (Orange.data.Table or np.ndarray): data
+            k (int): the number of neighbors
+            callback (callable): a function that is called with the
+                percentage of processed rows after each batch
+
+        Returns:
+            distances (np.ndarray): distances to neighbors, a row for each
+                row of `data`, in increasing order
+            indices (np.ndarray): indices of neighbors in indexed data
+        """
+        exclude_self = data is None
+        if exclude_self:
+            x = self._x
+        else:
+            attributes = getattr(self.model, "attributes", None)
+            if attributes is not None and data.domain.attributes != attributes:
+                raise ValueError("mismatching domains")
+            x = _orange_to_numpy(data)
+        n_neighbors = k + exclude_self
+        if not 0 < k or n_neighbors > len(self):
+            raise ValueError("k must be between 1 and {}"
+                             .format(len(self) - exclude_self))
+
+        n = x.shape[0]
+        distances = np.empty((n, n_neighbors))
+        indices = np.empty((n, n_neighbors), dtype=int)
+        if self._tree is None and self._forest is None:
+            step = max(1, self.block_size // len(self))
+        else:
+            step = self.tree_batch_size
+        model_callback, self.model.callback = self.model.callback, None
+        try:
+            for start in range(0, n, step):
+                end = min(start + step, n)
+                distances[start:end], indices[start:end] = \
+                    self._query_batch(x[start:end], n_neighbors)
+                if callback is not None:
+                    callback(100 * end / n)
+        finally:
+            self.model.callback = model_callback
+        if exclude_self:
+            distances, indices = self._exclude_self(distances, indices)
+        return distances, indices
+
+    @staticmethod
+    def _exclude_self(distances, indices):
+        n = len(indices)
+        drop = indices == np.arange(n)[:, None]
+        drop[~drop.any(axis=1), -1] = True
+        keep = ~drop
+        return (distances[keep].reshape(n, -1),
+                indices[keep].reshape(n, -1))
+
+    def _query_batch(self, x, k):
+        if self._tree is not None:
+            space = self.model.vector_space(x)
+            if space is not None:
+                vectors, _, transform = space
+                distances, indices = self._tree.query(vectors, k)
+                if transform is not None:
+                    distances = transform(distances)
+                return distances, indices
+        elif self._forest is not None:
+            vectors = self._forest_vectors(x)
+            if vectors is not None:
+                return self._query_forest(x, vectors, k)
+        return self._query_brute(x, k)
+
+    def _distances(self, x1, x2):
+        with np.errstate(invalid="ignore"):
+            distances = self.model.compute_distances(x1, x2)
+        if self.model.impute:
+            distances = np.nan_to_num(distances)
+        return distances
+
+    @staticmethod
+    def _nearest(distances, k, candidates=None):
+        distances = np.where(np.isnan(distances), np.inf, distances)
+        if k < distances.shape[1]:
+            part = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            part = np.tile(np.arange(distances.shape[1]), (len(distances), 1))
+        part_dist = np.take_along_axis(distances, part, axis=1)
+        order = np.argsort(part_dist, axis=1, kind="stable")
+        indices = np.take_along_axis(part, order, axis=1)
+        if candidates is not None:
+            indices = candidates[indices]
+        return np.take_along_axis(part_dist, order, axis=1), indices
+
+    def _query_brute(self, x, k):
+        return self._nearest(self._distances(x, self._x), k)
+
+    def _forest_vectors(self, x):
+        if self._space is not None:
+            space = self.model.vector_space(x)
+            return None if space is None else space[0]
+        return np.where(np.isnan(x), self._means, x)
+
+    def _query_forest(self, x, vectors, k):
+        leaves = [tree.leaves(vectors) for tree in self._forest]
+        if self._space is not None:
+            _, metric, transform = self._space
+            metric = DistanceMetric.get_metric(metric)
+        distances = np.empty((len(x), k))
+        indices = np.empty((len(x), k), dtype=int)
+        for i in range(len(x)):
+            candidates = np.unique(np.concatenate(
+                [tree.rows(tree_leaves[i])
+                 for tree, tree_leaves in zip(self._forest, leaves)]))
+            if len(candidates) < k:
+                candidates = np.union1d(candidates, np.arange(k))
+            if self._space is not None:
+                dist = metric.pairwise(vectors[i:i + 1],
+                                       self._space[0][candidates])
+                if transform is not None:
+                    dist = transform(dist)
+            else:
+                dist = self._distances(x[i:i + 1], self._x[candidates])
+            distances[i], indices[i] = self._nearest(dist, k, candidates)
+        return distances, indices
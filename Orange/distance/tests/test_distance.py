@@ -1,3 +1,4 @@
+import os
 import unittest
 from unittest.mock import patch
 from math import sqrt
@@ -7,6 +8,7 @@ from scipy.sparse import csr_matrix
 
 from Orange.data import ContinuousVariable, DiscreteVariable, Domain, Table
 from Orange import distance
+from Orange.misc import environ
 
 
 class CommonTests:
@@ -634,6 +636,37 @@ class ManhattanDistanceTest(FittedDistanceTest, CommonNormalizedTests):
              [5.5, 0, 4],
              [4, 4, 0]])
 
+    def test_manhattan_approximate(self):
+        assert_almost_equal = np.testing.assert_almost_equal
+        data = self.cont_data
+        data.X[1, 0] = np.nan
+
+        # Medians of small data are exact
+        model = distance.Manhattan(
+            axis=1, normalize=True, approximate=True).fit(data)
+        assert_almost_equal(model.medians, [2, 4.5, 1.5])
+        assert_almost_equal(model.mads, [1, 2, 1])
+        assert_almost_equal(
+            distance.Manhattan(data, axis=0, normalize=True, approximate=True),
+            distance.Manhattan(data, axis=0, normalize=True))
+
+        x = np.random.RandomState(0).normal(size=(50000, 2))
+        data = Table.from_numpy(Domain(self.cont_domain[:2]), x)
+        model = distance.Manhattan(
+            axis=1, normalize=True, approximate=True).fit(data)
+        exact = distance.Manhattan(axis=1, normalize=True).fit(data)
+        np.testing.assert_allclose(model.medians, exact.medians, atol=0.01)
+        np.testing.assert_allclose(model.mads, exact.mads, rtol=0.01)
+        # Approximations are reproducible
+        again = distance.Manhattan(
+            axis=1, normalize=True, approximate=True).fit(data)
+        np.testing.assert_equal(again.medians, model.medians)
+        np.testing.assert_equal(again.mads, model.mads)
+        model = distance.Manhattan(
+            axis=0, normalize=True, approximate=True).fit(data)
+        np.testing.assert_allclose(model.medians, exact.medians, atol=0.01)
+        np.testing.assert_allclose(model.mads, exact.mads, rtol=0.01)
+
     def test_manhattan_mixed(self):
         assert_almost_equal = np.testing.assert_almost_equal
         data = self.mixed_data
@@ -980,5 +1013,158 @@ class TestHelperFunctions(unittest.TestCase):
         np.testing.assert_array_equal(new_i, np.sqrt(i))
 
 
+class TestBlocks(unittest.TestCase):
+    # pylint: disable=protected-access
+    def test_block_bounds(self):
+        bounds, work = distance.distance._block_bounds(250, 100)
+        np.testing.assert_equal(bounds, [0, 100, 200, 250])
+        np.testing.assert_equal(work, bounds)
+
+        bounds, work = distance.distance._block_bounds(10000, triangular=True)
+        self.assertEqual(bounds[0], 0)
+        self.assertEqual(bounds[-1], 10000)
+        pairs = np.diff(work)
+        self.assertLess(pairs.max() / pairs.min(), 1.1)
+
+        bounds, _ = distance.distance._block_bounds(0)
+        np.testing.assert_equal(bounds, [0])
+
+    def test_parallel(self):
+        rng = np.random.RandomState(0)
+        x = rng.rand(500, 5)
+        x[rng.rand(500, 5) < 0.05] = np.nan
+        domain = Domain([ContinuousVariable(f"c{i}") for i in range(4)]
+                        + [DiscreteVariable("d", values=("a", "b", "c"))])
+        x[:, 4] = np.floor(x[:, 4] * 3)
+        data = Table.from_numpy(domain, x)
+        cont = data[:, :4]
+        binary = Table.from_numpy(None, (rng.rand(300, 6) > 0.5).astype(float))
+        binary.X[3, 2] = np.nan
+
+        def compute():
+            return [
+                distance.Euclidean(data, normalize=True),
+                distance.Euclidean(data, data[:100]),
+                distance.Euclidean(cont, axis=0),
+                distance.Manhattan(data, normalize=True),
+                distance.Manhattan(data, data[:100]),
+                distance.Manhattan(cont, axis=0),
+                distance.Jaccard(binary),
+                distance.Jaccard(binary, binary[:50]),
+                distance.Jaccard(binary, axis=0)]
+
+        with patch.object(environ, "distance_workers", return_value=1):
+            serial = compute()
+        with patch.object(environ, "distance_workers", return_value=3):
+            for single, parallel in zip(serial, compute()):
+                np.testing.assert_array_equal(single, parallel)
+
+    def test_callback_and_interruption(self):
+        data = Table.from_numpy(None, np.random.RandomState(0).rand(2000, 3))
+        for workers in (1, 3):
+            with patch.object(environ, "distance_workers",
+                              return_value=workers):
+                progress = []
+                distance.Manhattan(data, callback=progress.append)
+                self.assertEqual(progress, sorted(progress))
+                self.assertLessEqual(progress[-1], 100)
+
+                def interrupt(percent):
+                    if percent > 10:
+                        raise KeyboardInterrupt
+
+                self.assertRaises(KeyboardInterrupt,
+                                  distance.Manhattan, data, callback=interrupt)
+
+    def test_environ(self):
+        with patch.dict(os.environ, {"ORANGE_DISTANCE_WORKERS": "3"}):
+            self.assertEqual(environ.distance_workers(), 3)
+        with patch.dict(os.environ, {"ORANGE_DISTANCE_WORKERS": "x"}):
+            with self.assertWarns(UserWarning):
+                self.assertEqual(environ.distance_workers(), 1)
+
+
+class TestKNNIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.iris = Table("iris")
+        cls.heart = Table("heart_disease")
+
+    def assert_neighbors(self, index, data, dist, k=5, query=None):
+        model = dist.fit(data)
+        matrix = np.asarray(model(data) if query is None
+                            else model(query, data))
+        distances, indices = index.query(query, k=k)
+        if query is None:
+            np.fill_diagonal(matrix, np.inf)
+        matrix = np.nan_to_num(matrix)
+        np.testing.assert_almost_equal(
+            distances, np.sort(matrix, axis=1)[:, :k], decimal=5)
+        np.testing.assert_almost_equal(
+            np.take_along_axis(matrix, indices, axis=1), distances,
+            decimal=5)
+        self.assertTrue(all(len(set(row)) == k for row in indices))
+
+    def test_exact(self):
+        for data, dist in ((self.iris, distance.Euclidean()),
+                           (self.iris, distance.Cosine()),
+                           (self.heart, distance.Euclidean()),
+                           (self.heart, distance.Manhattan(normalize=True))):
+            for algorithm in ("brute", "auto"):
+                index = distance.KNNIndex(dist, data, algorithm=algorithm,
+                                          block_size=1000)
+                self.assert_neighbors(index, data, dist)
+                self.assert_neighbors(index, data, dist, query=data)
+
+    def test_ball_tree(self):
+        index = distance.KNNIndex(distance.Cosine, self.iris,
+                                  algorithm="ball_tree")
+        self.assertIsNotNone(index._tree)
+        self.assert_neighbors(index, self.iris, distance.Cosine())
+
+        # data with missing values or discrete attributes has no vector space
+        self.assertRaises(ValueError, distance.KNNIndex, distance.Euclidean,
+                          self.heart, algorithm="ball_tree")
+
+    def test_approximate(self):
+        for data, dist in ((self.iris, distance.Euclidean()),
+                           (self.heart, distance.Euclidean())):
+            index = distance.KNNIndex(dist, data, approximate=True,
+                                      leaf_size=20, random_state=0)
+            matrix = np.asarray(dist.fit(data)(data))
+            np.fill_diagonal(matrix, np.inf)
+            exact = np.argsort(matrix, axis=1)[:, :5]
+            distances, indices = index.query(k=5)
+            self.assertTrue(np.all(np.diff(distances, axis=1) >= 0))
+            recall = np.mean([len(set(a) & set(e)) / 5
+                              for a, e in zip(indices, exact)])
+            self.assertGreater(recall, 0.8)
+
+    def test_numpy(self):
+        x = self.iris.X
+        index = distance.KNNIndex(distance.Manhattan, x, algorithm="brute")
+        self.assert_neighbors(index, x, distance.Manhattan(), k=3)
+
+    def test_callback(self):
+        index = distance.KNNIndex(distance.Euclidean, self.iris,
+                                  algorithm="brute", block_size=1500)
+        progress = []
+        index.query(k=1, callback=progress.append)
+        self.assertEqual(len(progress), 15)
+        self.assertEqual(progress[-1], 100)
+
+    def test_errors(self):
+        iris, heart = self.iris, self.heart
+        self.assertRaises(ValueError, distance.KNNIndex,
+                          distance.Euclidean, iris, algorithm="kd_tree")
+        self.assertRaises(ValueError, distance.KNNIndex,
+                          distance.Euclidean(axis=0), iris)
+        index = distance.KNNIndex(distance.Euclidean, iris)
+        self.assertRaises(ValueError, index.query, k=0)
+        self.assertRaises(ValueError, index.query, k=len(iris))
+        self.assertRaises(ValueError, index.query, heart)
+        index.query(iris, k=len(iris))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 from importlib import import_module
 
-from .distmatrix import DistMatrix
+from .distmatrix import DistMatrix, CondensedDistMatrix
 
 
 def import_late_warning(name):
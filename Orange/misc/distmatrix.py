@@ -1,9 +1,155 @@
+import pickle
+
 import numpy as np
 
 from Orange.util import deprecated
 
+#: The extension of files in the binary format
+BINARY_EXTENSION = ".dstb"
+
+#: The number of elements written at once when saving in the binary format
+_BINARY_BLOCK_SIZE = 2 ** 22
+
+
+def _write_binary(filename, data, metadata):
+    """Write `data` as .npy file, followed by pickled `metadata`."""
+    fmt = np.lib.format
+    header = {"descr": fmt.dtype_to_descr(data.dtype),
+              "fortran_order": False,
+              "shape": data.shape}
+    row_size = int(np.prod(data.shape[1:]))
+    step = max(1, _BINARY_BLOCK_SIZE // max(row_size, 1))
+    with open(filename, "wb") as fle:
+        fmt.write_array_header_1_0(fle, header)
+        for start in range(0, len(data), step):
+            block = np.ascontiguousarray(data[start:start + step])
+            fle.write(block.tobytes())
+        pickle.dump(metadata, fle, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_binary(filename, mmap_mode):
+    """Read data written by `_write_binary`; map it if `mmap_mode` is set."""
+    fmt = np.lib.format
+    with open(filename, "rb") as fle:
+        version = fmt.read_magic(fle)
+        if version == (1, 0):
+            shape, fortran_order, dtype = fmt.read_array_header_1_0(fle)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = fmt.read_array_header_2_0(fle)
+        else:
+            raise ValueError("unsupported version of binary distance file")
+        if fortran_order:
+            raise ValueError("invalid binary distance file")
+        offset = fle.tell()
+        count = int(np.prod(shape))
+        if mmap_mode and count:
+            data = np.memmap(filename, dtype=dtype, mode=mmap_mode,
+                             offset=offset, shape=shape)
+        else:
+            data = np.fromfile(fle, dtype=dtype, count=count).reshape(shape)
+        fle.seek(offset + count * dtype.itemsize)
+        metadata = pickle.load(fle)
+    return data, metadata
+
+
+class _DistMatrixMixin:
+    """Labels and saving, common to dense and condensed distance matrices"""
+
+    @staticmethod
+    def _trivial_labels(items):
+        # prevent circular imports
+        from Orange.data import Table, StringVariable
+
+        return items and \
+               isinstance(items, Table) and \
+               len(items.domain.metas) == 1 and \
+               isinstance(items.domain.metas[0], StringVariable)
+
+    def has_row_labels(self):
+        """
+        Returns `True` if row labels can be automatically determined from data
+
+        For this, the `row_items` must be an instance of `Orange.data.Table`
+        whose domain contains a single meta attribute, which has to be a string.
+        The domain may contain other variables, but not meta attributes.
+        """
+        return self._trivial_labels(self.row_items)
+
+    def has_col_labels(self):
+        """
+        Returns `True` if column labels can be automatically determined from
+        data
+
+        For this, the `col_items` must be an instance of `Orange.data.Table`
+        whose domain contains a single meta attribute, which has to be a string.
+        The domain may contain other variables, but not meta attributes.
+        """
+        return self._trivial_labels(self.col_items)
 
-class DistMatrix(np.ndarray):
+    def save(self, filename):
+        """
+        Save the distance matrix to a file in the file format described at
+        :obj:`~Orange.misc.distmatrix.DistMatrix.from_file`.
+
+        Files with extension `.dstb` are saved in the binary format (see
+        :obj:`~Orange.misc.distmatrix.DistMatrix.save_binary`).
+
+        Args:
+            filename: file name
+        """
+        if filename.endswith(BINARY_EXTENSION):
+            self.save_binary(filename)
+            return
+
+        n = len(self)
+        data = "{}\taxis={}".format(n, self.axis)
+        row_labels = col_labels = None
+        if self.has_col_labels():
+            data += "\tcol_labels"
+            col_labels = self.col_items
+        if self.has_row_labels():
+            data += "\trow_labels"
+            row_labels = self.row_items
+        symmetric = self._is_symmetric()
+        if not symmetric:
+            data += "\tasymmetric"
+        with open(filename, "wt") as fle:
+            fle.write(data + "\n")
+            if col_labels is not None:
+                fle.write("\t".join(str(e.metas[0]) for e in col_labels) + "\n")
+            for i, row in enumerate(self):
+                if row_labels is not None:
+                    fle.write(str(row_labels[i].metas[0]) + "\t")
+                if symmetric:
+                    fle.write("\t".join(map(str, row[:i + 1])) + "\n")
+                else:
+                    fle.write("\t".join(map(str, row)) + "\n")
+
+    def save_binary(self, filename):
+        """
+        Save the distance matrix to a binary file.
+
+        The file starts with the matrix in `.npy` format, so it can be read
+        with `numpy.load` or mapped with `numpy.memmap`; condensed matrices
+        are stored as one-dimensional arrays. The matrix is followed by
+        pickled row and column items and the axis, so unlike in the text
+        format, items need not be labels. Since the file contains a pickle,
+        load only files from trusted sources.
+
+        Args:
+            filename: file name
+        """
+        condensed = isinstance(self, CondensedDistMatrix)
+        _write_binary(
+            filename,
+            self.flat if condensed else np.asarray(self),
+            {"condensed": condensed,
+             "row_items": self.row_items,
+             "col_items": None if condensed else self.col_items,
+             "axis": self.axis})
+
+
+class DistMatrix(_DistMatrixMixin, np.ndarray):
     """
     Distance matrix. Extends ``numpy.ndarray``.
 
@@ -83,6 +229,25 @@ class DistMatrix(np.ndarray):
     def flat(self):
         return self[np.triu_indices(self.shape[0], 1)]
 
+    def to_condensed(self, dtype=None):
+        """
+        Return the matrix as :obj:`CondensedDistMatrix`.
+
+        Only the upper triangle of the matrix is kept; the matrix is assumed
+        to be symmetric.
+
+        Args:
+            dtype: the type of stored distances (e.g. `np.float32`);
+                the type of this matrix by default
+        """
+        if self.ndim != 2 or self.shape[0] != self.shape[1]:
+            raise ValueError("only square matrices can be condensed")
+        return CondensedDistMatrix(
+            np.asarray(self.flat), self.row_items, self.axis, dtype)
+
+    def _is_symmetric(self):
+        return np.allclose(self, self.T)
+
     def submatrix(self, row_items, col_items=None):
         """
         Return a submatrix
@@ -104,11 +269,19 @@ class DistMatrix(np.ndarray):
         return obj
 
     @classmethod
-    def from_file(cls, filename):
+    def from_file(cls, filename, mmap_mode="r"):
         """
         Load distance matrix from a file
 
-        The file should be preferrably encoded in ascii/utf-8. White space at
+        Files in the binary format (see
+        :obj:`~Orange.misc.distmatrix.DistMatrix.save_binary`) are recognized
+        by their content and memory-mapped, unless `mmap_mode` is `None`.
+        The result is :obj:`CondensedDistMatrix` if a condensed matrix was
+        saved. Matrices mapped with the default mode `"r"` are read-only;
+        with `"c"` (copy-on-write), changes are kept in memory and not
+        written to the file.
+
+        Text files should be preferrably encoded in ascii/utf-8. White space at
         the beginning and end of lines is ignored.
 
         The first line of the file starts with the matrix dimension. It
@@ -137,11 +310,19 @@ class DistMatrix(np.ndarray):
 
         Args:
             filename: file name
+            mmap_mode: the mode for memory-mapping binary files
+                (see `numpy.memmap`); `None` reads the matrix into memory
         """
         # prevent circular imports
         from Orange.data import Table, StringVariable, Domain
         from Orange.data.io import detect_encoding
 
+        with open(filename, "rb") as fle:
+            binary = fle.read(len(np.lib.format.MAGIC_PREFIX)) \
+                     == np.lib.format.MAGIC_PREFIX
+        if binary:
+            return cls._from_binary_file(filename, mmap_mode)
+
         with open(filename, encoding=detect_encoding(filename)) as fle:
             line = fle.readline()
             if not line:
@@ -190,18 +371,24 @@ class DistMatrix(np.ndarray):
                     raise ValueError("too many columns in matrix row {}".
                                      format("'{}'".format(row_labels[i])
                                             if row_labels else i + 1))
-                for j, e in enumerate(line[:i + 1 if symmetric else n]):
-                    try:
-                        matrix[i, j] = float(e)
-                    except ValueError as exc:
-                        raise ValueError(
-                            "invalid element at row {}, column {}".format(
-                                "'{}'".format(row_labels[i])
-                                if row_labels else i + 1,
-                                "'{}'".format(col_labels[j])
-                                if col_labels else j + 1)) from exc
-                    if symmetric:
-                        matrix[j, i] = matrix[i, j]
+                line = line[:i + 1 if symmetric else n]
+                try:
+                    matrix[i, :len(line)] = np.array(line, dtype=float)
+                except ValueError:
+                    for j, e in enumerate(line):
+                        try:
+                            float(e)
+                        except ValueError as exc:
+                            raise ValueError(
+                                "invalid element at row {}, column {}".format(
+                                    "'{}'".format(row_labels[i])
+                                    if row_labels else i + 1,
+                                    "'{}'".format(col_labels[j])
+                                    if col_labels else j + 1)) from exc
+                    raise
+            if symmetric:
+                for i in range(n):
+                    matrix[i, i + 1:] = matrix[i + 1:, i]
         if col_labels:
             col_labels = Table.from_list(
                 Domain([], metas=[StringVariable("label")]),
@@ -212,65 +399,210 @@ class DistMatrix(np.ndarray):
                 [[item] for item in row_labels])
         return cls(matrix, row_labels, col_labels, axis)
 
-    @staticmethod
-    def _trivial_labels(items):
-        # prevent circular imports
-        from Orange.data import Table, StringVariable
+    @classmethod
+    def _from_binary_file(cls, filename, mmap_mode):
+        data, metadata = _read_binary(filename, mmap_mode)
+        if not isinstance(metadata, dict) or "axis" not in metadata:
+            raise ValueError("invalid binary distance file")
+        if metadata.get("condensed"):
+            return CondensedDistMatrix(
+                data, metadata["row_items"], metadata["axis"])
+        return cls(data, metadata["row_items"], metadata["col_items"],
+                   metadata["axis"])
+
+
+class CondensedDistMatrix(_DistMatrixMixin):
+    """
+    Symmetric distance matrix that stores only the distances above the
+    diagonal, as a one-dimensional array ordered like the condensed
+    matrices in :obj:`scipy.spatial.distance`.
 
-        return items and \
-               isinstance(items, Table) and \
-               len(items.domain.metas) == 1 and \
-               isinstance(items.domain.metas[0], StringVariable)
+    The matrix takes a half of the memory of :obj:`DistMatrix` (or a
+    quarter, if distances are stored as `np.float32`) and supports the same
+    indexing, so the code that only reads elements, rows or submatrices
+    works with both. Converting to `numpy.ndarray` (e.g. by `np.asarray`)
+    constructs a dense matrix.
 
-    def has_row_labels(self):
-        """
-        Returns `True` if row labels can be automatically determined from data
+    The matrix is not a `numpy.ndarray`, yet it can be sent wherever a
+    :obj:`DistMatrix` is expected. Code that needs arithmetic on matrices
+    or numpy methods (e.g. `diagonal`) must call :obj:`to_dense` first.
 
-        For this, the `row_items` must be an instance of `Orange.data.Table`
-        whose domain contains a single meta attribute, which has to be a string.
-        The domain may contain other variables, but not meta attributes.
-        """
-        return self._trivial_labels(self.row_items)
+    .. attribute:: row_items
 
-    def has_col_labels(self):
-        """
-        Returns `True` if column labels can be automatically determined from
-        data
+        Items corresponding to matrix rows (and columns).
 
-        For this, the `col_items` must be an instance of `Orange.data.Table`
-        whose domain contains a single meta attribute, which has to be a string.
-        The domain may contain other variables, but not meta attributes.
+    .. attribute:: axis
+
+        If axis=1 we calculate distances between rows,
+        if axis=0 we calculate distances between columns.
+    """
+    ndim = 2
+
+    def __init__(self, condensed, row_items=None, axis=1, dtype=None):
+        """Construct a matrix from the condensed distances.
+
+        :param condensed: distances above the diagonal, row by row
+        :type condensed: one-dimensional numpy array
+        :param row_items: Items in matrix rows (and columns)
+        :type row_items: `Orange.data.Table` or `Orange.data.Instance`
+        :param axis: The axis along which the distances are calculated
+        :type axis: int
+        :param dtype: The type of stored distances; the type of `condensed`
+            by default
         """
-        return self._trivial_labels(self.col_items)
+        condensed = np.asarray(condensed, dtype=dtype)
+        if condensed.ndim != 1:
+            raise ValueError("condensed distances must be one-dimensional")
+        n = int(round((1 + np.sqrt(1 + 8 * len(condensed))) / 2))
+        if n * (n - 1) // 2 != len(condensed):
+            raise ValueError("invalid number of condensed distances")
+        self._condensed = condensed
+        self._n = n
+        self.row_items = row_items
+        self.axis = axis
 
-    def save(self, filename):
+    @property
+    def col_items(self):
+        return self.row_items
+
+    @property
+    def shape(self):
+        return self._n, self._n
+
+    @property
+    def size(self):
+        return self._n ** 2
+
+    @property
+    def dtype(self):
+        return self._condensed.dtype
+
+    @property
+    def flat(self):
+        """Distances above the diagonal (without a copy)."""
+        return self._condensed
+
+    @property
+    def T(self):  # pylint: disable=invalid-name
+        return self
+
+    def __len__(self):
+        return self._n
+
+    def __repr__(self):
+        return "{}({}, shape={})".format(
+            type(self).__name__, self._condensed, self.shape)
+
+    def _is_symmetric(self):
+        return True
+
+    def _take(self, rows, cols):
+        rows, cols = np.broadcast_arrays(rows, cols)
+        i = np.minimum(rows, cols)
+        j = np.maximum(rows, cols)
+        diagonal = i == j
+        if not len(self._condensed):
+            return np.zeros(diagonal.shape, dtype=self.dtype)[()]
+        k = np.where(diagonal, 0, self._n * i - i * (i + 1) // 2 + j - i - 1)
+        return np.where(diagonal, self.dtype.type(0), self._condensed[k])[()]
+
+    def _row(self, i):
+        n = self._n
+        row = np.empty(n, dtype=self.dtype)
+        j = np.arange(i)
+        row[:i] = self._condensed[n * j - j * (j + 1) // 2 + i - j - 1]
+        row[i] = 0
+        start = n * i - i * (i + 1) // 2
+        row[i + 1:] = self._condensed[start:start + n - i - 1]
+        return row
+
+    def _indices(self, key):
+        if isinstance(key, slice):
+            return np.arange(self._n)[key]
+        key = np.asarray(key)
+        if key.dtype == bool:
+            if key.shape != (self._n, ):
+                raise IndexError("boolean index does not match the matrix")
+            return np.flatnonzero(key)
+        if key.dtype.kind not in "iu":
+            raise IndexError("only integers, slices and integer or boolean "
+                             "arrays are valid indices")
+        if np.any((key < -self._n) | (key >= self._n)):
+            raise IndexError("index out of bounds for matrix of size {}"
+                             .format(self._n))
+        return np.where(key < 0, key + self._n, key).astype(np.intp)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key, )
+        if len(key) > 2 or any(k is None or k is Ellipsis for k in key):
+            raise IndexError("invalid index for a distance matrix")
+        key += (slice(None), ) * (2 - len(key))
+        rows, cols = map(self._indices, key)
+        if isinstance(key[1], slice) and key[1] == slice(None) \
+                and rows.ndim <= 1:
+            if rows.ndim == 0:
+                return self._row(int(rows))
+            matrix = np.empty((len(rows), self._n), dtype=self.dtype)
+            for i, row in enumerate(rows):
+                matrix[i] = self._row(row)
+            return matrix
+        # Slices index outer products (as in numpy), while integers and
+        # arrays are broadcasted against each other
+        if isinstance(key[0], slice):
+            rows = rows.reshape(rows.shape + (1, ) * cols.ndim)
+        elif isinstance(key[1], slice):
+            rows = rows.reshape(rows.shape + (1, ))
+        return self._take(rows, cols)
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self._row(i)
+
+    def __array__(self, dtype=None):
+        # pylint: disable=import-outside-toplevel
+        from scipy.spatial.distance import squareform
+        matrix = squareform(self._condensed, checks=False)
+        return matrix if dtype is None else matrix.astype(dtype, copy=False)
+
+    def to_dense(self):
+        """Return the matrix as :obj:`DistMatrix`."""
+        return DistMatrix(np.asarray(self), self.row_items, self.row_items,
+                          self.axis)
+
+    def max(self):
+        return np.max(self._condensed, initial=0)
+
+    def min(self):
+        return np.min(self._condensed, initial=0)
+
+    def submatrix(self, row_items, col_items=None):
         """
-        Save the distance matrix to a file in the file format described at
-        :obj:`~Orange.misc.distmatrix.DistMatrix.from_file`.
+        Return a submatrix
+
+        The submatrix is condensed if columns are the same as rows, and
+        dense (:obj:`DistMatrix`) otherwise.
 
         Args:
-            filename: file name
+            row_items: indices of rows
+            col_items: incides of columns; the same as rows by default
         """
-        n = len(self)
-        data = "{}\taxis={}".format(n, self.axis)
-        row_labels = col_labels = None
-        if self.has_col_labels():
-            data += "\tcol_labels"
-            col_labels = self.col_items
-        if self.has_row_labels():
-            data += "\trow_labels"
-            row_labels = self.row_items
-        symmetric = np.allclose(self, self.T)
-        if not symmetric:
-            data += "\tasymmetric"
-        with open(filename, "wt") as fle:
-            fle.write(data + "\n")
-            if col_labels is not None:
-                fle.write("\t".join(str(e.metas[0]) for e in col_labels) + "\n")
-            for i, row in enumerate(self):
-                if row_labels is not None:
-                    fle.write(str(row_labels[i].metas[0]) + "\t")
-                if symmetric:
-                    fle.write("\t".join(map(str, row[:i + 1])) + "\n")
-                else:
-                    fle.write("\t".join(map(str, row)) + "\n")
+        rows = self._indices(row_items)
+        row_items_ = None if self.row_items is None \
+            else self.row_items[rows]
+        if col_items is not None and col_items is not row_items:
+            cols = self._indices(col_items)
+            return DistMatrix(
+                self[rows[:, None], cols[None, :]],
+                row_items_,
+                None if self.row_items is None else self.row_items[cols],
+                self.axis)
+
+        k = len(rows)
+        condensed = np.empty(k * (k - 1) // 2, dtype=self.dtype)
+        start = 0
+        for i in range(k - 1):
+            condensed[start:start + k - i - 1] = self._take(rows[i],
+                                                            rows[i + 1:])
+            start += k - i - 1
+        return CondensedDistMatrix(condensed, row_items_, self.axis)
@@ -9,7 +9,8 @@ How it works
 ------------
 
 The configuration is read from '{sys.prefix}/etc/orangerc.cfg'
-which is a standard `configparser` file.
+which is a standard `configparser` file. The file is read once; call
+:obj:`reload_config` after changing it.
 
 orangerc.cfg
 ------------
@@ -39,18 +40,34 @@ orangerc.cfg
     # The base dir where canvas stores its settings
     canvas_settings_dir = %(prefix)s/config/%(name)s/canvas
 
+    [compute]
+    # The number of threads used for computing derived variables when
+    # transforming data tables (the default, 1, disables parallel computation)
+    compute_value_workers = 1
+    # The number of threads used for computing distances
+    # (1 disables parallel computation; defaults to the number of CPUs,
+    # so this option is commented out)
+    # distance_workers = 4
+
+    [cache]
+    # The maximal size (in MB) of the cache of parsed data files
+    # (0 disables the cache)
+    file_cache_size = 4096
+
 """
 import os
 import sys
 import warnings
 import sysconfig
 import configparser
+from functools import lru_cache
 
 from typing import Optional
 
 import Orange
 
 
+@lru_cache(maxsize=None)
 def _get_parsed_config():
     version = Orange.__version__.split(".")
     data = sysconfig.get_path("data")
@@ -73,6 +90,13 @@ def _get_parsed_config():
     return conf
 
 
+def reload_config():
+    """
+    Discard the cached configuration, so it is read again on the next use.
+    """
+    _get_parsed_config.cache_clear()
+
+
 def get_path(name: str, default: Optional[str] = None) -> Optional[str]:
     """
     Get configured path
@@ -168,3 +192,65 @@ def cache_dir(*args):
     Return the platform dependent Orange cache directory.
     """
     return get_path("cache_dir", _default_cache_dir())
+
+
+def compute_value_workers() -> int:
+    """
+    Return the number of threads used by `Orange.data.Table.from_table` for
+    computing values of derived variables (1 means no parallel computation).
+
+    The number is taken from environment variable
+    ``ORANGE_COMPUTE_VALUE_WORKERS`` or from option ``compute_value_workers``
+    in section ``[compute]`` of the configuration file; it defaults to 1.
+    """
+    workers = os.getenv("ORANGE_COMPUTE_VALUE_WORKERS")
+    if workers is None:
+        cfg = _get_parsed_config()
+        workers = cfg.get("compute", "compute_value_workers", fallback="1")
+    try:
+        return max(int(workers), 1)
+    except ValueError:
+        warnings.warn(f"Invalid number of compute value workers: {workers}")
+        return 1
+
+
+def distance_workers() -> int:
+    """
+    Return the number of threads used for computing distances in
+    :obj:`Orange.distance` (1 means no parallel computation).
+
+    The number is taken from environment variable
+    ``ORANGE_DISTANCE_WORKERS`` or from option ``distance_workers``
+    in section ``[compute]`` of the configuration file; it defaults to
+    the number of CPUs.
+    """
+    workers = os.getenv("ORANGE_DISTANCE_WORKERS")
+    if workers is None:
+        cfg = _get_parsed_config()
+        workers = cfg.get("compute", "distance_workers",
+                          fallback=str(os.cpu_count() or 1))
+    try:
+        return max(int(workers), 1)
+    except ValueError:
+        warnings.warn(f"Invalid number of distance workers: {workers}")
+        return 1
+
+
+def file_cache_size() -> int:
+    """
+    Return the maximal size of the cache of parsed data files in megabytes
+    (0 means that files are not cached).
+
+    The size is taken from environment variable ``ORANGE_FILE_CACHE_SIZE``
+    or from option ``file_cache_size`` in section ``[cache]`` of the
+    configuration file; it defaults to 4096.
+    """
+    size = os.getenv("ORANGE_FILE_CACHE_SIZE")
+    if size is None:
+        cfg = _get_parsed_config()
+        size = cfg.get("cache", "file_cache_size", fallback="4096")
+    try:
+        return max(int(size), 0)
+    except ValueError:
+        warnings.warn(f"Invalid size of file cache: {size}")
+        return 0
@@ -101,6 +101,8 @@ class BinSql:
 
 
 class SingleValueSql:
+    values_as_strings = True
+
     def __init__(self, value):
         self.value = value
 
@@ -130,9 +132,15 @@ class EqualFreq(Discretization):
 
         Number of bins (default: 4). The actual number may be lower if the
         variable has less than n distinct values.
+
+    .. attribute:: approximate
+
+        If `True`, cut points are approximate quantiles computed by a
+        quantile sketch, which avoids sorting the column (default: `False`).
     """
-    def __init__(self, n=4):
+    def __init__(self, n=4, approximate=False):
         self.n = n
+        self.approximate = approximate
 
     # noinspection PyProtectedMember
     def __call__(self, data, attribute):
@@ -144,6 +152,14 @@ class EqualFreq(Discretization):
                 use_time_sample=1000)
             with data._execute_sql_query(query) as cur:
                 points = sorted(set(cur.fetchone()[0]))
+        elif self.approximate:
+            quantiles = [(i + 1) / self.n for i in range(self.n - 1)]
+            sketch = data._compute_accumulators([attribute])[0].sketch
+            # Values equal to a point fall into the upper interval, so points
+            # at the minimum would give empty intervals
+            points = sorted(set(point
+                                for point in sketch.quantile(quantiles)
+                                if point > sketch.min))
         else:
             d = distribution.get_distribution(data, attribute)
             points = _discretize.split_eq_freq(d, self.n)
@@ -4,7 +4,7 @@ import scipy.sparse as sp
 import Orange.data
 from Orange.statistics import distribution, basic_stats
 from Orange.util import Reprable
-from .transformation import Transformation, Lookup
+from .transformation import Transformation, Lookup, sql_numeric, sql_number
 
 __all__ = ["ReplaceUnknowns", "Average", "DoNotImpute", "DropInstances",
            "Model", "AsValue", "Random", "Default"]
@@ -32,6 +32,10 @@ class ReplaceUnknowns(Transformation):
         else:
             return np.where(np.isnan(c), self.value, c)
 
+    def to_sql(self):
+        return "coalesce({}, {})".format(
+            sql_numeric(self.variable), sql_number(self.value))
+
     def __eq__(self, other):
         return super().__eq__(other) and self.value == other.value
 
@@ -120,7 +124,8 @@ class ImputeSql(Reprable):
         self.default = default
 
     def __call__(self):
-        return 'coalesce(%s, %s)' % (self.var.to_sql(), str(self.default))
+        return 'coalesce(%s, %s)' % (sql_numeric(self.var),
+                                     sql_number(self.default))
 
 
 class Default(BaseImputeMethod):
@@ -234,6 +239,10 @@ class IsDefined(Transformation):
             c = c.toarray()
         return ~np.isnan(c)
 
+    def to_sql(self):
+        return "CASE WHEN {} IS NULL THEN 0 ELSE 1 END".format(
+            self.variable.to_sql())
+
 
 class AsValue(BaseImputeMethod):
     name = "As a distinct value"
@@ -565,9 +565,10 @@ class PreprocessorList(Preprocess):
         ----------
         data : an input data table
         """
-
-        for pp in self.preprocessors:
-            data = pp(data)
+        # intermediate tables are computed only if preprocessors need them
+        with Orange.data.lazy_transforms():
+            for pp in self.preprocessors:
+                data = pp(data)
         return data
 
 class RemoveSparse(Preprocess):
@@ -218,12 +218,10 @@ class ClassificationScorer(Scorer):
         instances_with_class = \
             np.sum(distribution.Discrete(data, data.domain.class_var))
 
-        def score_from_contingency(f):
-            cont = contingency.Discrete(data, f)
-            return self.from_contingency(
-                cont, 1. - np.sum(cont.unknowns)/instances_with_class)
-
-        scores = [score_from_contingency(f) for f in data.domain.attributes]
+        # contingencies of all features are computed in a single pass
+        scores = [self.from_contingency(
+            cont, 1. - np.sum(cont.unknowns)/instances_with_class)
+                  for cont in contingency.get_contingencies(data)]
         if feature is not None:
             return scores[0]
         return scores
@@ -5,6 +5,31 @@ from Orange.data import Instance, Table, Domain
 from Orange.util import Reprable
 
 
+def sql_number(value):
+    """Return an SQL literal for a number; non-finite numbers are NULL."""
+    value = float(value)
+    return repr(value) if np.isfinite(value) else "NULL"
+
+
+def sql_numeric(variable):
+    """
+    Return an SQL expression that gives the values of a primitive variable
+    as numbers.
+
+    Expressions of discrete variables that are marked with
+    `values_as_strings` (e.g. columns of database tables) give values as
+    strings, which are mapped to their indices; other expressions of discrete
+    variables already give indices.
+    """
+    sql = variable.to_sql()
+    if variable.is_discrete \
+            and getattr(variable.to_sql, "values_as_strings", False):
+        cases = " ".join("WHEN '{}' THEN {}".format(value.replace("'", "''"), i)
+                         for i, value in enumerate(variable.values))
+        sql = "CASE {} {} END".format(sql, cases)
+    return sql
+
+
 class Transformation(Reprable):
     """
     Base class for simple transformations of individual variables. Derived
@@ -25,13 +50,10 @@ class Transformation(Reprable):
         inst = isinstance(data, Instance)
         if inst:
             data = Table.from_list(data.domain, [data])
+        data = Table.from_table(self._target_domain(), data)
         if self.variable.is_primitive():
-            domain = Domain([self.variable])
-            data = Table.from_table(domain, data)
             col = data.X
         else:
-            domain = Domain([], metas=[self.variable])
-            data = Table.from_table(domain, data)
             col = data.metas
         if not sp.issparse(col):
             col = col.squeeze(axis=1)
@@ -40,6 +62,19 @@ class Transformation(Reprable):
             transformed = transformed[0]
         return transformed
 
+    def _target_domain(self):
+        # The domain is kept, so that domain conversions from the data's
+        # domain are cached and reused across calls
+        domain = self.__dict__.get("_domain")
+        if domain is None \
+                or (domain.variables or domain.metas)[0] is not self.variable:
+            if self.variable.is_primitive():
+                domain = Domain([self.variable])
+            else:
+                domain = Domain([], metas=[self.variable])
+            self._domain = domain  # pylint: disable=attribute-defined-outside-init
+        return domain
+
     def transform(self, c):
         """
         Return the transformed value of the argument `c`, which can be a number
@@ -48,6 +83,11 @@ class Transformation(Reprable):
         raise NotImplementedError(
             "ColumnTransformations must implement method 'transform'.")
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_domain", None)
+        return state
+
     def __eq__(self, other):
         return type(other) is type(self) and self.variable == other.variable
 
@@ -61,6 +101,11 @@ class Identity(Transformation):
     def transform(self, c):
         return c
 
+    def to_sql(self):
+        if self.variable.is_discrete:
+            return sql_numeric(self.variable)
+        return self.variable.to_sql()
+
 
 class _Indicator(Transformation):
     def __init__(self, variable, value):
@@ -89,6 +134,10 @@ class Indicator(_Indicator):
     def transform(self, c):
         return c == self.value
 
+    def to_sql(self):
+        return "CASE WHEN {} = {} THEN 1 ELSE 0 END".format(
+            sql_numeric(self.variable), sql_number(self.value))
+
 
 class Indicator1(_Indicator):
     """
@@ -98,6 +147,10 @@ class Indicator1(_Indicator):
     def transform(self, c):
         return (c == self.value) * 2 - 1
 
+    def to_sql(self):
+        return "CASE WHEN {} = {} THEN 1 ELSE -1 END".format(
+            sql_numeric(self.variable), sql_number(self.value))
+
 
 class Normalizer(Transformation):
     """
@@ -126,6 +179,11 @@ class Normalizer(Transformation):
         else:
             return (c - self.offset) * self.factor
 
+    def to_sql(self):
+        return "(({}) - {}) * {}".format(
+            sql_numeric(self.variable),
+            sql_number(self.offset), sql_number(self.factor))
+
     def __eq__(self, other):
         return super().__eq__(other) \
                and self.offset == other.offset and self.factor == other.factor
@@ -161,6 +219,12 @@ class Lookup(Transformation):
         values = self.lookup_table[column]
         return np.where(mask, self.unknown, values)
 
+    def to_sql(self):
+        cases = " ".join("WHEN {} THEN {}".format(i, sql_number(value))
+                         for i, value in enumerate(self.lookup_table))
+        return "CASE {} {} ELSE {} END".format(
+            sql_numeric(self.variable), cases, sql_number(self.unknown))
+
     def __eq__(self, other):
         return super().__eq__(other) \
                and np.allclose(self.lookup_table, other.lookup_table,
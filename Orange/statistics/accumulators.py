@@ -0,0 +1,411 @@
+"""
+Mergeable accumulators of statistics.
+
+Accumulators are updated with chunks of data, one at a time, and accumulators
+of different parts of data can be merged. Statistics of data that does not
+fit into memory can thus be computed with bounded memory, and chunks can be
+processed in parallel.
+"""
+import numpy as np
+
+from Orange.statistics.util import bincount
+
+
+def _non_nan(x, weights):
+    x = np.asarray(x, dtype=float).ravel()
+    defined = ~np.isnan(x)
+    if weights is None:
+        return x[defined], None, x.size - len(x[defined])
+    weights = np.asarray(weights, dtype=float).ravel()
+    return x[defined], weights[defined], x.size - np.count_nonzero(defined)
+
+
+class Moments:
+    """
+    Count of defined and missing values, minimum, maximum, and weighted
+    mean and variance.
+
+    The mean and variance are updated with the parallel variant of Welford's
+    algorithm (Chan et al.), which is numerically stable and allows merging.
+
+    Attributes:
+        non_nans (int): the number of defined values
+        nans (int): the number of missing values
+        min (float): minimal value (inf if there are no values)
+        max (float): maximal value (-inf if there are no values)
+        weight (float): the sum of weights of defined values
+        mean (float): weighted mean
+        m2 (float): weighted sum of squared differences from the mean
+    """
+    def __init__(self):
+        self.non_nans = self.nans = 0
+        self.min, self.max = float("inf"), float("-inf")
+        self.weight = self.mean = self.m2 = 0.
+
+    @property
+    def var(self):
+        """Weighted (population) variance"""
+        return self.m2 / self.weight if self.weight else 0.
+
+    def update(self, x, weights=None):
+        """
+        Add values `x` with optional weights.
+
+        Returns:
+            self
+        """
+        x, weights, nans = _non_nan(x, weights)
+        self.nans += nans
+        if not x.size:
+            return self
+        chunk = Moments()
+        chunk.non_nans = x.size
+        chunk.min, chunk.max = np.min(x), np.max(x)
+        if weights is None:
+            chunk.weight = float(x.size)
+            chunk.mean = np.mean(x)
+            chunk.m2 = np.sum((x - chunk.mean) ** 2)
+        else:
+            chunk.weight = np.sum(weights)
+            if chunk.weight:
+                chunk.mean = np.dot(weights, x) / chunk.weight
+                chunk.m2 = np.dot(weights, (x - chunk.mean) ** 2)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Add statistics of another accumulator.
+
+        Returns:
+            self
+        """
+        self.nans += other.nans
+        self.non_nans += other.non_nans
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        weight = self.weight + other.weight
+        if weight:
+            delta = other.mean - self.mean
+            self.mean += delta * other.weight / weight
+            self.m2 += other.m2 + delta ** 2 * self.weight * other.weight / weight
+        self.weight = weight
+        return self
+
+
+class ValueCounts:
+    """
+    Weighted counts of values 0, 1, ..., `n_values` - 1 of a discrete column.
+
+    Attributes:
+        counts (np.ndarray): weighted counts of values
+        nans (float): weighted count of missing values
+    """
+    def __init__(self, n_values):
+        self.counts = np.zeros(n_values)
+        self.nans = 0.
+
+    def update(self, x, weights=None):
+        """
+        Add values `x` with optional weights.
+
+        Returns:
+            self
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float).ravel()
+        counts, nans = bincount(x, weights, max_val=len(self.counts) - 1)
+        self._add(counts, nans)
+        return self
+
+    def merge(self, other):
+        """
+        Add counts of another accumulator.
+
+        Returns:
+            self
+        """
+        self._add(other.counts, other.nans)
+        return self
+
+    def _add(self, counts, nans):
+        if len(counts) > len(self.counts):
+            self.counts = np.hstack(
+                (self.counts, np.zeros(len(counts) - len(self.counts))))
+        self.counts[:len(counts)] += counts
+        self.nans += nans
+
+
+class QuantileSketch:
+    """
+    A mergeable sketch for approximate (weighted) quantiles.
+
+    The sketch keeps weighted values in levels of at most `size` values.
+    When a level overflows, its values are compacted in blocks of `size`
+    values: values in a block are sorted and paired, and one value from each
+    pair is randomly chosen (with probability proportional to its weight) to
+    represent both at the next level.
+
+    Compacting a block changes the rank of any value by at most the largest
+    weight in the block, since only a single pair can straddle the value.
+    The sum of these bounds is kept in `rank_error`: the true rank of
+    a quantile returned by the sketch (the weight of data below it) differs
+    from the requested one by at most `rank_error`. For n unweighted values,
+    the relative error is below (log2(n / size) + 1) / size, and is usually
+    much smaller.
+
+    Attributes:
+        size (int): the maximal number of values in a level
+        weight (float): the sum of weights of added values
+        rank_error (float): a bound on the error of ranks
+        min (float): minimal value
+        max (float): maximal value
+    """
+    def __init__(self, size=2000, random_state=None):
+        self.size = size
+        self.weight = self.rank_error = 0.
+        self.min, self.max = float("inf"), float("-inf")
+        self.levels = []
+        if isinstance(random_state, np.random.RandomState):
+            self._random = random_state
+        else:
+            self._random = np.random.RandomState(random_state)
+
+    @property
+    def relative_error(self):
+        """A bound on the error of ranks, relative to the total weight"""
+        return self.rank_error / self.weight if self.weight else 0.
+
+    def update(self, x, weights=None):
+        """
+        Add values `x` with optional weights. Missing values are ignored.
+
+        Returns:
+            self
+        """
+        x, weights, _ = _non_nan(x, weights)
+        if weights is None:
+            weights = np.ones(x.size)
+        else:
+            x, weights = x[weights > 0], weights[weights > 0]
+        if not x.size:
+            return self
+        self.weight += np.sum(weights)
+        self.min = min(self.min, np.min(x))
+        self.max = max(self.max, np.max(x))
+        self._add(0, x, weights)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Add values from another sketch.
+
+        Returns:
+            self
+        """
+        self.weight += other.weight
+        self.rank_error += other.rank_error
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for level, (values, weights) in enumerate(other.levels):
+            self._add(level, values, weights)
+        self._compress()
+        return self
+
+    def _add(self, level, values, weights):
+        while len(self.levels) <= level:
+            self.levels.append((np.empty(0), np.empty(0)))
+        old_values, old_weights = self.levels[level]
+        self.levels[level] = (np.hstack((old_values, values)),
+                              np.hstack((old_weights, weights)))
+
+    def _compress(self):
+        # Overflowing levels are compacted in blocks of `size` values, which
+        # are sorted much faster than a long level
+        block = max(self.size // 2 * 2, 2)
+        level = 0
+        while level < len(self.levels):
+            values, weights = self.levels[level]
+            if len(values) > self.size:
+                n_blocks = len(values) // block
+                n_compacted = n_blocks * block
+                self.levels[level] = \
+                    (values[n_compacted:], weights[n_compacted:])
+                values = values[:n_compacted].reshape(n_blocks, block)
+                weights = weights[:n_compacted].reshape(n_blocks, block)
+                if np.all(weights == weights[0, 0]):
+                    values = np.sort(values, axis=1, kind="mergesort")
+                else:
+                    order = np.argsort(values, axis=1, kind="mergesort")
+                    values = np.take_along_axis(values, order, axis=1)
+                    weights = np.take_along_axis(weights, order, axis=1)
+                # A single pair in each block can straddle any value
+                self.rank_error += np.sum(np.max(weights, axis=1))
+                values = values.reshape(-1, 2)
+                weights = weights.reshape(-1, 2)
+                pair_weights = weights.sum(axis=1)
+                first = self._random.random_sample(len(pair_weights)) \
+                    * pair_weights < weights[:, 0]
+                self._add(level + 1,
+                          np.where(first, values[:, 0], values[:, 1]),
+                          pair_weights)
+            level += 1
+
+    def quantile(self, q):
+        """
+        Return approximate quantiles.
+
+        Values between the kept values are interpolated linearly; for
+        unweighted data with no more than `size` values, the result equals
+        that of `np.quantile`.
+
+        Args:
+            q (float or array_like): quantiles, between 0 and 1
+
+        Returns:
+            float or np.ndarray: quantiles (nan if the sketch is empty)
+        """
+        q = np.asarray(q, dtype=float)
+        if not self.levels:
+            return np.full(q.shape, np.nan)[()]
+        values = np.hstack([values for values, _ in self.levels])
+        weights = np.hstack([weights for _, weights in self.levels])
+        order = np.argsort(values, kind="mergesort")
+        values, weights = values[order], weights[order]
+        # Positions of values go from 0 for the first to 1 for the last,
+        # which generalizes linear interpolation in np.quantile to weights
+        below = np.cumsum(weights) - weights
+        if below[-1] == 0:
+            return np.full(q.shape, values[-1])[()]
+        quantiles = np.interp(q, below / below[-1], values)
+        quantiles = np.where(q <= 0, self.min,
+                             np.where(q >= 1, self.max, quantiles))
+        return quantiles[()]
+
+
+def approx_quantiles(x, q, axis=None, size=2000, chunk_size=100000,
+                     random_state=0):
+    """
+    Return approximate quantiles of `x`, ignoring missing values.
+
+    Quantiles are computed with a :obj:`QuantileSketch` that is fed chunks of
+    at most `chunk_size` values, so no sorted copies of entire columns are
+    made. The rank of a returned quantile differs from the requested one by
+    at most `(log2(n / size) + 1) / size` of the n defined values.
+
+    Args:
+        x (np.ndarray): one- or two-dimensional data
+        q (float or array_like): quantiles, between 0 and 1
+        axis (int or None): the axis along which quantiles are computed;
+            None computes quantiles of all values
+        size (int): the size of the sketch
+        chunk_size (int): the maximal number of values in a chunk
+        random_state (int or None): the seed for the sketch; the default
+            fixed seed gives the same results on each call
+
+    Returns:
+        float or np.ndarray: quantiles with the shape of `q` (for `axis=None`)
+            or with an additional dimension for columns, like `np.nanquantile`
+    """
+    x = np.asarray(x, dtype=float)
+    if axis is None or x.ndim == 1 and axis == 0:
+        axis = None
+        x = x.reshape(-1, 1)
+    elif axis == 1:
+        x = x.T
+    elif axis != 0 or x.ndim != 2:
+        raise ValueError("axis must be None, or 0 or 1 for two-dimensional "
+                         "data")
+    random = np.random.RandomState(random_state)
+    quantiles = []
+    for column in x.T:
+        sketch = QuantileSketch(size, random)
+        for start in range(0, len(column), chunk_size):
+            sketch.update(column[start:start + chunk_size])
+        quantiles.append(sketch.quantile(q))
+    if axis is None:
+        return quantiles[0]
+    return np.stack(quantiles, axis=-1)
+
+
+class ColumnStats:
+    """
+    Statistics of a column of data for the given variable: moments
+    (:obj:`Moments`), and counts of values (:obj:`ValueCounts`) for discrete
+    or a quantile sketch (:obj:`QuantileSketch`) for continuous variables.
+
+    For variables that are not primitive, only the missing (empty) values
+    are counted. The quantile sketch is omitted if `sketch_size` is None;
+    with the default fixed `random_state`, it is reproducible.
+
+    Attributes:
+        variable (Orange.data.Variable): the variable
+        moments (Moments): counts, min, max, mean and variance
+        counts (ValueCounts or None): value counts of discrete variable
+        sketch (QuantileSketch or None): quantiles of continuous variable
+    """
+    def __init__(self, variable, sketch_size=2000, random_state=0):
+        self.variable = variable
+        self.moments = Moments()
+        self.counts = ValueCounts(len(variable.values)) \
+            if variable.is_discrete else None
+        self.sketch = QuantileSketch(sketch_size, random_state) \
+            if variable.is_continuous and sketch_size else None
+
+    def update(self, x, weights=None):
+        """
+        Add a chunk of values `x` with optional weights.
+
+        Returns:
+            self
+        """
+        if not self.variable.is_primitive():
+            x = np.asarray(x, dtype=object)
+            missing = np.count_nonzero(
+                [value is None or value == "" or value != value
+                 for value in x])
+            self.moments.nans += missing
+            self.moments.non_nans += len(x) - missing
+            return self
+
+        x = np.asarray(x, dtype=float)
+        self.moments.update(x, weights)
+        if self.counts is not None:
+            self.counts.update(x, weights)
+        if self.sketch is not None:
+            self.sketch.update(x, weights)
+        return self
+
+    def merge(self, other):
+        """
+        Add statistics of another accumulator for the same variable.
+
+        Returns:
+            self
+        """
+        self.moments.merge(other.moments)
+        if self.counts is not None:
+            self.counts.merge(other.counts)
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+        return self
+
+    def basic_stats(self):
+        """
+        Return a tuple (min, max, mean, variance, #nans, #non-nans), like
+        `Orange.data.Storage._compute_basic_stats`.
+        """
+        moments = self.moments
+        return (moments.min, moments.max, moments.mean, moments.var,
+                moments.nans, moments.non_nans)
+
+    def distribution(self):
+        """
+        Return a tuple with counts of values and the count of missing values
+        of a discrete variable, like `Orange.data.Storage._compute_distributions`.
+        """
+        if self.counts is None:
+            raise TypeError("distribution can be computed only for "
+                            "discrete variables")
+        return self.counts.counts.copy(), self.counts.nans
@@ -34,10 +34,25 @@ class BasicStats:
             = stats[0]
 
 class DomainBasicStats:
-    def __init__(self, data, include_metas=False):
+    """
+    Basic statistics of all variables (and, optionally, metas) of the data.
+
+    If `chunk_size` is given, statistics are computed from chunks of rows of
+    the given size with mergeable accumulators; memory use is then bounded
+    and variances are computed as well.
+    """
+    def __init__(self, data, include_metas=False, chunk_size=None):
         self.domain = data.domain
-        self.stats = [BasicStats(s) for s in
-                      data._compute_basic_stats(include_metas=include_metas)]
+        if chunk_size is None:
+            stats = data._compute_basic_stats(include_metas=include_metas)
+        else:
+            columns = self.domain.variables
+            if include_metas:
+                columns += self.domain.metas
+            stats = [acc.basic_stats() for acc in
+                     data._compute_accumulators(
+                         columns, chunk_size, sketch_size=None)]
+        self.stats = [BasicStats(s) for s in stats]
 
     def __getitem__(self, index):
         """
@@ -14,6 +14,8 @@ from scipy import sparse as sp
 
 from sklearn.utils.sparsefuncs import mean_variance_axis
 
+from Orange.data import _contingency
+
 
 def _eliminate_zeros(x):
     """Eliminate zeros from sparse matrix, or raise appropriate warning."""
@@ -271,36 +273,59 @@ def contingency(X, y, max_X=None, max_y=None, weights=None, mask=None):
         X = X[..., np.newaxis]
         was_1d = True
 
-    contingencies, nans_cols, nans_rows, nans = [], [], [], []
+    n_cols = X.shape[1]
+    columns = np.flatnonzero(np.ones(n_cols) if mask is None else mask)
+    y = np.asarray(y, dtype=np.float64)
     ny = np.unique(y).size if max_y is None else max_y + 1
-    for i in range(X.shape[1]):
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+
+    # All columns are computed in a single pass; nans in y and weights are
+    # processed once for all of them
+    if sp.issparse(X):
+        X = sp.csc_matrix(X)
+        if max_X is None:
+            nxs = []
+            for i in columns:
+                col = X.data[X.indptr[i]:X.indptr[i + 1]]
+                col = col[~np.isnan(col)]
+                if X.indptr[i + 1] - X.indptr[i] < X.shape[0]:
+                    col = np.hstack((col, [0]))
+                nxs.append(np.unique(col).size)
+        else:
+            nxs = [max_X + 1] * len(columns)
+        conts, nans_cols_, nans_rows_, nans_ = _contingency.contingency_csc(
+            X.data.astype(np.float64, copy=False),
+            X.indices.astype(np.intp, copy=False),
+            X.indptr.astype(np.intp, copy=False),
+            y, columns, max(nxs, default=0), ny, weights)
+    else:
+        if X.dtype != np.float64:
+            X = X[:, columns].astype(np.float64)
+            columns = np.arange(len(columns))
+        if max_X is None:
+            nxs = [np.unique(col[~np.isnan(col)]).size
+                   for col in X[:, columns].T]
+        else:
+            nxs = [max_X + 1] * len(columns)
+        conts, nans_cols_, nans_rows_, nans_ = _contingency.contingency_dense(
+            X, y, columns, max(nxs, default=0), ny, weights)
+
+    contingencies, nans_cols, nans_rows, nans = [], [], [], []
+    used = 0
+    for i in range(n_cols):
         if mask is not None and not mask[i]:
             contingencies.append(np.zeros((ny, max_X + 1)))
             nans_cols.append(np.zeros(ny))
             nans_rows.append(None)
             nans.append(0)
             continue
-        col = X[..., i]
-        nx = np.unique(col[~np.isnan(col)]).size if max_X is None else max_X + 1
-        if sp.issparse(col):
-            col = np.ravel(col.todense())
-        contingencies.append(
-            bincount(y + ny * col,
-                     minlength=ny * nx,
-                     weights=weights)[0].reshape(nx, ny).T)
-
-        nan_col_mask = np.isnan(col)
-        nan_row_mask = np.isnan(y)
-        nan_mask = nan_col_mask & nan_row_mask
-        weights_ = np.ones(len(y)) if weights is None else weights
-
-        nans_cols.append(
-            bincount(y[nan_col_mask], weights=weights_[nan_col_mask],
-                     minlength=ny)[0])
-        nans_rows.append(
-            bincount(col[nan_row_mask], weights=weights_[nan_row_mask],
-                     minlength=nx)[0])
-        nans.append(np.sum(nan_mask * weights_))
+        nx = nxs[used]
+        contingencies.append(conts[used, :, :nx])
+        nans_cols.append(nans_cols_[used])
+        nans_rows.append(nans_rows_[used, :nx])
+        nans.append(nans_[used])
+        used += 1
     if was_1d:
         return contingencies[0], nans_cols[0], nans_rows[0], nans[0]
     return np.array(contingencies), np.array(nans_cols), nans_rows, nans
@@ -1,5 +1,7 @@
+import atexit
 import os
 import string
+import tempfile
 import unittest
 from urllib import parse
 import random
@@ -308,9 +310,75 @@ class MicrosoftTestConnection(DBTestConnection):
         return PymssqlBackend(self.params)
 
 
+class SqliteTestConnection(DBTestConnection):
+    uri_name = "sqlite"
+    module = "sqlite3"
+
+    def try_connection(self):
+        import sqlite3
+        self.is_module = True
+        if not self._params.get("database"):
+            fd, self._params["database"] = tempfile.mkstemp(suffix=".sqlite")
+            os.close(fd)
+            atexit.register(os.remove, self._params["database"])
+        try:
+            with sqlite3.connect(self.params["database"]) as conn:
+                conn.execute("SELECT COUNT(*) FROM sqlite_master")
+                self.is_active = True
+        except:
+            pass
+
+    def create_sql_table(self, data, sql_column_types=None,
+                         sql_column_names=None, table_name=None):
+        data = list(data)
+
+        if table_name is None:
+            table_name = ''.join(random.choices(string.ascii_lowercase, k=16))
+
+        if sql_column_types is None:
+            column_size = self._get_column_types(data)
+            sql_column_types = [
+                'float' if size == 0 else 'varchar({})'.format(size)
+                for size in column_size
+            ]
+
+        if sql_column_names is None:
+            sql_column_names = ["col{}".format(i)
+                                for i in range(len(sql_column_types))]
+        else:
+            sql_column_names = map(lambda x: '"{}"'.format(x), sql_column_names)
+
+        create_table_sql = "CREATE TABLE {} ({})".format(
+            table_name,
+            ", ".join('{} {}'.format(n, t)
+                      for n, t in zip(sql_column_names, sql_column_types)))
+        insert_sql = "INSERT INTO {} VALUES ({})".format(
+            table_name, ", ".join("?" * len(sql_column_types)))
+
+        import sqlite3
+        with sqlite3.connect(self.params["database"]) as conn:
+            conn.execute("DROP TABLE IF EXISTS {}".format(table_name))
+            conn.execute(create_table_sql)
+            conn.executemany(insert_sql, [
+                [None if v is None else v if isinstance(v, str) else float(v)
+                 for v in row] for row in data])
+
+        return self.params, table_name
+
+    def drop_sql_table(self, table_name):
+        import sqlite3
+        with sqlite3.connect(self.params["database"]) as conn:
+            conn.execute("DROP TABLE {}".format(table_name))
+
+    def get_backend(self):
+        from Orange.data.sql.backend import SqliteBackend
+        return SqliteBackend(self.params)
+
+
 test_connections = {
     PostgresTestConnection.uri_name: PostgresTestConnection,
-    MicrosoftTestConnection.uri_name: MicrosoftTestConnection
+    MicrosoftTestConnection.uri_name: MicrosoftTestConnection,
+    SqliteTestConnection.uri_name: SqliteTestConnection
 }
 
 
@@ -322,6 +390,9 @@ def dbs():
     for c in params:
         if c and c in test_connections:
             db_conn[c] = test_connections[c](params[c])
+    if SqliteTestConnection.uri_name not in db_conn:
+        # SQLite needs no server; tests use a temporary database file
+        db_conn[SqliteTestConnection.uri_name] = SqliteTestConnection({})
 
     return db_conn
 
@@ -22,7 +22,7 @@ class TestIsDefinedSql(unittest.TestCase, dbt):
     def tearDownDB(self):
         self.drop_sql_table(self.table_name)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_all_columns(self):
         filtered_data = filter.IsDefined()(self.table)
         correct_data = [row for row in self.data if all(row)]
@@ -30,7 +30,7 @@ class TestIsDefinedSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_selected_columns(self):
         filtered_data = filter.IsDefined(columns=[0])(self.table)
         correct_data = [row for row in self.data if row[0]]
@@ -38,7 +38,7 @@ class TestIsDefinedSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_all_columns_negated(self):
         filtered_data = filter.IsDefined(negate=True)(self.table)
         correct_data = [row for row in self.data if not all(row)]
@@ -46,7 +46,7 @@ class TestIsDefinedSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_selected_columns_negated(self):
         filtered_data = \
             filter.IsDefined(negate=True, columns=[4])(self.table)
@@ -55,7 +55,7 @@ class TestIsDefinedSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_can_inherit_is_defined_filter(self):
         filtered_data = filter.IsDefined(columns=[1])(self.table)
         filtered_data = filtered_data[:, 4]
@@ -83,7 +83,7 @@ class TestHasClass(unittest.TestCase, dbt):
     def tearDownDB(self):
         self.drop_sql_table(self.table_name)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_has_class(self):
         filtered_data = filter.HasClass()(self.table)
         correct_data = [row for row in self.data if row[-1]]
@@ -91,7 +91,7 @@ class TestHasClass(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_negated(self):
         filtered_data = filter.HasClass(negate=True)(self.table)
         correct_data = [row for row in self.data if not row[-1]]
@@ -114,7 +114,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
     def tearDownDB(self):
         self.drop_sql_table(self.table_name)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_continuous_attribute(self):
         filtered_data = filter.SameValue(0, 1)(self.table)
         correct_data = [row for row in self.data if row[0] == 1]
@@ -122,7 +122,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_continuous_attribute_with_unknowns(self):
         filtered_data = filter.SameValue(1, 2)(self.table)
         correct_data = [row for row in self.data if row[1] == 2]
@@ -130,7 +130,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_continuous_attribute_with_unknown_value(self):
         filtered_data = filter.SameValue(1, None)(self.table)
         correct_data = [row for row in self.data if row[1] is None]
@@ -138,7 +138,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_on_continuous_attribute_negated(self):
         filtered_data = filter.SameValue(0, 1, negate=True)(self.table)
         correct_data = [row for row in self.data if not row[0] == 1]
@@ -146,7 +146,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_discrete_attribute(self):
         filtered_data = filter.SameValue(3, 'a')(self.table)
         correct_data = [row for row in self.data if row[3] == 'a']
@@ -154,7 +154,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_discrete_attribute_with_unknown_value(self):
         filtered_data = filter.SameValue(4, None)(self.table)
         correct_data = [row for row in self.data if row[4] is None]
@@ -162,7 +162,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_discrete_attribute_with_unknowns(self):
         filtered_data = filter.SameValue(4, 'm')(self.table)
         correct_data = [row for row in self.data if row[4] == 'm']
@@ -170,7 +170,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_discrete_attribute_negated(self):
         filtered_data = filter.SameValue(3, 'a', negate=True)(self.table)
         correct_data = [row for row in self.data if not row[3] == 'a']
@@ -178,7 +178,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_discrete_attribute_value_passed_as_int(self):
         values = self.table.domain[3].values
         filtered_data = filter.SameValue(3, 0, negate=True)(self.table)
@@ -187,7 +187,7 @@ class TestSameValueSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_on_discrete_attribute_value_passed_as_float(self):
         values = self.table.domain[3].values
         filtered_data = filter.SameValue(3, 0., negate=True)(self.table)
@@ -211,12 +211,12 @@ class TestValuesSql(unittest.TestCase, dbt):
     def tearDownDB(self):
         self.drop_sql_table(self.table_name)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_values_filter_with_no_conditions(self):
         with self.assertRaises(ValueError):
             filter.Values([])(self.table)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_discrete_value_filter(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterDiscrete(3, ['a'])
@@ -226,7 +226,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_discrete_value_filter_with_multiple_values(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterDiscrete(3, ['a', 'b'])
@@ -236,7 +236,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_discrete_value_filter_with_None(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterDiscrete(3, None)
@@ -246,7 +246,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_continuous_value_filter_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.Equal, 1)
@@ -256,7 +256,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_continuous_value_filter_not_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.NotEqual, 1)
@@ -266,7 +266,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_continuous_value_filter_less(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.Less, 2)
@@ -277,7 +277,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_continuous_value_filter_less_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.LessEqual, 2)
@@ -288,7 +288,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_continuous_value_filter_greater(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.Greater, 1)
@@ -299,7 +299,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_continuous_value_filter_greater_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.GreaterEqual, 1)
@@ -310,7 +310,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_continuous_value_filter_between(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.Between, 1, 2)
@@ -321,7 +321,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_continuous_value_filter_outside(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(0, filter.FilterContinuous.Outside, 2, 3)
@@ -332,7 +332,7 @@ class TestValuesSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_continuous_value_filter_isdefined(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterContinuous(1, filter.FilterContinuous.IsDefined)
@@ -363,7 +363,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
     def tearDownDB(self):
         self.drop_sql_table(self.table_name)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_is_defined(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.IsDefined)
@@ -374,7 +374,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_filter_string_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Equal, 'in')
@@ -385,7 +385,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_equal_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Equal, 'In',
@@ -397,7 +397,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_equal_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Equal, 'donec',
@@ -409,7 +409,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_not_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.NotEqual, 'in')
@@ -420,7 +420,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_not_equal_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.NotEqual, 'In',
@@ -432,7 +432,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_not_equal_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.NotEqual, 'donec',
@@ -444,7 +444,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_filter_string_less(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Less, 'A')
@@ -456,7 +456,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_less_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Less, 'In',
@@ -469,7 +469,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_less_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Less, 'donec',
@@ -482,7 +482,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_filter_string_less_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.LessEqual, 'A')
@@ -494,7 +494,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_less_equal_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.LessEqual, 'In',
@@ -507,7 +507,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_less_equal_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.LessEqual, 'donec',
@@ -520,7 +520,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_filter_string_greater(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Greater, 'volutpat')
@@ -532,7 +532,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_greater_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Greater, 'In',
@@ -545,7 +545,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_greater_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Greater, 'donec',
@@ -558,7 +558,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_greater_equal(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.GreaterEqual, 'volutpat')
@@ -570,7 +570,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_greater_equal_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.GreaterEqual, 'In',
@@ -583,7 +583,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_greater_equal_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.GreaterEqual, 'donec',
@@ -596,7 +596,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_between(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Between, 'a', 'c')
@@ -608,7 +608,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_between_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Between, 'I', 'O',
@@ -621,7 +621,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_between_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Between, 'i', 'O',
@@ -634,7 +634,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_contains(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Contains, 'et')
@@ -646,7 +646,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_contains_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Contains, 'eT',
@@ -659,7 +659,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_contains_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Contains, 'do',
@@ -672,7 +672,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_outside(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Outside, 'am', 'di')
@@ -684,7 +684,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_outside_case_insensitive(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.Outside, 'd', 'k',
@@ -697,7 +697,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_starts_with(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.StartsWith, 'D')
@@ -709,7 +709,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_starts_with_case_insensitive(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.StartsWith, 'D',
@@ -723,7 +723,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_ends_with(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.EndsWith, 's')
@@ -735,7 +735,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_ends_with_case_insensitive(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterString(-1, filter.FilterString.EndsWith, 'S',
@@ -749,7 +749,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_list(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterStringList(-1, ['et', 'in'])
@@ -760,7 +760,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_filter_string_list_case_insensitive_value(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterStringList(-1, ['Et', 'In'], case_sensitive=False)
@@ -771,7 +771,7 @@ class TestFilterStringSql(unittest.TestCase, dbt):
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_filter_string_list_case_insensitive_data(self):
         filtered_data = filter.Values(conditions=[
             filter.FilterStringList(-1, ['donec'], case_sensitive=False)
@@ -31,7 +31,7 @@ class MiscSqlTests(unittest.TestCase, dbt):
         sepal_length = iris.domain["sepal length"]
         EqualFreq(n=4)(iris, sepal_length)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     @unittest.skipIf(no_widgets, "Cannot import widgets")
     def test_get_conditional_distribution(self):
         iris = SqlTable(self.conn, self.iris, inspect_values=True)
@@ -39,7 +39,7 @@ class MiscSqlTests(unittest.TestCase, dbt):
         get_conditional_distribution(iris, [sepal_length])
         get_conditional_distribution(iris, list(iris.domain.variables))
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     @unittest.skipIf(no_widgets, "Cannot import widgets")
     def test_create_sql_contingency(self):
         iris = SqlTable(self.conn, self.iris, inspect_values=True)
@@ -0,0 +1,76 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+import pickle
+import unittest
+from unittest.mock import patch
+
+from Orange.data.sql.backend.base import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = QueryCache(100, 60)
+        self.assertIsNone(cache.get("SELECT a FROM t"))
+        cache.put("SELECT a FROM t", None, [(1, ), (2, )])
+        self.assertEqual(cache.get("SELECT a FROM t"), [(1, ), (2, )])
+        self.assertIsNone(cache.get("SELECT a FROM t", (1, )))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_normalizes_whitespace_outside_literals(self):
+        cache = QueryCache(100, 60)
+        cache.put("SELECT a\n  FROM t WHERE s = 'x  y'", None, [(1, )])
+        self.assertEqual(
+            cache.get(" SELECT a FROM  t WHERE s = 'x  y' "), [(1, )])
+        self.assertIsNone(cache.get("SELECT a FROM t WHERE s = 'x y'"))
+
+    def test_ttl(self):
+        cache = QueryCache(100, 60)
+        with patch("Orange.data.sql.backend.base.time", return_value=0):
+            cache.put("SELECT a FROM t", None, [(1, )])
+        with patch("Orange.data.sql.backend.base.time", return_value=59):
+            self.assertIsNotNone(cache.get("SELECT a FROM t"))
+        with patch("Orange.data.sql.backend.base.time", return_value=61):
+            self.assertIsNone(cache.get("SELECT a FROM t"))
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self):
+        cache = QueryCache(100, 0)
+        cache.put("SELECT a FROM t", None, [(1, )])
+        self.assertIsNone(cache.get("SELECT a FROM t"))
+        self.assertEqual(len(cache), 0)
+
+    def test_max_rows(self):
+        cache = QueryCache(5, 60)
+        cache.put("q1", None, [(1, )] * 3)
+        cache.put("q2", None, [(1, )] * 2)
+        cache.get("q1")
+        cache.put("q3", None, [(1, )] * 2)
+        # q2 was the least recently used
+        self.assertIsNotNone(cache.get("q1"))
+        self.assertIsNone(cache.get("q2"))
+        self.assertIsNotNone(cache.get("q3"))
+
+        cache.put("q4", None, [(1, )] * 6)
+        self.assertIsNone(cache.get("q4"))
+        self.assertEqual(len(cache), 2)
+
+    def test_clear(self):
+        cache = QueryCache(5, 60)
+        cache.put("q1", None, [(1, )])
+        cache.clear()
+        self.assertIsNone(cache.get("q1"))
+        cache.put("q1", None, [(1, )] * 5)
+        self.assertIsNotNone(cache.get("q1"))
+
+    def test_pickle(self):
+        cache = QueryCache(5, 30)
+        cache.put("q1", None, [(1, )])
+        cache = pickle.loads(pickle.dumps(cache))
+        self.assertEqual((cache.max_rows, cache.ttl), (5, 30))
+        self.assertEqual(len(cache), 0)
+        cache.put("q1", None, [(1, )])
+        self.assertIsNotNone(cache.get("q1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ from Orange.data.sql.backend.base import BackendError
 from Orange.data import filter, ContinuousVariable, DiscreteVariable, \
     StringVariable, TimeVariable, Table, Domain
 from Orange.data.sql.table import SqlTable
+from Orange.preprocess import Continuize, Impute, Normalize
 from Orange.preprocess.discretize import EqualWidth
 from Orange.statistics.basic_stats import BasicStats, DomainBasicStats
 from Orange.statistics.contingency import Continuous, Discrete, get_contingencies
@@ -45,7 +46,7 @@ class TestSqlTable(unittest.TestCase, dbt):
 
         self.drop_sql_table(table_name)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_constructs_correct_attributes(self):
         data = list(zip(self.float_variable(21),
                         self.discrete_variable(21),
@@ -70,13 +71,13 @@ class TestSqlTable(unittest.TestCase, dbt):
             self.assertEqual(string_attr.name, "col2")
             self.assertTrue('"col2"' in string_attr.to_sql())
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_make_attributes(self):
         table1 = SqlTable(self.conn, self.iris)
         table2 = SqlTable(self.conn, self.iris)
         self.assertEqual(table1.domain[0], table2.domain[0])
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_len(self):
         with self.sql_table_from_data(zip(self.float_variable(26))) as table:
             self.assertEqual(len(table), 26)
@@ -84,14 +85,14 @@ class TestSqlTable(unittest.TestCase, dbt):
         with self.sql_table_from_data(zip(self.float_variable(0))) as table:
             self.assertEqual(len(table), 0)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_bool(self):
         with self.sql_table_from_data(()) as table:
             self.assertEqual(bool(table), False)
         with self.sql_table_from_data(zip(self.float_variable(1))) as table:
             self.assertEqual(bool(table), True)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_len_with_filter(self):
         data = zip(self.discrete_variable(26))
         with self.sql_table_from_data(data) as table:
@@ -104,7 +105,7 @@ class TestSqlTable(unittest.TestCase, dbt):
             filtered_table = filter.SameValue(table.domain[0], 'x')(table)
             self.assertEqual(len(filtered_table), 0)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_XY_small(self):
         mat = np.random.randint(0, 2, (20, 3))
         conn, table_name = self.create_sql_table(mat)
@@ -114,7 +115,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         assert_almost_equal(sql_table.X, mat[:, :2])
         assert_almost_equal(sql_table.Y.flatten(), mat[:, 2])
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     @unittest.mock.patch("Orange.data.sql.table.AUTO_DL_LIMIT", 100)
     def test_XY_large(self):
         from Orange.data.sql.table import AUTO_DL_LIMIT as DLL
@@ -136,7 +137,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         assert_almost_equal(sql_table.X, mat[:, :2])
         assert_almost_equal(sql_table.Y.flatten(), mat[:, 2])
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_download_data(self):
         mat = np.random.randint(0, 2, (20, 3))
         conn, table_name = self.create_sql_table(mat)
@@ -148,19 +149,50 @@ class TestSqlTable(unittest.TestCase, dbt):
         # has all necessary class members to create a standard Table
         Table.from_table(sql_table.domain, sql_table)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    @unittest.mock.patch("Orange.data.sql.table.DOWNLOAD_BATCH_SIZE", 7)
+    def test_download_data_in_batches(self):
+        table = SqlTable(self.conn, self.iris, inspect_values=True)
+        rows = list(table)
+        table.download_data()
+        self.assertEqual(len(table), 150)
+        assert_almost_equal(table.X, np.vstack([row.x for row in rows]))
+        assert_almost_equal(table.Y, np.vstack([row.y for row in rows]))
+        self.assertEqual(table.metas.shape, (150, 0))
+
+        table.download_data(20, partial=True)
+        assert_almost_equal(table.X, np.vstack([row.x for row in rows[:20]]))
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    @unittest.mock.patch("Orange.data.sql.table.DOWNLOAD_BATCH_SIZE", 7)
+    def test_download_data_wrong_count(self):
+        expected = SqlTable(self.conn, self.iris, inspect_values=True)
+        expected.download_data()
+        # preallocated arrays are enlarged or shrunk when the table
+        # has more or fewer rows than estimated
+        for count in (10, 200):
+            table = SqlTable(self.conn, self.iris, inspect_values=True)
+            with unittest.mock.patch.object(table, "approx_len",
+                                            return_value=count):
+                table.download_data(160, partial=True)
+            self.assertEqual(table.X.shape, expected.X.shape)
+            self.assertEqual(table.metas.shape, (150, 0))
+            assert_almost_equal(table.X, expected.X)
+            assert_almost_equal(table.Y, expected.Y)
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_query_all(self):
         table = SqlTable(self.conn, self.iris, inspect_values=True)
         results = list(table)
 
         self.assertEqual(len(results), 150)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_unavailable_row(self):
         table = SqlTable(self.conn, self.iris)
         self.assertRaises(IndexError, lambda: table[151])
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_query_subset_of_attributes(self):
         table = SqlTable(self.conn, self.iris)
         attributes = [
@@ -181,7 +213,68 @@ class TestSqlTable(unittest.TestCase, dbt):
              (5.0, 3.6, 7.2)]
         )
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_select_rows(self):
+        table = SqlTable(self.conn, self.iris, inspect_values=True)
+        table.download_data()
+        all_x = table.X
+        for rows in (slice(10, 20), slice(140, None), slice(-5, None),
+                     slice(None, None, 30), [3, 5, 70, 149],
+                     np.arange(150) % 40 == 0, [], slice(20, 10)):
+            selected = SqlTable(self.conn, self.iris,
+                                inspect_values=True)[rows]
+            self.assertIsInstance(selected, SqlTable)
+            assert_almost_equal(selected.X.reshape(-1, all_x.shape[1]),
+                                all_x[rows])
+            self.assertEqual(len(selected), len(all_x[rows]))
+
+        selected = table[50:100][[0, 10, 20]]
+        assert_almost_equal(selected.X, all_x[[50, 60, 70]])
+        self.assertEqual(table[10:20, :2].X.shape, (10, 2))
+        self.assertRaises(NotImplementedError, table.__getitem__, [5, 3])
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_rows_ordered_by_key(self):
+        conn, table_name = self.create_sql_table(
+            [("e", 5), ("b", 2), ("d", 4), ("a", 1), ("c", 3)],
+            ["varchar(10) PRIMARY KEY", "float"])
+        table = SqlTable(conn, table_name)
+        self.assertEqual(len(table.key_columns), 1)
+        self.assertEqual([row.x[0] for row in table], [1, 2, 3, 4, 5])
+        self.assertEqual(table[3].x[0], 4)
+        assert_almost_equal(table[[0, 2, 3]].X.ravel(), [1, 3, 4])
+        assert_almost_equal(table[1:3].X.ravel(), [2, 3])
+        assert_almost_equal(table[3:][[1]].X.ravel(), [5])
+        selected = table[[0, 2, 3]]
+        self.assertEqual(
+            [name for name, *_ in
+             selected.backend.get_fields(selected.table_name)],
+            [name for name, *_ in table.backend.get_fields(table.table_name)])
+        table.download_data()
+        assert_almost_equal(table.X.ravel(), [1, 2, 3, 4, 5])
+
+        table = SqlTable(conn, "SELECT * FROM {}".format(table_name),
+                         key="col1")
+        assert_almost_equal(table[[1, 4]].X.ravel(), [2, 5])
+        self.drop_sql_table(table_name)
+
+        conn, table_name = self.create_sql_table([(2, ), (1, )])
+        self.assertIsNone(SqlTable(conn, table_name).key_columns)
+        self.drop_sql_table(table_name)
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    @unittest.mock.patch("Orange.data.sql.table.ROW_BLOCK_SIZE", 20)
+    def test_fetch_rows_in_blocks(self):
+        table = SqlTable(self.conn, self.iris, inspect_values=True)
+        rows = list(table)
+        with unittest.mock.patch.object(
+                table, "_query", wraps=table._query) as query:
+            for i in range(40):
+                assert_almost_equal(table[i].x, rows[i].x)
+            self.assertEqual(query.call_count, 2)
+        self.assertRaises(IndexError, table.__getitem__, 150)
+
+    @dbt.run_on(["postgres", "sqlite"])
     def test_query_subset_of_rows(self):
         table = SqlTable(self.conn, self.iris)
         all_results = list(table._query())
@@ -202,12 +295,12 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertEqual(len(results), 140)
         self.assertSequenceEqual(results, all_results[10:])
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_getitem_single_value(self):
         table = SqlTable(self.conn, self.iris, inspect_values=True)
         self.assertAlmostEqual(table[0, 0], 5.1)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_type_hints(self):
         table = SqlTable(self.conn, self.iris, inspect_values=True)
         self.assertEqual(len(table.domain), 5)
@@ -218,7 +311,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertEqual(len(table.domain), 4)
         self.assertEqual(len(table.domain.metas), 1)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_joins(self):
         table = SqlTable(
             self.conn,
@@ -251,7 +344,7 @@ class TestSqlTable(unittest.TestCase, dbt):
 
         return Attr
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_universal_table(self):
         _, table_name = self.construct_universal_table()
 
@@ -284,7 +377,22 @@ class TestSqlTable(unittest.TestCase, dbt):
     IRIS_VARIABLE = DiscreteVariable(
         "iris", values=('Iris-setosa', 'Iris-virginica', 'Iris-versicolor'))
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "sqlite"])
+    def test_preprocessing_in_database(self):
+        table = SqlTable(self.conn, self.iris, inspect_values=True)
+        table.download_data()
+        data = Table.from_numpy(table.domain, table.X, table.Y)
+        for preprocessor in (Continuize(), Normalize(), Impute(),
+                             Normalize(norm_type=Normalize.NormalizeBySpan)):
+            preprocessed = preprocessor(
+                SqlTable(self.conn, self.iris, inspect_values=True))
+            self.assertIsInstance(preprocessed, SqlTable)
+            self.assertIsNone(preprocessed._X)
+            expected = data.transform(preprocessed.domain)
+            assert_almost_equal(preprocessed.X, expected.X)
+            assert_almost_equal(preprocessed.Y.ravel(), expected.Y.ravel())
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_class_var_type_hints(self):
         iris = SqlTable(self.conn, self.iris,
                         type_hints=Domain([], self.IRIS_VARIABLE))
@@ -292,7 +400,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertEqual(len(iris.domain.class_vars), 1)
         self.assertEqual(iris.domain.class_vars[0].name, 'iris')
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_metas_type_hints(self):
         iris = SqlTable(self.conn, self.iris,
                         type_hints=Domain([], [], metas=[self.IRIS_VARIABLE]))
@@ -300,14 +408,14 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertEqual(len(iris.domain.metas), 1)
         self.assertEqual(iris.domain.metas[0].name, 'iris')
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_select_all(self):
         iris = SqlTable(self.conn, "SELECT * FROM iris",
                         type_hints=Domain([], self.IRIS_VARIABLE))
 
         self.assertEqual(len(iris.domain), 5)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_discrete_bigint(self):
         table = np.arange(6).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['bigint'])
@@ -318,7 +426,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, DiscreteVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_continous_bigint(self):
         table = np.arange(25).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['bigint'])
@@ -329,7 +437,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, ContinuousVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_discrete_int(self):
         table = np.arange(6).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['int'])
@@ -340,7 +448,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, DiscreteVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_continous_int(self):
         table = np.arange(25).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['int'])
@@ -351,7 +459,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, ContinuousVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_discrete_smallint(self):
         table = np.arange(6).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['smallint'])
@@ -362,7 +470,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, DiscreteVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_continous_smallint(self):
         table = np.arange(25).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['smallint'])
@@ -384,7 +492,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, DiscreteVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_discrete_char(self):
         table = np.array(['M', 'F', 'M', 'F', 'M', 'F']).reshape(-1, 1)
         conn, table_name = self.create_sql_table(table, ['char(1)'])
@@ -395,7 +503,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, DiscreteVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_discrete_bigger_char(self):
         """Test if the discrete values are the same for bigger char fields"""
         table = np.array(['M', 'F', 'M', 'F', 'M', 'F']).reshape(-1, 1)
@@ -404,7 +512,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertSequenceEqual(sql_table.domain[0].values, ['F', 'M'])
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_meta_char(self):
         table = np.array(list('ABCDEFGHIJKLMNOPQRSTUVW')).reshape(-1, 1)
         conn, table_name = self.create_sql_table(table, ['char(1)'])
@@ -415,7 +523,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstMetaIsInstance(sql_table, StringVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_discrete_varchar(self):
         table = np.array(['M', 'F', 'M', 'F', 'M', 'F']).reshape(-1, 1)
         conn, table_name = self.create_sql_table(table, ['varchar(1)'])
@@ -426,7 +534,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, DiscreteVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_meta_varchar(self):
         table = np.array(list('ABCDEFGHIJKLMNOPQRSTUVW')).reshape(-1, 1)
         conn, table_name = self.create_sql_table(table, ['varchar(1)'])
@@ -437,7 +545,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstMetaIsInstance(sql_table, StringVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_time_date(self):
         table = np.array(['2014-04-12', '2014-04-13', '2014-04-14',
                           '2014-04-15', '2014-04-16']).reshape(-1, 1)
@@ -449,7 +557,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, TimeVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_time_time(self):
         table = np.array(['17:39:51', '11:51:48.46', '05:20:21.492149',
                           '21:47:06', '04:47:35.8']).reshape(-1, 1)
@@ -461,7 +569,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, TimeVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_time_timetz(self):
         table = np.array(['17:39:51+0200', '11:51:48.46+01', '05:20:21.4921',
                           '21:47:06-0600', '04:47:35.8+0330']).reshape(-1, 1)
@@ -473,7 +581,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, TimeVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_time_timestamp(self):
         table = np.array(['2014-07-15 17:39:51.348149',
                           '2008-10-05 11:51:48.468149',
@@ -488,7 +596,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, TimeVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_time_timestamptz(self):
         table = np.array(['2014-07-15 17:39:51.348149+0200',
                           '2008-10-05 11:51:48.468149+02',
@@ -503,7 +611,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, TimeVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_double_precision(self):
         table = np.arange(25).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['double precision'])
@@ -514,7 +622,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, ContinuousVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_numeric(self):
         table = np.arange(25).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['numeric(15, 2)'])
@@ -525,7 +633,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, ContinuousVariable)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_real(self):
         table = np.arange(25).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['real'])
@@ -569,7 +677,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstAttrIsInstance(sql_table, ContinuousVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_text(self):
         table = np.array(list('ABCDEFGHIJKLMNOPQRSTUVW')).reshape((-1, 1))
         conn, table_name = self.create_sql_table(table, ['text'])
@@ -580,7 +688,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         sql_table = SqlTable(conn, table_name, inspect_values=True)
         self.assertFirstMetaIsInstance(sql_table, StringVariable)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_other(self):
         table = np.array(['bcd4d9c0-361e-bad4-7ceb-0d171cdec981',
                           '544b7ddc-d861-0201-81c8-9f7ad0bbf531',
@@ -597,7 +705,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         filters = filter.Values([filter.FilterString(-1, filter.FilterString.Equal, 'foo')])
         self.assertEqual(len(filters(sql_table)), 0)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_recovers_connection_after_sql_error(self):
         conn, table_name = self.create_sql_table(
             np.arange(25).reshape((-1, 1)))
@@ -616,7 +724,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         with sql_table.backend.execute_sql_query(working_query) as cur:
             cur.fetchall()
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     def test_basic_stats(self):
         iris = SqlTable(self.conn, self.iris, inspect_values=True)
         stats = BasicStats(iris, iris.domain['sepal length'])
@@ -636,7 +744,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertEqual(stats.nans, 0)
         self.assertEqual(stats.non_nans, 150)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "sqlite"])
     @unittest.mock.patch("Orange.data.sql.table.LARGE_TABLE", 100)
     def test_basic_stats_on_large_data(self):
         # By setting LARGE_TABLE to 100, iris will be treated as
@@ -661,7 +769,7 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertEqual(stats.nans, 0)
         self.assertEqual(stats.non_nans, 150)
 
-    @dbt.run_on(["postgres", "mssql"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_distributions(self):
         iris = SqlTable(self.conn, self.iris, inspect_values=True)
 
@@ -684,13 +792,157 @@ class TestSqlTable(unittest.TestCase, dbt):
         self.assertIsInstance(conts[1], Continuous)
         self.assertIsInstance(conts[2], Discrete)
 
-    @dbt.run_on(["postgres"])
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_distributions_and_contingencies_match_table(self):
+        iris = SqlTable(self.conn, self.iris, inspect_values=True)
+        data = Table("iris")
+        for (dist, unknowns), (expected, exp_unknowns) in zip(
+                iris._compute_distributions(),
+                data._compute_distributions()):
+            np.testing.assert_almost_equal(dist, expected)
+            self.assertEqual(unknowns, exp_unknowns)
+
+        columns = [iris.domain[0], iris.domain["iris"]]
+        for cont, expected in zip(
+                iris._compute_contingency(columns, iris.domain["iris"]),
+                data._compute_contingency(columns, data.domain.class_var)):
+            if isinstance(cont[0], tuple):  # continuous variable
+                cont = cont[0] + cont[1:]
+                expected = expected[0] + expected[1:]
+            for part, exp_part in zip(cont, expected):
+                np.testing.assert_almost_equal(part, exp_part)
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    @unittest.mock.patch("Orange.data.sql.table.LARGE_TABLE", 100)
+    def test_distributions_and_contingencies_large(self):
+        # Continuous values of large tables are binned; values of iris are
+        # further apart than bins, so only values are rounded
+        iris = SqlTable(self.conn, self.iris, inspect_values=True)
+        data = Table("iris")
+        atol = (data.X[:, 0].max() - data.X[:, 0].min()) / 1000
+        with unittest.mock.patch.object(iris, "sample_time") as sample:
+            (dist, unknowns), = iris._compute_distributions([0])
+            cont, = iris._compute_contingency([0], "iris")
+        sample.assert_not_called()
+        (expected, exp_unknowns), = data._compute_distributions([0])
+        np.testing.assert_allclose(dist[0], expected[0], atol=atol)
+        np.testing.assert_equal(dist[1], expected[1])
+        self.assertEqual(unknowns, exp_unknowns)
+
+        expected, = data._compute_contingency([0], data.domain.class_var)
+        np.testing.assert_allclose(cont[0][0], expected[0][0], atol=atol)
+        np.testing.assert_equal(cont[0][1], expected[0][1])
+
+        conn, table_name = self.create_sql_table(
+            [(float(i), ) for i in range(150)] + [(None, )] * 5, ["float"])
+        table = SqlTable(conn, table_name, inspect_values=True)
+        (dist, unknowns), = table._compute_distributions([0])
+        self.assertEqual(unknowns, 5)
+        self.assertEqual(dist[1].sum(), 150)
+        self.drop_sql_table(table_name)
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_quantiles(self):
+        iris = SqlTable(self.conn, self.iris, inspect_values=True)
+        data = Table("iris")
+        np.testing.assert_almost_equal(
+            iris.quantiles([0, 2], [0, 0.25, 0.5, 1]),
+            np.percentile(data.X[:, [0, 2]], [0, 25, 50, 100], axis=0).T)
+
+        empty = iris[:0]
+        np.testing.assert_equal(empty.quantiles([0, 2], [0.25, 0.5]),
+                                np.full((2, 2), np.nan))
+
+        # backends return either a row of sequences (or NULLs), or of
+        # single quantiles, or no rows
+        for rows in ([(None, [1.0, 2.0])], [(None, None, 1.0, 2.0)], []):
+            with unittest.mock.patch.object(iris.backend, "fetch_all",
+                                            return_value=rows):
+                np.testing.assert_equal(
+                    iris.quantiles([0, 2], [0.25, 0.5]),
+                    [[np.nan, np.nan],
+                     [np.nan, np.nan] if not rows else [1, 2]])
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_histograms(self):
+        iris = SqlTable(self.conn, self.iris, inspect_values=True)
+        data = Table("iris")
+        (edges, counts), = iris.histograms([0], bins=5)
+        exp_counts, exp_edges = np.histogram(data.X[:, 0], bins=5)
+        np.testing.assert_almost_equal(edges, exp_edges)
+        np.testing.assert_almost_equal(counts, exp_counts)
+
+        (edges, counts), = iris.histograms([0], bins=5, row_var="iris")
+        self.assertEqual(counts.shape, (3, 5))
+        for i in range(3):
+            np.testing.assert_almost_equal(
+                counts[i],
+                np.histogram(data.X[data.Y == i, 0], bins=edges)[0])
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_accumulators(self):
+        iris = SqlTable(self.conn, self.iris, inspect_values=True)
+        data = Table("iris")
+        sepal_length, species = \
+            iris._compute_accumulators([0, "iris"], chunk_size=40)
+        min_, max_, mean, var, nans, non_nans = sepal_length.basic_stats()
+        x = data.X[:, 0]
+        np.testing.assert_almost_equal(
+            [min_, max_, mean, var], [x.min(), x.max(), x.mean(), x.var()])
+        self.assertEqual((nans, non_nans), (0, 150))
+        np.testing.assert_almost_equal(
+            sepal_length.sketch.quantile([0.25, 0.5]),
+            np.quantile(x, [0.25, 0.5]))
+        counts, unknowns = species.distribution()
+        np.testing.assert_equal(
+            counts[np.argsort(iris.domain["iris"].values)], [50, 50, 50])
+        self.assertEqual(unknowns, 0)
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
+    def test_query_cache(self):
+        iris = SqlTable(self.conn, self.iris, inspect_values=True)
+        len(iris)  # approximate lengths are not cached
+        backend = iris.backend
+        self.assertEqual(backend.query_cache.ttl, 0)
+        hits = backend.query_statistics()["cache_hits"]
+        iris._compute_distributions()
+        iris._compute_distributions()
+        self.assertEqual(backend.query_statistics()["cache_hits"], hits)
+
+        backend.query_cache.ttl = 60
+        iris._compute_distributions()
+        hits = backend.query_statistics()["cache_hits"]
+        n_queries = len(backend.query_statistics()["latencies"])
+        iris._compute_distributions()
+        stats = backend.query_statistics()
+        self.assertEqual(stats["cache_hits"], hits + 1)
+        self.assertEqual(len(stats["latencies"]), n_queries)
+
+        backend.clear_cache()
+        iris._compute_distributions()
+        self.assertEqual(len(backend.query_statistics()["latencies"]),
+                         n_queries + 1)
+
+    @dbt.run_on(["postgres", "mssql", "sqlite"])
     def test_pickling_restores_connection_pool(self):
         iris = SqlTable(self.conn, self.iris, inspect_values=True)
         iris2 = pickle.loads(pickle.dumps(iris))
 
         self.assertEqual(iris[0], iris2[0])
 
+    @dbt.run_on(["postgres", "mssql"])
+    def test_connection_released_when_commit_fails(self):
+        connection = unittest.mock.MagicMock()
+        connection.commit.side_effect = RuntimeError
+        pool = self.backend.connection_pool
+        with unittest.mock.patch.object(pool, "getconn",
+                                        return_value=connection), \
+                unittest.mock.patch.object(pool, "putconn") as putconn:
+            with self.assertRaises(RuntimeError):
+                with self.backend.execute_sql_query("SELECT 1"):
+                    pass
+            putconn.assert_called_once_with(connection)
+
     @dbt.run_on(["postgres"])
     def test_list_tables_with_schema(self):
         with self.backend.execute_sql_query("DROP SCHEMA IF EXISTS orange_tests CASCADE") as cur:
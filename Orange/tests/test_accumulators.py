@@ -0,0 +1,181 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+import pickle
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+from Orange.data import Table, Domain, ContinuousVariable, \
+    DiscreteVariable, parallel_compute_values
+from Orange.statistics.accumulators import \
+    Moments, ValueCounts, QuantileSketch, ColumnStats, approx_quantiles
+
+
+class TestMoments(unittest.TestCase):
+    def test_update_and_merge(self):
+        x = np.array([1, 5, np.nan, 2, 8, 3, np.nan, 4])
+        w = np.array([1, 2, 3, 1, 0.5, 2, 1, 1])
+        moments = Moments().update(x[:3], w[:3]).update(x[3:5], w[3:5])
+        moments.merge(Moments().update(x[5:], w[5:]))
+
+        defined = ~np.isnan(x)
+        mean = np.average(x[defined], weights=w[defined])
+        self.assertEqual((moments.nans, moments.non_nans), (2, 6))
+        self.assertEqual((moments.min, moments.max), (1, 8))
+        self.assertAlmostEqual(moments.weight, 7.5)
+        self.assertAlmostEqual(moments.mean, mean)
+        self.assertAlmostEqual(
+            moments.var,
+            np.average((x[defined] - mean) ** 2, weights=w[defined]))
+
+    def test_empty(self):
+        moments = Moments().update([np.nan, np.nan])
+        moments.merge(Moments())
+        self.assertEqual((moments.nans, moments.non_nans), (2, 0))
+        self.assertEqual((moments.mean, moments.var), (0, 0))
+        self.assertEqual((moments.min, moments.max), (np.inf, -np.inf))
+
+
+class TestValueCounts(unittest.TestCase):
+    def test_update_and_merge(self):
+        counts = ValueCounts(3).update([0, 2, np.nan, 2], [1, 2, 3, 4])
+        counts.merge(ValueCounts(3).update([1, np.nan]))
+        np.testing.assert_equal(counts.counts, [1, 1, 6])
+        self.assertEqual(counts.nans, 4)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_exact_for_small_data(self):
+        x = np.random.RandomState(0).randn(100)
+        sketch = QuantileSketch(200).update(x[:50]).update(x[50:])
+        q = [0, 0.1, 0.5, 0.75, 1]
+        np.testing.assert_almost_equal(sketch.quantile(q), np.quantile(x, q))
+        self.assertEqual(sketch.rank_error, 0)
+        self.assertAlmostEqual(sketch.quantile(0.5), np.median(x))
+
+    def test_error_bound(self):
+        rng = np.random.RandomState(0)
+        x = rng.exponential(size=200000)
+        sketches = [QuantileSketch(100, random_state=i).update(part)
+                    for i, part in enumerate(np.array_split(x, 4))]
+        sketch = sketches[0]
+        for other in sketches[1:]:
+            sketch.merge(other)
+        self.assertLessEqual(
+            sum(len(values) for values, _ in sketch.levels), 100 * 20)
+        self.assertLess(sketch.relative_error, 0.1)
+
+        q = np.linspace(0, 1, 21)
+        ranks = np.searchsorted(np.sort(x), sketch.quantile(q)) / len(x)
+        self.assertTrue(np.all(np.abs(ranks - q) <= sketch.relative_error))
+
+    def test_weights(self):
+        rng = np.random.RandomState(0)
+        x, w = rng.rand(10000), rng.rand(10000)
+        sketch = QuantileSketch(100).update(x, w)
+        order = np.argsort(x)
+        below = np.cumsum(w[order]) / np.sum(w)
+        median = sketch.quantile(0.5)
+        rank = below[np.searchsorted(x[order], median) - 1]
+        self.assertLessEqual(abs(rank - 0.5), sketch.relative_error + 1e-3)
+
+    def test_empty(self):
+        sketch = QuantileSketch().update([np.nan])
+        self.assertTrue(np.isnan(sketch.quantile(0.5)))
+        np.testing.assert_equal(sketch.quantile([0.5, 1]), [np.nan] * 2)
+
+    def test_pickle(self):
+        sketch = QuantileSketch(10).update(np.arange(100.))
+        sketch2 = pickle.loads(pickle.dumps(sketch))
+        self.assertEqual(sketch.quantile(0.3), sketch2.quantile(0.3))
+
+
+class TestApproxQuantiles(unittest.TestCase):
+    def test_exact_for_small_data(self):
+        x = np.random.RandomState(0).rand(100, 3)
+        x[::7, 1] = np.nan
+        for axis in (None, 0, 1):
+            np.testing.assert_almost_equal(
+                approx_quantiles(x, [0.25, 0.5], axis=axis),
+                np.nanquantile(x, [0.25, 0.5], axis=axis))
+        self.assertAlmostEqual(approx_quantiles(x[:, 0], 0.5, axis=0),
+                               np.median(x[:, 0]))
+        self.assertTrue(np.isnan(approx_quantiles([], 0.5)))
+        self.assertRaises(ValueError, approx_quantiles, x, 0.5, axis=2)
+
+    def test_error_bound(self):
+        x = np.random.RandomState(0).permutation(200000).astype(float)
+        median = approx_quantiles(x, 0.5, size=200, chunk_size=1000,
+                                  random_state=0)
+        self.assertLess(abs(median / len(x) - 0.5),
+                        (np.log2(len(x) / 200) + 1) / 200)
+
+    def test_reproducible(self):
+        x = np.random.RandomState(0).rand(20000, 2)
+        np.testing.assert_equal(
+            approx_quantiles(x, [0.25, 0.5], axis=0, size=100),
+            approx_quantiles(x, [0.25, 0.5], axis=0, size=100))
+
+
+class TestColumnStats(unittest.TestCase):
+    def test_table(self):
+        rng = np.random.RandomState(0)
+        X = rng.rand(1000, 2)
+        X[rng.rand(1000, 2) < 0.1] = np.nan
+        X[:, 1] = np.floor(X[:, 1] * 3)
+        domain = Domain([ContinuousVariable("x"),
+                         DiscreteVariable("d", values=("a", "b", "c"))])
+        for X_ in (X, sp.csr_matrix(np.nan_to_num(X))):
+            data = Table.from_numpy(domain, X_)
+            data.W = rng.rand(1000)
+            x, d = data._compute_accumulators(chunk_size=77)
+            col = data.X[:, 0] if isinstance(X_, np.ndarray) \
+                else X_.toarray()[:, 0]
+            defined = ~np.isnan(col)
+            min_, max_, mean, _, nans, non_nans = x.basic_stats()
+            self.assertEqual((min_, max_), (np.nanmin(col), np.nanmax(col)))
+            self.assertAlmostEqual(
+                mean, np.average(col[defined], weights=data.W[defined]))
+            self.assertEqual(nans + non_nans, 1000)
+            self.assertEqual(nans, np.sum(~defined))
+            self.assertIsNone(x.counts)
+
+            counts, unknowns = d.distribution()
+            col = X_[:, 1].toarray().ravel() if sp.issparse(X_) else X[:, 1]
+            np.testing.assert_almost_equal(
+                counts, [np.sum(data.W[col == i]) for i in range(3)])
+            self.assertAlmostEqual(unknowns, np.sum(data.W[np.isnan(col)]))
+            self.assertIsNone(d.sketch)
+
+    def test_reproducible(self):
+        x = np.random.RandomState(0).rand(20000, 1)
+        data = Table.from_numpy(Domain([ContinuousVariable("x")]), x)
+        quantiles = [0.25, 0.5, 0.75]
+        stats, = data._compute_accumulators(chunk_size=1000, sketch_size=100)
+        expected = stats.sketch.quantile(quantiles)
+        with parallel_compute_values(4):
+            for _ in range(3):
+                stats, = data._compute_accumulators(chunk_size=1000,
+                                                    sketch_size=100)
+                np.testing.assert_equal(stats.sketch.quantile(quantiles),
+                                        expected)
+
+    def test_strings(self):
+        zoo = Table("zoo")
+        name = zoo.domain.metas[0]
+        stats, = zoo._compute_accumulators([name], chunk_size=10)
+        self.assertEqual(stats.basic_stats(), (np.inf, -np.inf, 0, 0, 0, 101))
+        self.assertRaises(TypeError, stats.distribution)
+
+    def test_merge(self):
+        var = ContinuousVariable("x")
+        x = np.arange(10.)
+        stats = ColumnStats(var).update(x[:3]).merge(
+            ColumnStats(var).update(x[3:]))
+        self.assertEqual(stats.basic_stats(), (0, 9, 4.5, 8.25, 0, 10))
+        self.assertEqual(stats.sketch.quantile(0.5), 4.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
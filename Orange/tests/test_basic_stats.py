@@ -28,6 +28,19 @@ class TestDomainBasicStats(TestCase):
         self.assertStatsEqual(domain_stats.stats,
                               attr_stats + class_var_stats + meta_stats)
 
+    def test_domain_basic_stats_chunked(self):
+        domain_stats = DomainBasicStats(self.zoo, include_metas=True)
+        chunked_stats = DomainBasicStats(self.zoo, include_metas=True,
+                                         chunk_size=7)
+        for stat in chunked_stats.stats:
+            stat.var = 0
+        self.assertStatsEqual(domain_stats.stats, chunked_stats.stats)
+
+        chunked_stats = DomainBasicStats(self.zoo, chunk_size=7)
+        for i, stat in enumerate(chunked_stats.stats):
+            self.assertAlmostEqual(
+                stat.var, np.var(self.zoo.get_column_view(i)[0]))
+
     def test_speed(self):
         n, m = 10, 10000
         data = Table.from_numpy(None, np.random.rand(n, m))
@@ -0,0 +1,137 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from Orange.data import Table
+from Orange.data.chunked import ChunkedTable
+from Orange.data.table import get_sample_datasets_dir
+from Orange.statistics.basic_stats import DomainBasicStats
+
+
+class TestChunkedTable(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.data = Table("heart_disease")
+        self.table = ChunkedTable.from_table(self.data, self.path, 50)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_open(self):
+        table = ChunkedTable(self.path)
+        self.assertEqual(len(table), len(self.data))
+        self.assertEqual(table.approx_len(), len(self.data))
+        self.assertEqual(table.n_chunks, 7)
+        self.assertEqual(table.domain, self.data.domain)
+        self.assertEqual(table.name, self.data.name)
+        self.assertFalse(table.has_weights())
+        for chunk in table.chunks():
+            self.assertIs(chunk.domain, table.domain)
+
+    def test_from_file(self):
+        path = os.path.join(self.path, "iris")
+        table = ChunkedTable.from_file(
+            os.path.join(get_sample_datasets_dir(), "iris.tab"), path, 40)
+        self.assertEqual(table.n_chunks, 4)
+        iris = Table("iris")
+        np.testing.assert_equal(table[:].X, iris.X)
+
+    def test_getitem(self):
+        data, table = self.data, self.table
+        np.testing.assert_equal(list(table[120]), list(data[120]))
+        np.testing.assert_equal(list(table[-1]), list(data[-1]))
+        self.assertRaises(IndexError, table.__getitem__, len(data))
+
+        for key in (slice(None), slice(40, 160), slice(None, None, -7),
+                    slice(45, 55), slice(-10, None), slice(200, 10, -3),
+                    slice(99, None, -50), slice(300, 400), slice(10, 10),
+                    [250, 3, 120, 121, 4], [-1, 0], data.Y == 1, []):
+            selected = table[key]
+            self.assertIsInstance(selected, Table)
+            np.testing.assert_equal(selected.X, data.X[key])
+            np.testing.assert_equal(selected.Y, data.Y[key])
+            np.testing.assert_equal(selected.ids, data.ids[key])
+
+    def test_getitem_reads_chunks(self):
+        table = self.table
+        with patch.object(ChunkedTable, "chunk", wraps=table.chunk) as chunk:
+            np.testing.assert_equal(table[45:55].X, self.data.X[45:55])
+            self.assertEqual([c[0][0] for c in chunk.call_args_list], [0, 1])
+            chunk.reset_mock()
+            table[130:120:-2]  # pylint: disable=pointless-statement
+            self.assertEqual([c[0][0] for c in chunk.call_args_list], [2])
+        self.assertRaises(IndexError, table.__getitem__, [len(table)])
+        self.assertRaises(IndexError, table.__getitem__, [True, False])
+
+    def test_iter(self):
+        np.testing.assert_equal([list(row) for row in self.table],
+                                [list(row) for row in self.data])
+
+    def test_basic_stats(self):
+        np.testing.assert_almost_equal(
+            [list(s.__dict__.values())
+             for s in DomainBasicStats(self.table, include_metas=True).stats],
+            [list(s.__dict__.values())
+             for s in DomainBasicStats(self.data, include_metas=True).stats])
+
+    def test_basic_stats_weights(self):
+        data = self.data.copy()
+        data.W = np.arange(len(data), dtype=float)
+        table = ChunkedTable.from_table(
+            data, os.path.join(self.path, "weighted"), 50)
+        self.assertTrue(table.has_weights())
+        np.testing.assert_almost_equal(table._compute_basic_stats(),
+                                       data._compute_basic_stats())
+
+    def test_basic_stats_variance(self):
+        stats = self.table._compute_basic_stats(compute_variance=True)
+        X = np.hstack((self.data.X, self.data.Y[:, None]))
+        np.testing.assert_almost_equal(stats[:, 0], np.nanmin(X, axis=0))
+        np.testing.assert_almost_equal(stats[:, 2], np.nanmean(X, axis=0))
+        np.testing.assert_almost_equal(stats[:, 3], np.nanvar(X, axis=0))
+        np.testing.assert_equal(stats[:, 4], np.isnan(X).sum(axis=0))
+
+    def test_empty(self):
+        table = ChunkedTable.from_table(
+            self.data[:0], os.path.join(self.path, "empty"))
+        self.assertEqual(table.n_chunks, 0)
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.X_density(), ChunkedTable.DENSE)
+        self.assertEqual(table.Y_density(), ChunkedTable.DENSE)
+        self.assertEqual(table.metas_density(), ChunkedTable.DENSE)
+        selected = table[:]
+        self.assertIsInstance(selected, Table)
+        self.assertEqual(len(selected), 0)
+        self.assertEqual(selected.domain, self.data.domain)
+        self.assertRaises(IndexError, table.__getitem__, 0)
+        self.assertEqual(
+            len(table._compute_basic_stats(compute_variance=True)), 0)
+
+    def test_distributions(self):
+        for (dist, unknowns), (expected, exp_unknowns) in zip(
+                self.table._compute_distributions(),
+                self.data._compute_distributions()):
+            np.testing.assert_almost_equal(dist, expected)
+            self.assertEqual(unknowns, exp_unknowns)
+
+    def test_contingencies(self):
+        class_var = self.data.domain.class_var
+        for cont, expected in zip(
+                self.table._compute_contingency(row_var=class_var),
+                self.data._compute_contingency(row_var=class_var)):
+            if isinstance(cont[0], tuple):  # continuous variable
+                cont = cont[0] + cont[1:]
+                expected = expected[0] + expected[1:]
+            for part, exp_part in zip(cont, expected):
+                np.testing.assert_almost_equal(part, exp_part)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -128,6 +128,19 @@ class TestHierarchical(unittest.TestCase):
         self.assertGreater(score_unordered, score_ordered)
         self.assertEqual(score_ordered, 21.0)
 
+    def test_condensed_matrix(self):
+        condensed = self.matrix.to_condensed()
+        numpy.testing.assert_equal(
+            hierarchical.condensedform(condensed),
+            hierarchical.condensedform(self.matrix))
+        cluster = hierarchical.dist_matrix_clustering(condensed)
+        self.assertEqual(cluster, self.cluster)
+
+        ordered = hierarchical.optimal_leaf_ordering(self.cluster, condensed)
+        self.assertEqual(
+            ordered,
+            hierarchical.optimal_leaf_ordering(self.cluster, self.matrix))
+
     def test_table_clustering(self):
         table = Orange.data.Table.from_numpy(None, numpy.eye(3))
         tree = hierarchical.data_clustering(table, linkage="single")
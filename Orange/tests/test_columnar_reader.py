@@ -0,0 +1,99 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+from Orange.data import Table, Domain, ContinuousVariable, StringVariable
+from Orange.data.io import ColumnarReader, FileFormat
+
+
+class TestColumnarReader(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".ocf")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_registered(self):
+        self.assertIsInstance(FileFormat.get_reader("t.ocf"), ColumnarReader)
+        self.assertIs(FileFormat.writers[".ocf"], ColumnarReader)
+
+    def test_read_write(self):
+        data = Table("zoo")
+        data.attributes = {"foo": "bar"}
+        data.save(self.filename)
+
+        read = Table.from_file(self.filename)
+        self.assertEqual(read.domain, data.domain)
+        self.assertEqual(read.name, data.name)
+        self.assertEqual(read.attributes, data.attributes)
+        np.testing.assert_equal(read.X, data.X)
+        np.testing.assert_equal(read.Y, data.Y)
+        np.testing.assert_equal(read.metas, data.metas)
+        np.testing.assert_equal(read.ids, data.ids)
+        self.assertFalse(read.has_weights())
+
+    def test_memory_mapped(self):
+        data = Table("iris")
+        data.set_weights(2)
+        data.save(self.filename)
+
+        read = ColumnarReader(self.filename).read()
+        for arr in (read.X, read._Y, read.W, read.ids):
+            self.assertIsInstance(arr, np.memmap)
+        self.assertTrue(read.X.flags.f_contiguous)
+        np.testing.assert_equal(read.W, data.W)
+
+        # changes are not written back into the file
+        read.X[0, 0] = 42
+        self.assertEqual(ColumnarReader(self.filename).read().X[0, 0],
+                         data.X[0, 0])
+
+    def test_primitive_metas(self):
+        domain = Domain([ContinuousVariable("a")],
+                        metas=[ContinuousVariable("b")])
+        data = Table.from_numpy(domain, [[1], [2]], metas=[[3], [4]])
+        data.save(self.filename)
+        read = Table.from_file(self.filename)
+        self.assertIsInstance(read.metas, np.memmap)
+        np.testing.assert_equal(read.metas, [[3], [4]])
+
+    def test_string_metas(self):
+        domain = Domain([ContinuousVariable("a")],
+                        metas=[StringVariable("s")])
+        data = Table.from_numpy(domain, [[1], [2]], metas=[["x"], ["y"]])
+        data.save(self.filename)
+        read = Table.from_file(self.filename)
+        np.testing.assert_equal(read.metas, [["x"], ["y"]])
+
+    def test_sparse(self):
+        domain = Domain([ContinuousVariable(str(i), sparse=True)
+                         for i in range(20)])
+        X = sp.random(50, 20, density=0.1, format="csr", random_state=0)
+        data = Table.from_numpy(domain, X)
+        data.save(self.filename)
+        read = Table.from_file(self.filename)
+        self.assertTrue(sp.isspmatrix_csr(read.X))
+        np.testing.assert_equal(read.X.toarray(), X.toarray())
+
+    def test_empty(self):
+        data = Table("iris")[:0]
+        data.save(self.filename)
+        read = Table.from_file(self.filename)
+        self.assertEqual(len(read), 0)
+        self.assertEqual(read.domain, data.domain)
+
+    def test_invalid_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not an orange file")
+        self.assertRaises(ValueError, ColumnarReader(self.filename).read)
+
+
+if __name__ == "__main__":
+    unittest.main()
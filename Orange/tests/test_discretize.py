@@ -43,6 +43,22 @@ class TestEqualFreq(TestCase):
         self.assertEqual(len(dvar.values), 4)
         self.assertEqual(dvar.compute_value.points, [1.5, 2.5, 3.5])
 
+    def test_equifreq_approximate(self):
+        X = np.random.RandomState(0).permutation(100000).reshape(-1, 1)
+        X = np.vstack((X, np.full((100, 1), np.nan)))
+        table = data.Table.from_numpy(None, X)
+        disc = discretize.EqualFreq(n=4, approximate=True)
+        dvar = disc(table, table.domain[0])
+        self.assertEqual(len(dvar.values), 4)
+        np.testing.assert_allclose(
+            dvar.compute_value.points, [25000, 50000, 75000], rtol=0.01)
+        self.assertEqual(disc(table, table.domain[0]).compute_value.points,
+                         dvar.compute_value.points)
+
+        table = data.Table.from_numpy(None, np.ones((100, 1)))
+        dvar = disc(table, table.domain[0])
+        self.assertEqual(dvar.compute_value.points, [])
+
 
 # noinspection PyPep8Naming
 class TestEqualWidth(TestCase):
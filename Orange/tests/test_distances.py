@@ -4,6 +4,7 @@
 from unittest import TestCase
 import unittest
 import pickle
+import mmap
 
 import numpy as np
 import scipy
@@ -18,7 +19,7 @@ from Orange.distance import (Euclidean, SpearmanR, SpearmanRAbsolute,
                              Jaccard, _preprocess, MahalanobisDistance,
                              Bhattacharyya)
 from Orange.distance.distance import _spearmanr2, _corrcoef2
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 from Orange.tests import named_file, test_filename
 from Orange.util import OrangeDeprecationWarning
 
@@ -188,6 +189,59 @@ class TestDistMatrix(TestCase):
                              ["danny", "eve", "frank"])
             self.assertEqual(m.axis, 0)
 
+    def test_save_binary(self):
+        def is_mapped(a):
+            while isinstance(a, np.ndarray):
+                a = a.base
+            return isinstance(a, mmap.mmap)
+
+        dist = self.dist.submatrix(np.arange(0, 150, 7))
+        dist.col_items = dist.row_items[:5]
+        with named_file("", suffix=".dstb") as name:
+            dist.save(name)
+            m = DistMatrix.from_file(name)
+            self.assertTrue(is_mapped(m))
+            self.assertFalse(m.flags.writeable)
+            np.testing.assert_equal(m, dist)
+            self.assertTrue(tables_equal(m.row_items, dist.row_items))
+            self.assertTrue(tables_equal(m.col_items, dist.col_items))
+            self.assertEqual(m.axis, 1)
+            np.testing.assert_equal(np.load(name, mmap_mode="r"), dist)
+            del m
+
+            m = DistMatrix.from_file(name, mmap_mode=None)
+            self.assertFalse(is_mapped(m))
+            np.testing.assert_equal(m, dist)
+
+            m = DistMatrix.from_file(name, mmap_mode="c")
+            self.assertTrue(is_mapped(m))
+            m[0, 0] = 42
+            del m
+            np.testing.assert_equal(DistMatrix.from_file(name), dist)
+
+            dist = DistMatrix(np.arange(6).reshape(2, 3), axis=0)
+            dist.save_binary(name)
+            m = DistMatrix.from_file(name)
+            np.testing.assert_equal(m, dist)
+            self.assertEqual(m.dtype, dist.dtype)
+            self.assertIsNone(m.row_items)
+            self.assertEqual(m.axis, 0)
+            del m
+
+            condensed = self.dist.to_condensed(np.float32)
+            condensed.save(name)
+            m = DistMatrix.from_file(name)
+            self.assertIsInstance(m, CondensedDistMatrix)
+            self.assertEqual(m.dtype, np.float32)
+            np.testing.assert_equal(m.flat, condensed.flat)
+            self.assertTrue(tables_equal(m.row_items, self.iris))
+            del m
+
+            with open(name, "r+b") as fle:
+                fle.seek(-5, 2)
+                fle.truncate()
+            self.assertRaises(Exception, DistMatrix.from_file, name)
+
     def test_numpy_type(self):
         """GH-3658"""
         data1 = np.array([1, 2], dtype=np.int64)
@@ -200,6 +254,113 @@ class TestDistMatrix(TestCase):
             np.testing.assert_array_equal(dm1, dm2)
 
 
+class TestCondensedDistMatrix(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.iris = Table('iris')[::5]
+        cls.dist = Euclidean(cls.iris)
+
+    def setUp(self):
+        self.condensed = self.dist.to_condensed()
+
+    def test_construct(self):
+        self.assertEqual(self.condensed.shape, self.dist.shape)
+        self.assertEqual(len(self.condensed), len(self.dist))
+        self.assertIs(self.condensed.row_items, self.iris)
+        self.assertIs(self.condensed.col_items, self.iris)
+        np.testing.assert_equal(self.condensed.flat, self.dist.flat)
+        np.testing.assert_almost_equal(np.asarray(self.condensed), self.dist)
+        np.testing.assert_almost_equal(self.condensed.to_dense(), self.dist)
+
+        condensed = self.dist.to_condensed(np.float32)
+        self.assertEqual(condensed.dtype, np.float32)
+        self.assertEqual(np.asarray(condensed).dtype, np.float32)
+        np.testing.assert_almost_equal(np.asarray(condensed), self.dist,
+                                       decimal=5)
+
+        self.assertEqual(CondensedDistMatrix(np.zeros(0)).shape, (1, 1))
+        self.assertRaises(ValueError, CondensedDistMatrix, np.zeros(4))
+        self.assertRaises(ValueError, CondensedDistMatrix, np.zeros((3, 3)))
+        self.assertRaises(ValueError,
+                          DistMatrix(np.zeros((2, 3))).to_condensed)
+
+    def test_getitem(self):
+        dist, condensed = self.dist, self.condensed
+        rows, cols = np.array([3, 1, 1, 29]), np.array([4, 0, 1, -2])
+        for key in ((3, 5), (5, 3), (4, 4), (-1, 2), 7, -3, (7, ),
+                    slice(2, 7), (slice(None), slice(3, 20, 4)),
+                    (slice(2, 5), 4), (rows, cols), (rows, 3),
+                    (rows[:, None], cols[None, :]),
+                    (rows, slice(2, 5)), (slice(2, 5), cols),
+                    (np.arange(len(dist)) % 3 == 0, )):
+            np.testing.assert_almost_equal(
+                condensed[key], np.asarray(dist)[key], err_msg=str(key))
+            self.assertEqual(np.shape(condensed[key]),
+                             np.asarray(dist)[key].shape)
+        for i, row in enumerate(condensed):
+            np.testing.assert_almost_equal(row, dist[i])
+
+        self.assertRaises(IndexError, condensed.__getitem__, 30)
+        self.assertRaises(IndexError, condensed.__getitem__, (1, 2, 3))
+        self.assertRaises(IndexError, condensed.__getitem__, (Ellipsis, 1))
+        self.assertRaises(IndexError, condensed.__getitem__, (1.5, 1))
+
+    def test_submatrix(self):
+        sub = self.condensed.submatrix([2, 5, 4])
+        self.assertIsInstance(sub, CondensedDistMatrix)
+        np.testing.assert_almost_equal(
+            np.asarray(sub), self.dist.submatrix([2, 5, 4]))
+        self.assertTrue(tables_equal(sub.row_items, self.iris[[2, 5, 4]]))
+
+        sub = self.condensed.submatrix([2, 5, 4], [1, 2])
+        self.assertIsInstance(sub, DistMatrix)
+        np.testing.assert_almost_equal(
+            sub, self.dist.submatrix([2, 5, 4], [1, 2]))
+        self.assertTrue(tables_equal(sub.col_items, self.iris[[1, 2]]))
+
+    def test_max_min(self):
+        self.assertEqual(self.condensed.max(), self.dist.max())
+        self.assertEqual(self.condensed.min(), 0)
+        self.assertEqual(CondensedDistMatrix(np.zeros(0)).max(), 0)
+
+    def test_pickling(self):
+        unpickled = pickle.loads(pickle.dumps(self.condensed))
+        np.testing.assert_equal(unpickled.flat, self.condensed.flat)
+        self.assertTrue(tables_equal(unpickled.row_items, self.iris))
+        self.assertEqual(unpickled.axis, 1)
+
+    def test_save(self):
+        with named_file("", suffix=".dst") as name:
+            self.condensed.save(name)
+            m = DistMatrix.from_file(name)
+            np.testing.assert_almost_equal(m, self.dist)
+
+    def test_distance_model(self):
+        model = Euclidean(normalize=True).fit(self.iris)
+        model.condensed_block_size = 50
+        condensed = model.condensed(self.iris, np.float32)
+        self.assertIsInstance(condensed, CondensedDistMatrix)
+        self.assertEqual(condensed.dtype, np.float32)
+        self.assertIs(condensed.row_items, self.iris)
+        np.testing.assert_almost_equal(
+            np.asarray(condensed), model(self.iris), decimal=5)
+
+        np.testing.assert_almost_equal(
+            Euclidean(axis=0).fit(self.iris).condensed(self.iris).flat,
+            Euclidean(self.iris, axis=0).flat)
+
+        self.assertRaises(ValueError, model.condensed, Table("zoo"))
+
+    def test_distance_model_missing(self):
+        data = self.iris[:20].copy()
+        data.X[::3, 1] = np.nan
+        model = SpearmanR().fit(data)
+        model.condensed_block_size = 50
+        np.testing.assert_almost_equal(
+            model.condensed(data).flat,
+            DistMatrix(model(data, data)).to_condensed().flat)
+
+
 # noinspection PyTypeChecker
 class TestEuclidean(TestCase):
     @classmethod
@@ -1,5 +1,6 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
+import gc
 import warnings
 from time import time
 from numbers import Real
@@ -400,6 +401,50 @@ class TestDomainInit(unittest.TestCase):
             self.assertEqual(to_domain.class_vars, class_vars)
             self.assertEqual(to_domain.metas, metas)
 
+    def test_get_conversion_cached(self):
+        d = Domain((age, gender, income), metas=(ssn, race))
+        e = Domain((gender, race), None, metas=(age, income, ssn))
+        f = Domain((age, gender, income), metas=(ssn, race))
+
+        conversion = e.get_conversion(d)
+        self.assertIs(conversion.source, d)
+        self.assertIs(e.get_conversion(d), conversion)
+        # equal source domains do not share conversions
+        self.assertIsNot(e.get_conversion(f), conversion)
+        self.assertIs(e.get_conversion(f).source, f)
+        self.assertIs(e.get_conversion(d), conversion)
+
+        # conversions do not keep the source domains alive
+        del conversion, d, f
+        gc.collect()
+        g = Domain((age, gender, income), metas=(ssn, race))
+        e.get_conversion(g)
+        self.assertEqual(list(e._known_domains.values()),
+                         [e.get_conversion(g)])
+
+    def test_conversion_plan(self):
+        compute_value = lambda: 42
+        new_income = income.copy(compute_value=compute_value,
+                                 name='new_income')
+        d = Domain((age, gender, income), race, metas=(ssn, education))
+        e = Domain((income, new_income, education, age, incomeA, race),
+                   metas=(ssn, gender))
+
+        plan = e.get_conversion(d).plan_X
+        assert_array_equal(plan.from_X[0], [0, 3])
+        assert_array_equal(plan.from_X[1], [2, 0])
+        assert_array_equal(plan.from_Y[0], [5])
+        assert_array_equal(plan.from_Y[1], [0])
+        assert_array_equal(plan.from_metas[0], [2])
+        assert_array_equal(plan.from_metas[1], [1])
+        self.assertEqual(plan.unknown, [4])
+        self.assertEqual(plan.computed, [(1, compute_value)])
+        self.assertEqual(plan.shared, [])
+
+        plan = e.get_conversion(d).plan_metas
+        assert_array_equal(plan.from_X[0], [1])
+        assert_array_equal(plan.from_metas[0], [0])
+
     def test_conversion(self):
         domain = Domain([age, income], [race],
                         [gender, education, ssn])
@@ -450,6 +495,21 @@ class TestDomainInit(unittest.TestCase):
         unpickled_domain = pickle.loads(pickle.dumps(domain))
         self.assertTrue(hasattr(unpickled_domain, '_known_domains'))
 
+    def test_content_hash(self):
+        domain = create_domain(["age", "gender"], ["education"], ["ssn"])
+        self.assertEqual(domain.content_hash(),
+                         create_domain(["age", "gender"], ["education"],
+                                       ["ssn"]).content_hash())
+        self.assertEqual(domain.content_hash(),
+                         pickle.loads(pickle.dumps(domain)).content_hash())
+        for other in (create_domain(["gender", "age"], ["education"], ["ssn"]),
+                      create_domain(["age", "gender", "education"], [],
+                                    ["ssn"]),
+                      create_domain(["age"], ["education"], ["ssn"]),
+                      Domain([age, gender.copy(values=("F", "M"))],
+                             education, [ssn])):
+            self.assertNotEqual(domain.content_hash(), other.content_hash())
+
     def test_different_domains_with_same_attributes_are_equal(self):
         domain1 = Domain([])
         domain2 = Domain([])
@@ -10,9 +10,12 @@ import unittest
 import warnings
 from unittest.mock import Mock, patch
 
+import numpy as np
+
 from Orange import data
 
-from Orange.data.io import FileFormat, TabReader, CSVReader, PickleReader
+from Orange.data.io import FileFormat, TabReader, CSVReader, PickleReader, \
+    FileCache, ColumnarReader, BasketReader
 from Orange.data.io_base import PICKLE_PROTOCOL
 from Orange.data.table import get_sample_datasets_dir
 from Orange.data import Table, Variable
@@ -211,5 +214,124 @@ class TestReader(unittest.TestCase):
         self.assertLessEqual(PICKLE_PROTOCOL, pickle.HIGHEST_PROTOCOL)
 
 
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache = FileCache(os.path.join(self.tempdir, "cache"),
+                               max_size=1 << 20, min_file_size=0)
+        self.filename = os.path.join(self.tempdir, "iris.tab")
+        shutil.copy(os.path.join(get_sample_datasets_dir(), "iris.tab"),
+                    self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def cached_files(self):
+        return os.listdir(self.cache.directory)
+
+    def test_read(self):
+        reader = TabReader(self.filename)
+        with patch.object(TabReader, "read", wraps=reader.read) as read:
+            data = self.cache.read(reader)
+            read.assert_called_once()
+            self.assertEqual(len(self.cached_files()), 1)
+
+            read.reset_mock()
+            cached = self.cache.read(reader)
+            read.assert_not_called()
+
+        self.assertEqual(cached.domain, data.domain)
+        self.assertEqual(cached.name, data.name)
+        np.testing.assert_equal(cached.X, data.X)
+        np.testing.assert_equal(cached.Y, data.Y)
+        self.assertEqual(len(set(cached.ids) & set(data.ids)), 0)
+
+    def test_file_changed(self):
+        reader = TabReader(self.filename)
+        self.cache.read(reader)
+        with open(self.filename, "a") as f:
+            f.write("5.0\t3.0\t1.5\t0.2\tIris-setosa\n")
+        self.assertEqual(len(self.cache.read(reader)), 151)
+        self.assertEqual(len(self.cached_files()), 2)
+
+    def test_not_cached(self):
+        reader = TabReader(self.filename)
+        self.cache.min_file_size = os.path.getsize(self.filename) + 1
+        self.assertIsNone(self.cache.key(reader))
+
+        self.cache.min_file_size = 0
+        self.cache.max_size = 0
+        self.assertIsNone(self.cache.key(reader))
+
+        self.cache.max_size = 1 << 20
+        self.assertIsNotNone(self.cache.key(reader))
+        self.assertIsNone(self.cache.key(PickleReader(self.filename)))
+        self.assertIsNone(self.cache.key(BasketReader(self.filename)))
+
+    def test_subclass_not_cached(self):
+        class SubTable(Table):
+            pass
+
+        reader = TabReader(self.filename)
+        read = reader.read
+        with patch.object(reader, "read",
+                          lambda: SubTable.from_table_rows(read(), ...)):
+            self.assertIsInstance(self.cache.read(reader), SubTable)
+        self.assertFalse(os.path.exists(self.cache.directory)
+                         and self.cached_files())
+
+    def test_default(self):
+        # pylint: disable=protected-access
+        with patch.object(FileCache, "_default", None):
+            with patch.dict(os.environ, {"ORANGE_FILE_CACHE_SIZE": "1"}):
+                cache = FileCache.default()
+                self.assertEqual(cache.max_size, 1 << 20)
+                self.assertIs(FileCache.default(), cache)
+            with patch.dict(os.environ, {"ORANGE_FILE_CACHE_SIZE": "0"}):
+                self.assertEqual(FileCache.default().max_size, 0)
+
+    def test_version(self):
+        reader = TabReader(self.filename)
+        key = self.cache.key(reader)
+        with patch("Orange.__version__", "0.0.0"):
+            self.assertNotEqual(self.cache.key(reader), key)
+        with patch.object(FileCache, "VERSION", FileCache.VERSION + 1):
+            self.assertNotEqual(self.cache.key(reader), key)
+
+    def test_warnings(self):
+        reader = TabReader(self.filename)
+        read = reader.read
+
+        def read_with_warning():
+            warnings.warn("renamed columns")
+            return read()
+
+        with patch.object(reader, "read", read_with_warning):
+            with self.assertWarnsRegex(UserWarning, "renamed columns"):
+                self.cache.read(reader)
+        with patch.object(reader, "read") as read:
+            with self.assertWarnsRegex(UserWarning, "renamed columns"):
+                self.cache.read(reader)
+            read.assert_not_called()
+
+    def test_unreadable_entry(self):
+        reader = TabReader(self.filename)
+        self.cache.read(reader)
+        with patch.object(ColumnarReader, "read", side_effect=AttributeError):
+            self.assertEqual(len(self.cache.read(reader)), 150)
+
+    def test_evict(self):
+        self.cache.read(TabReader(self.filename))
+        first, = self.cached_files()
+        self.cache.max_size = \
+            os.path.getsize(os.path.join(self.cache.directory, first)) + 1
+        self.cache.read(CSVReader(self.filename))
+        self.assertEqual(len(self.cached_files()), 1)
+        self.assertNotIn(first, self.cached_files())
+
+        self.cache.clear()
+        self.assertEqual(self.cached_files(), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -92,6 +92,24 @@ class TestUtil(unittest.TestCase):
         np.testing.assert_equal(row_nans, [0, 0, 3])
         self.assertEqual(2, nans)
 
+    def test_contingency_columns(self):
+        x = np.array([[0, 1, 0, 2, np.nan, np.nan],
+                      [1, 0, 0, 0, np.nan, 1],
+                      [2, 2, 2, 2, 2, 2]]).T
+        y = np.array([0, 0, 1, np.nan, 0, np.nan])
+        w = np.array([1, 2, 2, 3, 4, 2])
+        for array in (np.array, np.asfortranarray, csr_matrix, csc_matrix):
+            conts, col_nans, row_nans, nans = contingency(
+                array(x), y, 2, 2, weights=w, mask=[True, True, False])
+            np.testing.assert_equal(
+                conts, [[[1, 2, 0], [2, 0, 0], [0, 0, 0]],
+                        [[2, 1, 0], [2, 0, 0], [0, 0, 0]],
+                        np.zeros((3, 3))])
+            np.testing.assert_equal(col_nans, [[4, 0, 0], [4, 0, 0], [0] * 3])
+            np.testing.assert_equal(row_nans[:2], [[0, 0, 3], [3, 2, 0]])
+            self.assertIsNone(row_nans[2])
+            np.testing.assert_equal(nans, [2, 0, 0])
+
     def test_stats(self):
         X = np.arange(4).reshape(2, 2).astype(float)
         X[1, 1] = np.nan
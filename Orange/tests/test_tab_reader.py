@@ -228,6 +228,25 @@ class TestTabReader(unittest.TestCase):
         self.assertEqual(table1.name, 'iris')
         self.assertEqual(table2.name, 'iris')
 
+    def test_read_chunks(self):
+        table = Table("heart_disease")
+        reader = TabReader(table.__file__)
+        chunks = list(reader.read_chunks(100))
+        self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 100, 3])
+        for chunk in chunks:
+            self.assertEqual(chunk.domain, table.domain)
+            self.assertEqual(chunk.name, "heart_disease")
+        self.assertEqual(
+            chunks[0].domain["ST by exercise"].number_of_decimals, 1)
+        conc = Table.concatenate(chunks)
+        np.testing.assert_equal(conc.X, table.X)
+        np.testing.assert_equal(conc.Y, table.Y)
+
+    def test_read_chunks_file_object(self):
+        file = io.StringIO("a\tb\n1\t2\n3\t4\n5\t6\n")
+        chunks = list(TabReader(file).read_chunks(2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
     def test_metadata(self):
         tempdir = tempfile.mkdtemp()
         try:
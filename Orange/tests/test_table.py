@@ -3,7 +3,9 @@
 
 import copy
 import os
+import pickle
 import random
+import threading
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 from itertools import chain
@@ -20,6 +22,9 @@ from Orange.data import (filter, Unknown, Variable, Table, DiscreteVariable,
 from Orange.data.util import SharedComputeValue
 from Orange.tests import test_dirname
 from Orange.data.table import _optimize_indices
+from Orange.misc import environ
+from Orange.preprocess import Continuize, Impute, Normalize
+from Orange.preprocess.preprocess import PreprocessorList
 
 
 class TableTestCase(unittest.TestCase):
@@ -359,6 +364,63 @@ class TableTestCase(unittest.TestCase):
         self.assertNotEqual(crc1, crc5)
         self.assertEqual(crc1, crc6)
 
+    def test_content_hash(self):
+        d = data.Table("zoo")
+        h = d.content_hash()
+        self.assertEqual(h, data.Table("zoo").content_hash())
+        self.assertEqual(h, pickle.loads(pickle.dumps(d)).content_hash())
+        self.assertEqual(h, d.copy().content_hash())
+
+        d[42, 3] = 1 - d[42, 3]
+        self.assertNotEqual(d.content_hash(), h)
+        d[42, 3] = 1 - d[42, 3]
+        self.assertEqual(d.content_hash(), h)
+
+        d[42, "name"] = "non-animal"
+        self.assertNotEqual(d.content_hash(), h)
+
+        d = data.Table("zoo")
+        d[42].set_class("fish")
+        self.assertNotEqual(d.content_hash(), h)
+
+        d = data.Table("zoo")
+        d.set_weights(2)
+        self.assertNotEqual(d.content_hash(), h)
+
+        d = data.Table("zoo")
+        d.ensure_copy()
+        d.X[0, 0] = 1 - d.X[0, 0]
+        self.assertNotEqual(d.content_hash(), h)
+
+        d = data.Table("zoo")
+        d.X = d.X.copy()
+        d.X[0, 0] = 1 - d.X[0, 0]
+        self.assertNotEqual(d.content_hash(), h)
+
+        d = data.Table("zoo")
+        d.domain = d.domain.copy()
+        self.assertEqual(d.content_hash(), h)
+        d.domain = data.Domain(d.domain.attributes[::-1],
+                               d.domain.class_var, d.domain.metas)
+        self.assertNotEqual(d.content_hash(), h)
+
+    def test_content_hash_sparse(self):
+        x = sp.random(200, 30, density=0.1, format="csr", random_state=0)
+        d = data.Table.from_numpy(None, x)
+        h = d.content_hash()
+        self.assertEqual(
+            h, data.Table.from_numpy(d.domain, x.tocsc()).content_hash())
+        self.assertNotEqual(
+            h, data.Table.from_numpy(d.domain, x.toarray()).content_hash())
+
+    @patch("Orange.data.table._HASH_CHUNK_SIZE", 64)
+    def test_content_hash_parallel(self):
+        d = data.Table("zoo")
+        with data.parallel_compute_values(1):
+            h = d.copy().content_hash()
+        with data.parallel_compute_values(4):
+            self.assertEqual(d.copy().content_hash(), h)
+
     def test_total_weight(self):
         d = data.Table("zoo")
         self.assertEqual(d.total_weight(), len(d))
@@ -1075,6 +1137,48 @@ class TableTestCase(unittest.TestCase):
             self.assertEqual(len(filtered_data), expected["rows"],
                              "{} returned wrong number of rows".format(args))
 
+    def test_valueFilter_string_distinct_values(self):
+        # String conditions are evaluated on distinct values
+        col = np.array(["abc", "Abd", None, "abc", np.nan, "xyz", "",
+                        "abc", None, "nab"] * 3, dtype=object)
+        domain = data.Domain([], metas=[data.StringVariable("s")])
+        table = data.Table.from_numpy(
+            domain, np.empty((len(col), 0)), metas=col.reshape(-1, 1))
+        fs, fsl = filter.FilterString, filter.FilterStringList
+        strs = [str(v) for v in col]
+        for flt, expected in (
+                (fs("s", fs.Equal, "abc"), [v == "abc" for v in strs]),
+                (fs("s", fs.Contains, "ab"), ["ab" in v for v in strs]),
+                (fs("s", fs.Contains, "AB", case_sensitive=False),
+                 ["ab" in v.lower() for v in strs]),
+                (fs("s", fs.StartsWith, "n"), [v.startswith("n") for v in strs]),
+                (fs("s", fs.EndsWith, "e"), [v.endswith("e") for v in strs]),
+                (fs("s", fs.Between, "a", "b"), ["a" <= v <= "b" for v in strs]),
+                (fsl("s", ["abc", "xyz"]), [v in ("abc", "xyz") for v in col]),
+                (fsl("s", ["ABD"], case_sensitive=False),
+                 [v.lower() == "abd" for v in strs])):
+            np.testing.assert_equal(
+                table._filter_to_indicator(flt), expected, repr(flt))
+
+        flt = filter.Values([fs("s", fs.Contains, "a"), fs("s", fs.Contains, "c")])
+        np.testing.assert_equal(
+            flt(table).metas[:, 0], [v for v in col if v == "abc"])
+
+        col[col != col] = None  # regular expressions do not accept nan
+        table.metas[:, 0] = col
+        np.testing.assert_equal(
+            table._filter_to_indicator(filter.FilterRegex("s", "^[aA]b")),
+            [v in ("abc", "Abd") for v in col])
+
+        # a column without any known values
+        table = data.Table.from_numpy(
+            domain, np.empty((2, 0)),
+            metas=np.array([[None], [None]], dtype=object))
+        for flt in (fs("s", fs.Contains, "a"), fs("s", fs.StartsWith, "a"),
+                    fsl("s", ["abc"])):
+            np.testing.assert_equal(
+                table._filter_to_indicator(flt), [False, False], repr(flt))
+
     def test_table_dtypes(self):
         table = data.Table("iris")
         metas = np.hstack((table.metas, table.Y.reshape(len(table), 1)))
@@ -1815,6 +1919,25 @@ class CreateTableWithDomainAndTable(TableTests):
              [4.7, 4.7, 4.7, 4.7]]
         )
 
+    def test_from_table_mixed_sources(self):
+        iris = data.Table("iris")
+        attrs = iris.domain.attributes
+        domain = Domain(
+            [attrs[2], iris.domain.class_var, attrs[0],
+             ContinuousVariable("x"),
+             ContinuousVariable("y", compute_value=lambda d: d.X[:, 1] * 2)],
+            metas=[attrs[3]])
+        new_table = Table.from_table(domain, iris, row_indices=[0, 50, 100])
+        np.testing.assert_equal(
+            new_table.X,
+            np.column_stack((iris.X[[0, 50, 100]][:, [2]],
+                             iris.Y[[0, 50, 100]],
+                             iris.X[[0, 50, 100]][:, [0]],
+                             np.full(3, np.nan),
+                             iris.X[[0, 50, 100], 1] * 2)))
+        np.testing.assert_equal(new_table.metas, iris.X[[0, 50, 100]][:, [3]])
+        self.assertTrue(new_table.X.flags.f_contiguous)
+
     def assert_table_with_filter_matches(
             self, new_table, old_table,
             rows=..., xcols=..., ycols=..., mcols=...):
@@ -2722,6 +2845,26 @@ class TestTableSparseDense(unittest.TestCase):
         d = self.iris.transform(domain)
         self.assertFalse(sp.issparse(d.metas))
 
+    def test_from_table_sparse_mixed_columns(self):
+        iris = self.iris.to_sparse(sparse_attributes=True)
+        attrs = iris.domain.attributes
+        domain = Domain(
+            [attrs[2],
+             ContinuousVariable('S1', compute_value=SparseCV(), sparse=True),
+             iris.domain.class_var,
+             attrs[0],
+             ContinuousVariable('U', sparse=True),
+             ContinuousVariable('S2', compute_value=SparseCV(), sparse=True)])
+        for rows in (..., [1, 2, 60, 149]):
+            d = Table.from_table(domain, iris, row_indices=rows)
+            self.assertIsInstance(d.X, sp.csr_matrix)
+            X, Y = self.iris.X[rows], self.iris.Y[rows]
+            n = len(X)
+            np.testing.assert_equal(
+                d.X.toarray(),
+                np.column_stack((X[:, 2], np.zeros(n), Y,
+                                 X[:, 0], np.full(n, np.nan), np.zeros(n))))
+
 
 class ConcurrencyTests(unittest.TestCase):
 
@@ -2820,6 +2963,196 @@ def preprocess_domain_single_stupid(domain, callback):
         for at in domain.attributes])
 
 
+class ParallelTransformTests(unittest.TestCase):
+    def test_same_as_sequential(self):
+        heart = Table("heart_disease")
+        domain = Normalize()(Continuize()(Impute()(heart))).domain
+        expected = heart.transform(domain)
+        with data.parallel_compute_values(4):
+            table = heart.transform(domain)
+        np.testing.assert_equal(table.X, expected.X)
+        np.testing.assert_equal(table.Y, expected.Y)
+        self.assertTrue(table.X.flags.f_contiguous)
+
+    def test_threads(self):
+        iris = Table("iris")
+        threads = []
+
+        def compute(data_):
+            threads.append(threading.current_thread())
+            return data_.X[:, 0]
+
+        call_shared = Mock()
+        domain = Domain(
+            [ContinuousVariable(str(i), compute_value=compute)
+             for i in range(10)]
+            + list(preprocess_domain_shared(iris.domain, None, call_shared)
+                   .attributes))
+        with data.parallel_compute_values(4):
+            table = iris.transform(domain)
+        np.testing.assert_equal(table.X, np.repeat(iris.X[:, :1], 14, axis=1))
+        self.assertEqual(call_shared.call_count, 1)
+        self.assertNotIn(threading.current_thread(), threads)
+
+        threads.clear()
+        with data.parallel_compute_values(1):
+            iris.transform(domain)
+        self.assertEqual(set(threads), {threading.current_thread()})
+
+    def test_exception(self):
+        def fail(_):
+            raise ValueError("fail")
+
+        iris = Table("iris")
+        domain = Domain([ContinuousVariable("a", compute_value=fail),
+                         ContinuousVariable("b", compute_value=fail)])
+        with data.parallel_compute_values(2):
+            self.assertRaisesRegex(ValueError, "fail", iris.transform, domain)
+
+    def test_environ(self):
+        with patch.dict(os.environ, {"ORANGE_COMPUTE_VALUE_WORKERS": "3"}):
+            self.assertEqual(environ.compute_value_workers(), 3)
+        with patch.dict(os.environ, {"ORANGE_COMPUTE_VALUE_WORKERS": "x"}):
+            with self.assertWarns(UserWarning):
+                self.assertEqual(environ.compute_value_workers(), 1)
+
+    def test_environ_change(self):
+        # pylint: disable=protected-access
+        with patch.dict(os.environ, {"ORANGE_COMPUTE_VALUE_WORKERS": "3"}):
+            self.assertEqual(data.table._compute_value_workers(), 3)
+        with patch.dict(os.environ, {"ORANGE_COMPUTE_VALUE_WORKERS": "2"}):
+            self.assertEqual(data.table._compute_value_workers(), 2)
+            with data.parallel_compute_values(4):
+                self.assertEqual(data.table._compute_value_workers(), 4)
+
+    def test_config_cached(self):
+        # pylint: disable=protected-access
+        with patch("configparser.ConfigParser.read") as read:
+            environ.reload_config()
+            environ.compute_value_workers()
+            environ.compute_value_workers()
+            self.assertEqual(read.call_count, 1)
+        environ.reload_config()
+
+        with patch.object(environ, "compute_value_workers") as workers:
+            data.table._run_compute_value_tasks([lambda: None])
+            workers.assert_not_called()
+
+
+class LazyTransformTests(unittest.TestCase):
+    def setUp(self):
+        self.heart = Table("heart_disease")
+        self.domain = \
+            Normalize()(Continuize()(Impute()(self.heart))).domain
+
+    def test_same_as_eager(self):
+        expected = self.heart.transform(self.domain)
+        with data.lazy_transforms():
+            table = self.heart.transform(self.domain)
+            self.assertIn("_lazy_source", table.__dict__)
+            self.assertEqual(len(table), len(self.heart))
+            np.testing.assert_equal(table.X, expected.X)
+            self.assertNotIn("_lazy_source", table.__dict__)
+        np.testing.assert_equal(table.Y, expected.Y)
+        np.testing.assert_equal(table.ids, expected.ids)
+        self.assertIs(table.domain, self.domain)
+
+    def test_materialized_on_exit(self):
+        with data.lazy_transforms():
+            table = self.heart.transform(self.domain)
+            with data.lazy_transforms():
+                table2 = self.heart.transform(self.domain)
+            self.assertIn("_lazy_source", table2.__dict__)
+        self.assertNotIn("_lazy_source", table.__dict__)
+        self.assertNotIn("_lazy_source", table2.__dict__)
+        np.testing.assert_equal(table.X, table2.X)
+
+    def test_materialized_on_exception(self):
+        iris = Table("iris")
+        expected = iris.transform(self.domain_double(iris))
+        tables = []
+        with self.assertRaises(ValueError):
+            with data.lazy_transforms():
+                tables.append(iris.transform(self.domain_double(iris)))
+                raise ValueError
+        self.assertNotIn("_lazy_source", tables[0].__dict__)
+        iris.X[:] = 0
+        np.testing.assert_equal(tables[0].X, expected.X)
+
+    def test_detached_on_exception(self):
+        iris = Table("iris")
+        expected = iris.transform(self.domain_double(iris))
+        fail = True
+
+        def compute(data):
+            if fail:
+                raise RuntimeError
+            return data.X[:, 0]
+
+        domain = Domain([ContinuousVariable("a", compute_value=compute)])
+        tables = []
+        with self.assertRaises(ValueError):
+            with data.lazy_transforms():
+                tables.append(iris.transform(domain))
+                tables.append(iris.transform(self.domain_double(iris)))
+                raise ValueError
+        self.assertIn("_lazy_source", tables[0].__dict__)
+        self.assertNotIn("_lazy_source", tables[1].__dict__)
+        fail = False
+        iris.X[:] = 0
+        np.testing.assert_equal(tables[0].X[:, 0], expected.X[:, 0] / 2)
+        np.testing.assert_equal(tables[1].X, expected.X)
+
+    @staticmethod
+    def domain_double(table):
+        return Domain([
+            ContinuousVariable(var.name,
+                               compute_value=lambda data, i=i: data.X[:, i] * 2)
+            for i, var in enumerate(table.domain.attributes)])
+
+    def test_fused(self):
+        iris = Table("iris")
+        call_cv = Mock()
+        d1 = preprocess_domain_single(iris.domain, call_cv)
+        d2 = Domain(d1.attributes[:2], d1.class_var)
+        expected = iris.transform(d1)
+        call_cv.reset_mock()
+        with data.lazy_transforms():
+            table1 = iris.transform(d1)
+            table2 = table1.transform(d2)
+            np.testing.assert_equal(table2.X, expected.X[:, :2])
+            self.assertEqual(call_cv.call_count, 2)
+            self.assertIn("_lazy_source", table1.__dict__)
+        np.testing.assert_equal(table1.X, expected.X)
+
+    def test_chained_compute_values(self):
+        imputed = Impute()(self.heart)
+        continuized = Continuize()(imputed)
+        expected = Normalize()(continuized)
+        domains = [imputed.domain, continuized.domain, expected.domain]
+        with data.lazy_transforms():
+            tables = [self.heart]
+            for domain in domains:
+                tables.append(tables[-1].transform(domain))
+            np.testing.assert_equal(tables[-1].X, expected.X)
+            for table in tables[1:-1]:
+                self.assertIn("_lazy_source", table.__dict__)
+
+    def test_pickle(self):
+        with data.lazy_transforms():
+            table = self.heart.transform(self.domain)
+            table2 = pickle.loads(pickle.dumps(table))
+        self.assertNotIn("_lazy_source", table2.__dict__)
+        np.testing.assert_equal(table.X, table2.X)
+
+    def test_preprocess(self):
+        pp = PreprocessorList([Impute(), Continuize(), Normalize()])
+        table = pp(self.heart)
+        self.assertNotIn("_lazy_source", table.__dict__)
+        np.testing.assert_equal(
+            table.X, self.heart.transform(table.domain).X)
+
+
 class EfficientTransformTests(unittest.TestCase):
 
     def setUp(self):
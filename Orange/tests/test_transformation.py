@@ -1,11 +1,16 @@
+import sqlite3
 import unittest
+from unittest.mock import Mock
 
 import numpy as np
 import scipy.sparse as sp
 
 from Orange.data import Table, Domain, DiscreteVariable, ContinuousVariable, \
     StringVariable
-from Orange.preprocess.transformation import Identity, Transformation, Lookup
+from Orange.data.sql.backend.base import ToSql
+from Orange.preprocess.impute import ReplaceUnknowns
+from Orange.preprocess.transformation import Identity, Transformation, \
+    Lookup, Indicator, Indicator1, Normalizer
 
 
 class TestTransformation(unittest.TestCase):
@@ -87,3 +92,54 @@ class LookupTest(unittest.TestCase):
             np.testing.assert_array_equal(
                 lookup.transform(col),
                 np.array([2, 0, 2, 1, np.nan, 1], dtype=np.float64))
+
+
+class ToSqlTest(unittest.TestCase):
+    def setUp(self):
+        self.x = ContinuousVariable("x")
+        self.d = DiscreteVariable("d", values=("a", "b'", "c"))
+        for var in (self.x, self.d):
+            var.to_sql = ToSql('"{}"'.format(var.name))
+        self.data = Table.from_list(
+            Domain([self.x, self.d]),
+            [[1.5, "a"], [np.nan, "c"], [-2, np.nan], [0, "b'"]])
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE data (x REAL, d TEXT)")
+        self.connection.executemany(
+            "INSERT INTO data VALUES (?, ?)",
+            [(None if np.isnan(x) else x,
+              None if np.isnan(d) else self.d.values[int(d)])
+             for x, d in self.data.X])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def assert_same_as_transform(self, transformation):
+        var = ContinuousVariable("t", compute_value=transformation)
+        sql_values = [np.nan if value is None else value for value, in
+                      self.connection.execute(
+                          "SELECT {} FROM data".format(var.to_sql()))]
+        np.testing.assert_almost_equal(sql_values, transformation(self.data))
+
+    def test_transformations(self):
+        for var in (self.x, self.d):
+            self.assert_same_as_transform(Identity(var))
+            self.assert_same_as_transform(Indicator(var, 0))
+            self.assert_same_as_transform(Indicator1(var, 0))
+            self.assert_same_as_transform(Normalizer(var, 1, 0.5))
+            self.assert_same_as_transform(ReplaceUnknowns(var, 2))
+        self.assert_same_as_transform(Lookup(self.d, np.array([1, 2, 0]), 4))
+        self.assert_same_as_transform(
+            Lookup(self.d, np.array([1, np.nan, 0])))
+
+    def test_chained(self):
+        ordinal = ContinuousVariable("o", compute_value=Identity(self.d))
+        self.assert_same_as_transform(Normalizer(ordinal, 1, 2))
+        imputed = self.d.copy(compute_value=ReplaceUnknowns(self.d, 1))
+        self.assert_same_as_transform(Indicator(imputed, 1))
+
+    def test_unsupported(self):
+        var = ContinuousVariable("t", compute_value=Mock())
+        del var.compute_value.to_sql
+        self.assertRaises(ValueError, var.to_sql)
+        self.assertRaises(ValueError, ContinuousVariable("t").to_sql)
@@ -0,0 +1,11 @@
+
+# THIS FILE IS GENERATED FROM ORANGE SETUP.PY
+short_version = '3.28.0'
+version = '3.28.0'
+full_version = '3.28.0.dev0+Unknown'
+git_revision = 'Unknown'
+release = False
+
+if not release:
+    version = full_version
+    short_version += ".dev"
@@ -12,7 +12,8 @@ from AnyQt.QtWidgets import \
 from AnyQt.QtCore import Qt, QTimer, QSize
 
 from Orange.data.table import Table, get_sample_datasets_dir
-from Orange.data.io import FileFormat, UrlReader, class_from_qualified_name
+from Orange.data.io import FileFormat, FileCache, UrlReader, \
+    class_from_qualified_name
 from Orange.widgets import widget, gui
 from Orange.widgets.settings import Setting, ContextSetting, \
     PerfectDomainContextHandler, SettingProvider
@@ -360,7 +361,7 @@ class OWFile(widget.OWWidget, RecentPathsWComboMixin):
 
         with catch_warnings(record=True) as warnings:
             try:
-                data = self.reader.read()
+                data = FileCache.default().read(self.reader)
             except Exception as ex:
                 log.exception(ex)
                 return lambda x=ex: self.Error.unknown(str(x))
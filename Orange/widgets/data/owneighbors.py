@@ -143,7 +143,9 @@ class OWNeighbors(OWWidget):
         all_data = Table.concatenate([reference, data], 0)
         pp_all_data = Impute()(RemoveNaNColumns()(all_data))
         pp_reference, pp_data = pp_all_data[:n_ref], pp_all_data[n_ref:]
-        self.distances = metric(pp_data, pp_reference).min(axis=1)
+        # the index avoids computing the matrix of all distances to reference
+        index = distance.KNNIndex(metric().fit(pp_data), pp_reference)
+        self.distances = index.query(pp_data, k=1)[0][:, 0]
 
     def apply(self):
         indices = self._compute_indices()
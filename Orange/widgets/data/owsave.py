@@ -2,7 +2,8 @@ import os.path
 
 from Orange.data.table import Table
 from Orange.data.io import \
-    TabReader, CSVReader, PickleReader, ExcelReader, XlsReader, FileFormat
+    TabReader, CSVReader, PickleReader, ColumnarReader, ExcelReader, \
+    XlsReader, FileFormat
 from Orange.widgets import gui, widget
 from Orange.widgets.widget import Input
 from Orange.widgets.settings import Setting
@@ -31,7 +32,8 @@ class OWSave(OWSaveBase):
 
     add_type_annotations = Setting(True)
 
-    builtin_order = [TabReader, CSVReader, PickleReader, ExcelReader, XlsReader]
+    builtin_order = [TabReader, CSVReader, PickleReader, ColumnarReader,
+                     ExcelReader, XlsReader]
 
     def __init__(self):
         super().__init__(2)
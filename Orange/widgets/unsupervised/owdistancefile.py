@@ -4,6 +4,7 @@ from AnyQt.QtWidgets import QSizePolicy, QStyle, QMessageBox, QFileDialog
 from AnyQt.QtCore import QTimer
 
 from Orange.misc import DistMatrix
+from Orange.misc.distmatrix import BINARY_EXTENSION
 from Orange.widgets import widget, gui
 from Orange.data import get_sample_datasets_dir
 from Orange.widgets.utils.filedialogs import RecentPathsWComboMixin
@@ -87,7 +88,8 @@ class OWDistanceFile(widget.OWWidget, RecentPathsWComboMixin):
             start_file = self.last_path() or os.path.expanduser("~/")
 
         filename, _ = QFileDialog.getOpenFileName(
-            self, 'Open Distance File', start_file, "(*.dst)")
+            self, 'Open Distance File', start_file,
+            "(*.dst *{})".format(BINARY_EXTENSION))
         if not filename:
             return
         self.add_path(filename)
@@ -115,7 +117,8 @@ class OWDistanceFile(widget.OWWidget, RecentPathsWComboMixin):
         self.loaded_file = ""
 
         try:
-            distances = DistMatrix.from_file(fn)
+            # copy-on-write, so downstream widgets can modify the matrix
+            distances = DistMatrix.from_file(fn, mmap_mode="c")
             self.loaded_file = fn
         except Exception as exc:
             err_value = str(exc)
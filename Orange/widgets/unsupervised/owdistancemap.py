@@ -415,7 +415,10 @@ class OWDistanceMap(widget.OWWidget):
 
         self.matrix = matrix
         if matrix is not None:
-            self._matrix_range = numpy.nanmax(matrix)
+            if isinstance(matrix, Orange.misc.CondensedDistMatrix):
+                self._matrix_range = numpy.nanmax(matrix.flat)
+            else:
+                self._matrix_range = numpy.nanmax(matrix)
             self.set_items(matrix.row_items, matrix.axis)
         else:
             self._matrix_range = 0.
@@ -526,7 +529,9 @@ class OWDistanceMap(widget.OWWidget):
 
     def _setup_scene(self):
         self._clear_plot()
-        self.matrix_item = DistanceMapItem(self._sorted_matrix)
+        # the image is dense (in the type of the matrix) even if the
+        # matrix is condensed
+        self.matrix_item = DistanceMapItem(numpy.asarray(self._sorted_matrix))
         # Scale the y axis to compensate for pg.ViewBox's y axis invert
         self.matrix_item.setTransform(QTransform.fromScale(1, -1), )
         self.viewbox.addItem(self.matrix_item)
@@ -578,8 +583,11 @@ class OWDistanceMap(widget.OWWidget):
             leaves = hierarchical.leaves(tree)
             indices = numpy.array([leaf.value.index for leaf in leaves])
             X = self.matrix
-            self._sorted_matrix = X[indices[:, numpy.newaxis],
-                                    indices[numpy.newaxis, :]]
+            if isinstance(X, Orange.misc.CondensedDistMatrix):
+                self._sorted_matrix = X.submatrix(indices)
+            else:
+                self._sorted_matrix = X[indices[:, numpy.newaxis],
+                                        indices[numpy.newaxis, :]]
             self._sort_indices = indices
 
     def _invalidate_annotations(self):
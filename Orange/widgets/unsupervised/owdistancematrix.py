@@ -8,7 +8,7 @@ from AnyQt.QtCore import Qt, QAbstractTableModel, QModelIndex, \
     QItemSelectionModel, QItemSelection, QSize
 
 from Orange.data import Table, Variable, StringVariable
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 from Orange.widgets import widget, gui
 from Orange.widgets.data.owtable import ranges
 from Orange.widgets.gui import OrangeUserRole
@@ -24,7 +24,7 @@ class DistanceMatrixModel(QAbstractTableModel):
         self.distances = None
         self.fact = 70
         self.labels = None
-        self.colors = None
+        self.color_factor = 0
         self.variable = None
         self.values = None
         self.label_colors = None
@@ -36,8 +36,9 @@ class DistanceMatrixModel(QAbstractTableModel):
         if distances is None:
             return
         span = distances.max()
-        self.colors = \
-            (distances * (170 / span if span > 1e-10 else 0)).astype(np.int)
+        # colors are computed when needed, so a memory-mapped matrix is read
+        # only for the shown cells
+        self.color_factor = 170 / span if span > 1e-10 else 0
         self.zero_diag = all(distances.diagonal() < 1e-6)
         self.endResetModel()
 
@@ -66,7 +67,9 @@ class DistanceMatrixModel(QAbstractTableModel):
         return QBrush(self.label_colors[ind].lighter(light))
 
     def color_for_cell(self, row, col):
-        return QBrush(QColor.fromHsv(120, self.colors[row, col], 255))
+        value = self.distances[row, col]
+        saturation = 0 if np.isnan(value) else int(value * self.color_factor)
+        return QBrush(QColor.fromHsv(120, saturation, 255))
 
     def data(self, index, role=Qt.DisplayRole):
         if role == Qt.TextAlignmentRole:
@@ -254,6 +257,9 @@ class OWDistanceMatrix(widget.OWWidget):
     @Inputs.distances
     def set_distances(self, distances):
         self.closeContext()
+        if isinstance(distances, CondensedDistMatrix):
+            # the table shows all elements and needs the diagonal
+            distances = distances.to_dense()
         self.distances = distances
         self.tablemodel.set_data(self.distances)
         self.selection = []
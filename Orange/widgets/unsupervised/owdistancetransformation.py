@@ -2,7 +2,7 @@ import numpy as np
 from AnyQt.QtCore import Qt
 
 from Orange.util import scale
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 from Orange.widgets import widget, gui, settings
 from Orange.widgets.utils.widgetpreview import WidgetPreview
 from Orange.widgets.widget import Input, Output
@@ -62,6 +62,9 @@ class OWDistanceTransformation(widget.OWWidget):
 
     @Inputs.distances
     def set_data(self, data):
+        if isinstance(data, CondensedDistMatrix):
+            # transformations need arithmetic and change the zero diagonal
+            data = data.to_dense()
         self.data = data
         self.unconditional_commit()
 
@@ -347,7 +347,11 @@ class OWHierarchicalClustering(widget.OWWidget):
                 self.error("Empty distance matrix")
                 matrix = None
         if matrix is not None:
-            if not np.all(np.isfinite(matrix)):
+            # condensed matrices are checked without densifying them
+            values = matrix.flat \
+                if isinstance(matrix, Orange.misc.CondensedDistMatrix) \
+                else matrix
+            if not np.all(np.isfinite(values)):
                 self.Error.not_finite_distances()
                 matrix = None
 
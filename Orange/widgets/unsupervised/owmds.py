@@ -11,7 +11,7 @@ import pyqtgraph as pg
 from Orange.data import ContinuousVariable, Domain, Table, StringVariable
 from Orange.data.util import array_equal
 from Orange.distance import Euclidean
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 from Orange.projection.manifold import torgerson, MDS
 
 from Orange.widgets import gui, settings
@@ -39,6 +39,9 @@ class Result(namespace):
 def run_mds(matrix: DistMatrix, max_iter: int, step_size: int, init_type: int,
             embedding: np.ndarray, state: TaskState):
     res = Result(embedding=embedding)
+    # SMACOF needs a dense matrix; densify a condensed matrix once and not
+    # in every step
+    matrix = np.asarray(matrix)
 
     iterations_done = 0
     init = embedding
@@ -131,7 +134,8 @@ class OWMDSGraph(OWScatterPlotBase):
             p = min(n * (n - 1) // 2 * self.connected_pairs // 100,
                     MAX_N_PAIRS * self.connected_pairs // 20)
             indcs = np.triu_indices(n, 1)
-            sorted = np.argsort(m[indcs])[:p]
+            upper = m.flat if isinstance(m, CondensedDistMatrix) else m[indcs]
+            sorted = np.argsort(upper)[:p]
             self._similar_pairs = fpairs = np.empty(2 * p, dtype=int)
             fpairs[::2] = indcs[0][sorted]
             fpairs[1::2] = indcs[1][sorted]
@@ -347,8 +351,12 @@ class OWMDS(OWDataProjectionWidget, ConcurrentWidgetMixin):
             self._run()
 
     def _run(self):
-        if self.effective_matrix is None \
-                or np.allclose(self.effective_matrix, 0):
+        if self.effective_matrix is None:
+            return
+        if isinstance(self.effective_matrix, CondensedDistMatrix):
+            if np.allclose(self.effective_matrix.flat, 0):
+                return
+        elif np.allclose(self.effective_matrix, 0):
             return
         self.graph.pause_drawing_pairs()
         self.run_button.setText("Stop")
@@ -1,5 +1,6 @@
 from Orange.widgets.widget import Input, Msg
 from Orange.misc import DistMatrix
+from Orange.misc.distmatrix import BINARY_EXTENSION
 from Orange.widgets.utils.save.owsavebase import OWSaveBase
 from Orange.widgets.utils.widgetpreview import WidgetPreview
 
@@ -10,7 +11,8 @@ class OWSaveDistances(OWSaveBase):
     icon = "icons/SaveDistances.svg"
     keywords = ["distance matrix", "save"]
 
-    filters = ["Distance File (*.dst)"]
+    filters = ["Distance File (*.dst)",
+               f"Binary Distance File (*{BINARY_EXTENSION})"]
 
     class Warning(OWSaveBase.Warning):
         table_not_saved = Msg("Associated data was not saved.")
@@ -27,8 +29,12 @@ class OWSaveDistances(OWSaveBase):
     def do_save(self):
         dist = self.data
         dist.save(self.filename)
-        skip_row = not dist.has_row_labels() and dist.row_items is not None
-        skip_col = not dist.has_col_labels() and dist.col_items is not None
+        # binary files store items, text files only labels
+        binary = self.filename.endswith(BINARY_EXTENSION)
+        skip_row = not binary and not dist.has_row_labels() \
+            and dist.row_items is not None
+        skip_col = not binary and not dist.has_col_labels() \
+            and dist.col_items is not None
         self.Warning.table_not_saved(shown=skip_row and skip_col)
         self.Warning.part_not_saved("columns" if skip_col else "rows",
                                     shown=skip_row != skip_col,)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from Orange.data import Table
+from Orange.distance import Euclidean
+from Orange.misc import DistMatrix
+from Orange.tests import named_file
+from Orange.widgets.tests.base import WidgetTest
+from Orange.widgets.unsupervised.owdistancefile import OWDistanceFile
+from Orange.widgets.unsupervised.owdistancematrix import OWDistanceMatrix
+from Orange.widgets.unsupervised.owdistancetransformation import \
+    OWDistanceTransformation
+
+
+class TestOWDistanceFile(WidgetTest):
+    def setUp(self):
+        self.widget = self.create_widget(OWDistanceFile)
+        self.distances = Euclidean(Table("iris")[:10])
+
+    def open_file(self, filename):
+        self.widget.add_path(filename)
+        self.widget.open_file()
+        return self.get_output(self.widget.Outputs.distances)
+
+    def test_binary_writeable(self):
+        with named_file("", suffix=".dstb") as name:
+            self.distances.save(name)
+            distances = self.open_file(name)
+            np.testing.assert_equal(distances, self.distances)
+            distances[0, 1] = 42
+            del distances
+            self.assertEqual(DistMatrix.from_file(name)[0, 1],
+                             self.distances[0, 1])
+
+    def test_binary_condensed(self):
+        with named_file("", suffix=".dstb") as name:
+            self.distances.to_condensed().save(name)
+            distances = self.open_file(name)
+            np.testing.assert_almost_equal(np.asarray(distances),
+                                           self.distances)
+
+            matrix = self.create_widget(OWDistanceMatrix)
+            self.send_signal(matrix.Inputs.distances, distances, widget=matrix)
+            np.testing.assert_almost_equal(matrix.distances, self.distances)
+
+            transformation = self.create_widget(OWDistanceTransformation)
+            transformation.inversion_method = 2  # 1 - X
+            self.send_signal(transformation.Inputs.distances, distances,
+                             widget=transformation)
+            output = self.get_output(transformation.Outputs.distances,
+                                     widget=transformation)
+            np.testing.assert_almost_equal(output, 1 - self.distances)
+            del distances
@@ -3,6 +3,8 @@
 import random
 import unittest
 
+import numpy as np
+
 from Orange.distance import Euclidean
 from Orange.widgets.unsupervised.owdistancemap import OWDistanceMap
 from Orange.widgets.tests.base import WidgetTest, WidgetOutputsTestMixin
@@ -41,6 +43,19 @@ class TestOWDistanceMap(WidgetTest, WidgetOutputsTestMixin):
         self.send_signal(self.signal_name, self.signal_data, widget=w)
         self.assertEqual(len(self.get_output(w.Outputs.selected_data, widget=w)), 10)
 
+    def test_condensed_distances(self):
+        widget = self.widget
+        condensed = self.signal_data.to_condensed()
+        for sorting in (widget.NoOrdering, widget.Clustering,
+                        widget.OrderedClustering):
+            widget.sorting = sorting
+            self.send_signal(self.signal_name, self.signal_data)
+            sorted_matrix = np.asarray(widget._sorted_matrix)
+            self.send_signal(self.signal_name, condensed)
+            np.testing.assert_almost_equal(
+                np.asarray(widget._sorted_matrix), sorted_matrix)
+            self.assertEqual(widget._matrix_range, self.signal_data.max())
+
     def test_summary(self):
         """Check if the status bar updates"""
         info = self.widget.info
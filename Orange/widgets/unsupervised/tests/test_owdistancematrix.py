@@ -1,7 +1,10 @@
 from unittest.mock import patch
 
+import numpy as np
+
 from Orange.data import Table
 from Orange.distance import Euclidean
+from Orange.misc import DistMatrix
 from Orange.widgets.tests.base import WidgetTest
 from Orange.widgets.unsupervised.owdistancematrix import OWDistanceMatrix
 
@@ -46,3 +49,10 @@ class TestOWDistanceMatrix(WidgetTest):
         ac.setCurrentIndex(idx)
         ac.activated.emit(idx)
         self.assertIsNone(self.widget.tablemodel.label_colors)
+
+    def test_condensed_distances(self):
+        self.send_signal(self.widget.Inputs.distances,
+                         self.distances.to_condensed())
+        self.assertIsInstance(self.widget.distances, DistMatrix)
+        np.testing.assert_almost_equal(self.widget.distances, self.distances)
+        self.assertEqual(self.widget.tablemodel.rowCount(), 5)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from Orange.data import Table
+from Orange.distance import Euclidean
+from Orange.misc import DistMatrix
+from Orange.widgets.tests.base import WidgetTest
+from Orange.widgets.unsupervised.owdistancetransformation import \
+    OWDistanceTransformation
+
+
+class TestOWDistanceTransformation(WidgetTest):
+    def setUp(self):
+        self.widget = self.create_widget(OWDistanceTransformation)
+        self.distances = Euclidean(Table("iris")[:10])
+
+    def test_condensed_distances(self):
+        widget = self.widget
+        for norm in range(len(widget.normalization_options)):
+            for inv in range(len(widget.inversion_options) - 1):
+                widget.normalization_method = norm
+                widget.inversion_method = inv
+                self.send_signal(widget.Inputs.distances, self.distances)
+                expected = self.get_output(widget.Outputs.distances)
+                self.send_signal(widget.Inputs.distances,
+                                 self.distances.to_condensed())
+                output = self.get_output(widget.Outputs.distances)
+                self.assertIsInstance(output, DistMatrix)
+                np.testing.assert_almost_equal(output, expected)
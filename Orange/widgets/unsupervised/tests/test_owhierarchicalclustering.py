@@ -133,6 +133,21 @@ class TestOWHierarchicalClustering(WidgetTest, WidgetOutputsTestMixin):
         self.send_signal(self.widget.Inputs.distances, self.distances)
         self.assertFalse(self.widget.Error.not_finite_distances.is_shown())
 
+    def test_condensed_distances(self):
+        self.send_signal(self.widget.Inputs.distances, self.distances)
+        linkage = self.widget.linkmatrix
+
+        condensed = self.distances.to_condensed()
+        self.send_signal(self.widget.Inputs.distances, condensed)
+        self.assertIs(self.widget.matrix, condensed)
+        np.testing.assert_almost_equal(self.widget.linkmatrix, linkage)
+
+        distances = self.distances.copy()
+        distances[3, 5] = distances[5, 3] = np.inf
+        self.send_signal(self.widget.Inputs.distances,
+                         distances.to_condensed())
+        self.assertTrue(self.widget.Error.not_finite_distances.is_shown())
+
     def test_output_cut_ratio(self):
         self.send_signal(self.widget.Inputs.distances, self.distances)
 
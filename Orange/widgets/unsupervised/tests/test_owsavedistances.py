@@ -102,6 +102,26 @@ class OWSaveTestBase(WidgetTest, SaveWidgetsTestBaseMixin):
             self.assertFalse(widget.Warning.table_not_saved.is_shown())
             self.assertFalse(widget.Warning.part_not_saved.is_shown())
 
+    def test_save_binary(self):
+        widget = self.widget
+        widget.auto_save = False
+        self.distances.col_items = self.distances.row_items
+
+        with named_file("", suffix=".dstb") as filename:
+            widget.get_save_filename = Mock(
+                return_value=(filename, widget.filters[1]))
+            self.send_signal(widget.Inputs.distances, self.distances)
+            widget.save_file_as()
+            distances = DistMatrix.from_file(filename)
+            np.testing.assert_equal(distances, self.distances)
+            self.assert_table_equal(distances.row_items,
+                                    self.distances.row_items)
+            self.assert_table_equal(distances.col_items,
+                                    self.distances.col_items)
+            self.assertFalse(widget.Warning.table_not_saved.is_shown())
+            self.assertFalse(widget.Warning.part_not_saved.is_shown())
+            del distances
+
     def test_send_report(self):
         widget = self.widget
 
@@ -19,6 +19,7 @@ import Orange.data
 from Orange.data.filter import FilterDiscrete, FilterContinuous, Values, \
     IsDefined
 from Orange.statistics import contingency, distribution
+from Orange.statistics.accumulators import ColumnStats
 
 from Orange.widgets import widget, gui
 from Orange.widgets.settings import (Setting, DomainContextHandler,
@@ -96,6 +97,31 @@ class BoxData:
         self.dev = math.sqrt(self.var)
         a, freq = np.asarray(dist)
         q25, median, q75 = _quantiles(a, freq, [0.25, 0.5, 0.75])
+        self._set_quartiles(q25, median, q75, group_val)
+
+    @classmethod
+    def from_stats(cls, stats, group_val=None):
+        """
+        Construct box data from column statistics
+        (:obj:`Orange.statistics.accumulators.ColumnStats`), with quartiles
+        approximated by the quantile sketch.
+        """
+        self = cls.__new__(cls)
+        self.dist = None
+        moments = stats.moments
+        self.n = moments.weight
+        if self.n == 0:
+            return self
+        self.a_min = float(moments.min)
+        self.a_max = float(moments.max)
+        self.mean = float(moments.mean)
+        self.var = float(moments.var)
+        self.dev = math.sqrt(self.var)
+        q25, median, q75 = stats.sketch.quantile([0.25, 0.5, 0.75])
+        self._set_quartiles(q25, median, q75, group_val)
+        return self
+
+    def _set_quartiles(self, q25, median, q75, group_val):
         self.median = median
         # The code below omits the q25 or q75 in the plot when they are None
         self.q25 = None if q25 == median else q25
@@ -154,6 +180,7 @@ class OWBoxPlot(widget.OWWidget):
     stretched = Setting(True)
     show_labels = Setting(True)
     sort_freqs = Setting(False)
+    approximate = Setting(False)
 
     _sorting_criteria_attrs = {
         CompareNone: "", CompareMedians: "median", CompareMeans: "mean"
@@ -250,6 +277,11 @@ class OWBoxPlot(widget.OWWidget):
             self.display_box, self, 'compare',
             btnLabels=["No comparison", "Compare medians", "Compare means"],
             callback=self.update_graph)
+        gui.checkBox(
+            self.display_box, self, "approximate", "Approximate quartiles",
+            tooltip="Estimate quartiles without sorting the data; "
+                    "faster and leaner on large data",
+            callback=self._approximate_changed)
 
         # The vertical size policy is needed to let only the list views expand
         self.stretching_box = box = gui.vBox(
@@ -502,6 +534,14 @@ class OWBoxPlot(widget.OWWidget):
         self.update_box_visibilities()
         self.commit()
 
+    def _approximate_changed(self):
+        if self.attribute is None or not self.attribute.is_continuous:
+            return
+        self.selection = ()
+        self.compute_box_data()
+        self.update_graph()
+        self.commit()
+
     def update_graph(self):
         pending_selection = self.selection
         self.box_scene.selectionChanged.disconnect(self.on_selection_changed)
@@ -546,7 +586,10 @@ class OWBoxPlot(widget.OWWidget):
             self.stats = []
             self.dist = self.conts = None
             return
-        if self.group_var:
+        if self.approximate and attr.is_continuous:
+            self.dist = self.conts = None
+            self.stats, self.label_txts_all = self._approximate_box_data()
+        elif self.group_var:
             self.dist = None
             self.conts = contingency.get_contingency(
                 dataset, attr, self.group_var)
@@ -577,6 +620,33 @@ class OWBoxPlot(widget.OWWidget):
                            if stat.n > 0]
         self.stats = [stat for stat in self.stats if stat.n > 0]
 
+    def _approximate_box_data(self):
+        """
+        Compute box data for a continuous attribute and its labels, using
+        quantile sketches instead of sorting the data.
+        """
+        attr, dataset = self.attribute, self.dataset
+        column = dataset.get_column_view(attr)[0].astype(float)
+        weights = dataset.W if dataset.has_weights() else None
+        if not self.group_var:
+            return [BoxData.from_stats(
+                ColumnStats(attr).update(column, weights))], [""]
+
+        groups = dataset.get_column_view(self.group_var)[0].astype(float)
+        missing_val_str = f"missing '{self.group_var.name}'"
+        stats, label_texts = [], []
+        for i, value in enumerate(self.group_var.values + ("",)):
+            mask = groups == i if value else np.isnan(groups)
+            if not mask.any():
+                continue
+            group_stats = ColumnStats(attr).update(
+                column[mask], None if weights is None else weights[mask])
+            stat = BoxData.from_stats(group_stats, value)
+            if stat.n:
+                stats.append(stat)
+                label_texts.append(value or missing_val_str)
+        return stats, label_texts
+
     def update_box_visibilities(self):
         self.controls.stretched.setDisabled(self.group_var is self.attribute)
 
@@ -24,7 +24,7 @@ from Orange.data.util import get_unique_names
 import Orange.distance
 import Orange.misc
 from Orange.data import Table, Domain
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 
 from Orange.widgets import widget, gui, settings
 from Orange.widgets.utils.stickygraphicsview import StickyGraphicsView
@@ -42,6 +42,52 @@ from Orange.widgets.widget import Msg, Input, Output
 ROW_NAMES_WIDTH = 200
 
 
+#: the number of distances in a block of rows of a condensed matrix
+_BLOCK_SIZE = 2 ** 20
+
+
+def _row_blocks(matrix: CondensedDistMatrix):
+    n = len(matrix)
+    step = max(1, _BLOCK_SIZE // n)
+    for start in range(0, n, step):
+        yield np.arange(start, min(start + step, n)), matrix[start:start + step]
+
+
+def _condensed_nan_mask(matrix: CondensedDistMatrix) -> np.ndarray:
+    """Mask of rows whose distances to all other rows are undefined."""
+    mask = np.zeros(len(matrix), dtype=bool)
+    for rows, block in _row_blocks(matrix):
+        mask[rows] = np.isnan(block).sum(axis=1) == len(matrix) - 1
+    return mask
+
+
+def _condensed_silhouette_samples(
+        matrix: CondensedDistMatrix, labels: np.ndarray) -> np.ndarray:
+    """
+    Compute the same scores as `sklearn.metrics.silhouette_samples` with
+    a precomputed matrix, but by blocks of rows of a condensed matrix.
+    """
+    _, labels = np.unique(labels, return_inverse=True)
+    n = len(labels)
+    members = np.zeros((n, labels.max() + 1))
+    members[np.arange(n), labels] = 1
+    sizes = members.sum(axis=0)
+    intra = np.empty(n)
+    inter = np.empty(n)
+    for rows, block in _row_blocks(matrix):
+        sums = block @ members
+        own = (np.arange(len(rows)), labels[rows])
+        intra[rows] = sums[own]
+        sums[own] = np.inf
+        inter[rows] = np.min(sums / sizes, axis=1)
+    own_sizes = sizes[labels] - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intra /= own_sizes
+        silhouette = (inter - intra) / np.maximum(intra, inter)
+    silhouette[own_sizes == 0] = 0
+    return np.nan_to_num(silhouette)
+
+
 class InputValidationError(ValueError):
     message: str
 
@@ -211,7 +257,7 @@ class OWSilhouettePlot(widget.OWWidget):
         self.closeContext()
         self.clear()
         try:
-            if isinstance(data, Orange.misc.DistMatrix):
+            if isinstance(data, (DistMatrix, CondensedDistMatrix)):
                 self._set_distances(data)
             elif isinstance(data, Orange.data.Table):
                 self._set_table(data)
@@ -324,7 +370,10 @@ class OWSilhouettePlot(widget.OWWidget):
             return
         if self._matrix is None:
             if self.distances is not None:
-                self._matrix = np.asarray(self.distances)
+                if isinstance(self.distances, CondensedDistMatrix):
+                    self._matrix = self.distances
+                else:
+                    self._matrix = np.asarray(self.distances)
             elif self.data is not None:
                 data = self.data
                 _, metric = self.Distances[self.distance_idx]
@@ -358,7 +407,10 @@ class OWSilhouettePlot(widget.OWWidget):
         labels, _ = self.data.get_column_view(labelvar)
         labels = np.asarray(labels, dtype=float)
         cluster_mask = np.isnan(labels)
-        dist_mask = np.isnan(self._matrix).all(axis=0)
+        if isinstance(self._matrix, CondensedDistMatrix):
+            dist_mask = _condensed_nan_mask(self._matrix)
+        else:
+            dist_mask = np.isnan(self._matrix).all(axis=0)
         mask = cluster_mask | dist_mask
         labels = labels.astype(int)
         labels = labels[~mask]
@@ -371,6 +423,9 @@ class OWSilhouettePlot(widget.OWWidget):
         elif len(labels_unq) == len(labels):
             self.Error.singleton_clusters_all()
             labels = silhouette = mask = None
+        elif isinstance(self._matrix, CondensedDistMatrix):
+            silhouette = _condensed_silhouette_samples(
+                self._matrix.submatrix(np.flatnonzero(~mask)), labels)
         else:
             silhouette = sklearn.metrics.silhouette_samples(
                 self._matrix[~mask, :][:, ~mask], labels, metric="precomputed")
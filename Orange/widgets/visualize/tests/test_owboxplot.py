@@ -355,6 +355,27 @@ class TestOWBoxPlot(WidgetTest, WidgetOutputsTestMixin):
             if isinstance(box, FilterGraphicsRectItem):
                 box.setSelected(True)
 
+    def test_approximate(self):
+        self.send_signal(self.widget.Inputs.data, self.heart)
+        self.__select_variable("age")
+        self.__select_group("gender")
+        exact = [(stat.n, stat.mean, stat.median, stat.q25, stat.q75)
+                 for stat in self.widget.stats]
+        labels = self.widget.label_txts
+
+        self.widget.controls.approximate.setChecked(True)
+        self.assertIsNone(self.widget.conts)
+        self.assertEqual(self.widget.label_txts, labels)
+        # Quartiles of small data are exact
+        np.testing.assert_almost_equal(
+            [(stat.n, stat.mean, stat.median, stat.q25, stat.q75)
+             for stat in self.widget.stats],
+            exact)
+
+        self.__select_group("None")
+        self.assertEqual(len(self.widget.stats), 1)
+        self.assertEqual(self.widget.stats[0].median, 56)
+
     def test_summary(self):
         """Check if status bar is updated when data is received"""
         data, info = self.titanic, self.widget.info
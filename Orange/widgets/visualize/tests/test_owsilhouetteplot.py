@@ -189,6 +189,18 @@ class TestOWSilhouettePlot(WidgetTest, WidgetOutputsTestMixin):
         self.assertIsNotNone(widget.data)
         self.assertTrue(widget._distances_gui_box.isEnabled())
 
+    def test_condensed_distance_input(self):
+        widget = self.widget
+        data = Table("heart_disease")[::4]
+        matrix = Orange.distance.Euclidean(data)
+        self.send_signal(widget.Inputs.data, matrix, widget=widget)
+        scores = widget._silhouette
+
+        matrix = matrix.to_condensed(np.float32)
+        self.send_signal(widget.Inputs.data, matrix, widget=widget)
+        self.assertIs(widget._matrix, matrix)
+        np.testing.assert_almost_equal(widget._silhouette, scores, decimal=5)
+
     def test_input_distance_no_data(self):
         widget = self.widget
         matrix = DistMatrix(
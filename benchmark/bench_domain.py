@@ -1,7 +1,7 @@
 import numpy as np
 
 from Orange.data import DomainConversion, Domain, Table, \
-    ContinuousVariable, DiscreteVariable
+    ContinuousVariable, DiscreteVariable, parallel_compute_values
 from Orange.preprocess import Discretize, EqualFreq, Normalize
 
 from .base import Benchmark, benchmark
@@ -42,3 +42,13 @@ class BenchConversion(Benchmark):
     @benchmark(number=5)
     def bench_transform_normalize(self):
         self.table.transform(self.normalized_domain)
+
+    @benchmark(number=5)
+    def bench_transform_normalize_batches(self):
+        for i in range(0, len(self.table), 10):
+            self.table[i:i + 10].transform(self.normalized_domain)
+
+    @benchmark(number=5)
+    def bench_transform_normalize_parallel(self):
+        with parallel_compute_values(4):
+            self.table.transform(self.normalized_domain)
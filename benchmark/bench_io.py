@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from Orange.data.io_base import DataTableMixin
+from .base import Benchmark, benchmark
+
+
+def read(rows, executor=None):
+    DataTableMixin.data_table(rows, executor=executor)
+
+
+class BenchDataTable(Benchmark):
+    """Building tables from rows of strings, as parsed from text files"""
+
+    def setup_rows(self, rows, cols, typed=False):
+        values = np.random.RandomState(0).rand(rows, cols)
+        values[values < 0.05] = np.nan
+        header = [[f"f{i}" for i in range(cols)]]
+        if typed:
+            header += [["c"] * cols, [""] * cols]
+        # pylint: disable=attribute-defined-outside-init
+        self.rows = header + [["?" if np.isnan(x) else f"{x:.4f}" for x in row]
+                              for row in values]
+
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.threads = ThreadPoolExecutor(4)
+        self.processes = ProcessPoolExecutor(4)
+
+    def tearDown(self):
+        self.threads.shutdown()
+        self.processes.shutdown()
+
+    @benchmark(setup=partial(setup_rows, rows=100, cols=10000),
+               number=3, warmup=1)
+    def bench_wide(self):
+        read(self.rows)
+
+    @benchmark(setup=partial(setup_rows, rows=100, cols=10000),
+               number=3, warmup=1)
+    def bench_wide_threads(self):
+        read(self.rows, self.threads)
+
+    @benchmark(setup=partial(setup_rows, rows=100, cols=10000),
+               number=3, warmup=1)
+    def bench_wide_processes(self):
+        read(self.rows, self.processes)
+
+    @benchmark(setup=partial(setup_rows, rows=100, cols=10000, typed=True),
+               number=3, warmup=1)
+    def bench_wide_typed(self):
+        read(self.rows)
+
+    @benchmark(setup=partial(setup_rows, rows=100000, cols=10),
+               number=3, warmup=1)
+    def bench_tall(self):
+        read(self.rows)
+
+    @benchmark(setup=partial(setup_rows, rows=100000, cols=10),
+               number=3, warmup=1)
+    def bench_tall_threads(self):
+        read(self.rows, self.threads)
+
+    @benchmark(setup=partial(setup_rows, rows=100000, cols=10),
+               number=3, warmup=1)
+    def bench_tall_processes(self):
+        read(self.rows, self.processes)
+
+    @benchmark(setup=partial(setup_rows, rows=100000, cols=10, typed=True),
+               number=3, warmup=1)
+    def bench_tall_typed(self):
+        read(self.rows)
@@ -0,0 +1,43 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from Orange.data import Table, Domain, ContinuousVariable
+from Orange.data.pandas_compat import table_from_frame, table_to_frame
+from .base import Benchmark, benchmark
+
+
+class BenchPandas(Benchmark):
+    """Conversions between tables and data frames, with and without copying"""
+
+    def setup_frame(self, rows, cols):
+        # pylint: disable=attribute-defined-outside-init
+        self.df = pd.DataFrame(np.random.RandomState(0).rand(rows, cols),
+                               columns=[str(i) for i in range(cols)])
+
+    def setup_table(self, rows, cols):
+        # pylint: disable=attribute-defined-outside-init
+        self.table = Table.from_numpy(
+            Domain([ContinuousVariable(str(i)) for i in range(cols)]),
+            np.asfortranarray(np.random.RandomState(0).rand(rows, cols)))
+
+    @benchmark(setup=partial(setup_frame, rows=1000000, cols=100),
+               number=1, warmup=1)
+    def bench_from_frame_copy(self):
+        table_from_frame(self.df)
+
+    @benchmark(setup=partial(setup_frame, rows=1000000, cols=100),
+               number=1, warmup=1)
+    def bench_from_frame_view(self):
+        table_from_frame(self.df, copy=False)
+
+    @benchmark(setup=partial(setup_table, rows=1000000, cols=100),
+               number=1, warmup=1)
+    def bench_to_frame_copy(self):
+        table_to_frame(self.table)
+
+    @benchmark(setup=partial(setup_table, rows=1000000, cols=100),
+               number=1, warmup=1)
+    def bench_to_frame_view(self):
+        table_to_frame(self.table, copy=False)
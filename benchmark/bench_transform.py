@@ -51,3 +51,8 @@ class BenchTransform(Benchmark):
     def bench_copy_sparse_wide(self):
         t = add_unknown_attribute(self.table)
         self.assertIsInstance(t.X, scipy.sparse.csr_matrix)
+
+    @benchmark(setup=partial(setup_sparse, rows=1000, cols=100000), number=2)
+    def bench_copy_sparse_text(self):
+        t = add_unknown_attribute(self.table)
+        self.assertIsInstance(t.X, scipy.sparse.csr_matrix)